@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+브라우저 상태 유지 벤치마크
+같은 페이지를 빈 프로필(콜드)과 한 번 방문해 둔 영구 프로필(웜)에서 각각 열어
+로드 시간, 캐시 히트 수, 실제 네트워크 전송량을 비교합니다.
+두 경우 모두 UGC 카운터와 같은 CDP 차단 목록 정책을 사용합니다.
+
+사용법:
+    python scripts/benchmark_browser_state.py <URL>... [--platform tiktok|youtube] [--repeat 3]
+"""
+
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from playwright.sync_api import sync_playwright
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers.browser_pool import DEFAULT_LAUNCH_ARGS
+from src.scrapers.browser_state import DISK_CACHE_MAX_MB
+from src.scrapers.request_filter import install_blocklist_policy
+
+logger = get_logger(__name__)
+
+
+def load_page(context, url, platform):
+    """페이지를 한 번 열고 (로드 시간, 캐시 히트 수, 전송 바이트)를 반환합니다."""
+    page = context.new_page()
+    stats = install_blocklist_policy(page, platform)
+    started = time.perf_counter()
+    try:
+        page.goto(url, wait_until='load', timeout=60000)
+        elapsed = time.perf_counter() - started
+    finally:
+        page.close()
+    if stats is None:
+        return elapsed, 0, 0
+    return elapsed, stats.cache_hits, stats.bytes_transferred
+
+
+def launch(playwright, profile_dir):
+    return playwright.chromium.launch_persistent_context(
+        profile_dir, headless=True,
+        args=DEFAULT_LAUNCH_ARGS + [f"--disk-cache-size={DISK_CACHE_MAX_MB * 1024 * 1024}"])
+
+
+def measure(playwright, url, platform, repeat):
+    """콜드/웜 각각 repeat번 측정한 결과 목록을 반환합니다."""
+    cold = []
+    warm = []
+    for _ in range(repeat):
+        profile_dir = tempfile.mkdtemp(prefix='browser_state_bench_')
+        try:
+            # 콜드: 빈 프로필에서 첫 방문
+            context = launch(playwright, profile_dir)
+            cold.append(load_page(context, url, platform))
+            context.close()
+
+            # 웜: 같은 프로필로 브라우저를 다시 띄워 재방문 (다음 실행과 같은 조건)
+            context = launch(playwright, profile_dir)
+            warm.append(load_page(context, url, platform))
+            context.close()
+        finally:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+    return cold, warm
+
+
+def summarize(label, samples):
+    seconds = sum(s[0] for s in samples) / len(samples)
+    cache_hits = sum(s[1] for s in samples) / len(samples)
+    transferred_kb = sum(s[2] for s in samples) / len(samples) / 1024
+    logger.info(f"   {label}: 평균 {seconds:.2f}초, 캐시 히트 {cache_hits:.0f}건, 전송 {transferred_kb:.0f}KB")
+    return seconds, transferred_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="브라우저 상태 유지 (콜드 vs 웜) 벤치마크")
+    parser.add_argument('urls', nargs='+', help="측정할 페이지 URL")
+    parser.add_argument('--platform', choices=['tiktok', 'youtube'], default=None,
+                        help="요청 차단 정책 (기본값: URL로 자동 판단)")
+    parser.add_argument('--repeat', type=int, default=3, help="URL별 반복 횟수")
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        for url in args.urls:
+            platform = args.platform or ('youtube' if 'youtube.com' in url else 'tiktok')
+            logger.info(f"🌐 {url} [{platform}] {args.repeat}회 측정")
+            cold, warm = measure(p, url, platform, args.repeat)
+            cold_seconds, cold_kb = summarize("콜드", cold)
+            warm_seconds, warm_kb = summarize("웜  ", warm)
+            if cold_seconds and cold_kb:
+                logger.info(f"   📊 로드 시간 {(1 - warm_seconds / cold_seconds) * 100:.0f}% 단축, "
+                            f"전송량 {(1 - warm_kb / cold_kb) * 100:.0f}% 감소")
+
+
+if __name__ == "__main__":
+    main()
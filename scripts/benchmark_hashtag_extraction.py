@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+해시태그 추출 벤치마크
+저장해 둔 TikTok 사운드 페이지로 기존 해시태그 추출 함수(3번 탐색)와 현재
+extract_hashtags_from_soup(카드당 한 번)의 실행 시간과 상위 해시태그를 비교합니다.
+
+사용법:
+    python scripts/benchmark_hashtag_extraction.py <저장된 HTML 파일 또는 디렉터리>... [--repeat 5]
+"""
+
+import sys
+import os
+import re
+import time
+import argparse
+from collections import Counter
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers.html_parser import make_soup
+from src.scrapers.tiktok_ugc_counter import extract_hashtags_from_soup
+
+logger = get_logger(__name__)
+
+
+def legacy_extract_hashtags_from_soup(soup):
+    """
+    기존 extract_hashtags_from_soup 구현 (비교용 사본, 3번 탐색 + 매치마다 debug 로그).
+    """
+    hashtag_counter = Counter()
+    
+    # 방법 1: 해시태그 링크 찾기 (/tag/ 경로)
+    hashtag_links = soup.find_all('a', href=re.compile(r'/tag/'))
+    for link in hashtag_links:
+        href = link.get('href', '')
+        text = link.get_text().strip()
+        
+        # URL에서 해시태그 추출
+        tag_match = re.search(r'/tag/([^/?#&]+)', href)
+        if tag_match:
+            hashtag = tag_match.group(1)
+            if hashtag.lower() == 'fyp': continue # FYP 제외
+            hashtag_counter[hashtag] += 1
+            logger.debug(f"📌 링크에서 해시태그: #{hashtag}")
+        
+        # 링크 텍스트에서 해시태그 추출
+        if text.startswith('#'):
+            hashtag = text[1:].strip()
+            if hashtag and len(hashtag) > 0:
+                if hashtag.lower() == 'fyp': continue # FYP 제외
+                hashtag_counter[hashtag] += 1
+                logger.debug(f"📌 링크 텍스트에서 해시태그: #{hashtag}")
+    
+    # 방법 2: 전체 텍스트에서 #으로 시작하는 해시태그 찾기
+    all_text = soup.get_text()
+    text_hashtags = re.findall(r'#(\w+)', all_text)
+    for hashtag in text_hashtags:
+        if len(hashtag) > 1:  # 한 글자는 제외
+            if hashtag.lower() == 'fyp': continue # FYP 제외
+            hashtag_counter[hashtag] += 1
+            logger.debug(f"📌 텍스트에서 해시태그: #{hashtag}")
+    
+    # 방법 3: 비디오 설명/캡션 영역에서 찾기
+    video_desc_selectors = [
+        '[data-e2e*="video-desc"]',
+        '[data-e2e*="video-caption"]',
+        '[class*="video-desc"]',
+        '[class*="caption"]',
+        '[class*="desc"]',
+        '.tiktok-caption',
+        '.video-meta-caption'
+    ]
+    
+    for selector in video_desc_selectors:
+        elements = soup.select(selector)
+        for element in elements:
+            # 요소 내 링크에서 해시태그 찾기
+            links = element.find_all('a', href=True)
+            for link in links:
+                href = link.get('href', '')
+                if '/tag/' in href:
+                    tag_match = re.search(r'/tag/([^/?#&]+)', href)
+                    if tag_match:
+                        hashtag = tag_match.group(1)
+                        if hashtag.lower() == 'fyp': continue # FYP 제외
+                        hashtag_counter[hashtag] += 1
+                        logger.debug(f"📌 비디오 설명에서 해시태그: #{hashtag}")
+            
+            # 요소 텍스트에서 해시태그 찾기
+            text = element.get_text()
+            desc_hashtags = re.findall(r'#(\w+)', text)
+            for hashtag in desc_hashtags:
+                if len(hashtag) > 1:
+                    if hashtag.lower() == 'fyp': continue # FYP 제외
+                    hashtag_counter[hashtag] += 1
+                    logger.debug(f"📌 설명 텍스트에서 해시태그: #{hashtag}")
+    
+    return hashtag_counter
+
+
+def find_pages(paths):
+    """파일/디렉터리 목록에서 .html 파일 경로를 모읍니다."""
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                pages.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(('.html', '.htm')))
+        else:
+            pages.append(path)
+    return pages
+
+
+def time_extractor(func, soup, repeat):
+    """repeat회 실행한 평균 시간(초)과 마지막 결과를 반환합니다."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func(soup)
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="해시태그 추출 벤치마크")
+    parser.add_argument('paths', nargs='+', help="저장된 TikTok 사운드 페이지 HTML 파일 또는 디렉터리")
+    parser.add_argument('--repeat', type=int, default=5, help="페이지당 반복 실행 횟수")
+    args = parser.parse_args()
+
+    pages = find_pages(args.paths)
+    if not pages:
+        logger.error("❌ 벤치마크할 HTML 파일이 없습니다.")
+        sys.exit(1)
+
+    legacy_total = 0.0
+    current_total = 0.0
+
+    for path in pages:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            soup = make_soup(f.read())
+
+        legacy_time, legacy_counter = time_extractor(legacy_extract_hashtags_from_soup, soup, args.repeat)
+        current_time, current_counter = time_extractor(extract_hashtags_from_soup, soup, args.repeat)
+        legacy_total += legacy_time
+        current_total += current_time
+
+        logger.info(f"📄 {os.path.basename(path)}: 기존 {legacy_time * 1000:.1f}ms → 현재 {current_time * 1000:.1f}ms")
+        logger.info(f"   기존 상위: {legacy_counter.most_common(5)}")
+        logger.info(f"   현재 상위: {current_counter.most_common(5)}")
+
+    speedup = legacy_total / current_total if current_total else 0
+    logger.info(f"📊 {len(pages)}개 페이지 평균: 기존 {legacy_total / len(pages) * 1000:.1f}ms, "
+                f"현재 {current_total / len(pages) * 1000:.1f}ms ({speedup:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+HTML 파서 결과 비교 스크립트
+저장해 둔 TikTok 사운드 / YouTube Shorts 페이지를 html.parser와 다른 파서(lxml 등)로 각각
+파싱해 추출 결과(비디오 개수, 해시태그)가 같은지 확인하고 파싱 시간을 비교합니다.
+경로를 지정하지 않으면 scripts/fixtures/pages/ 의 예시 페이지를 사용하고,
+--snapshots를 주면 스냅샷 저장소(page_snapshots)의 렌더링된 HTML도 함께 비교합니다.
+결과가 하나라도 다르면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/check_parser_equivalence.py [저장된 HTML 파일 또는 디렉터리...] [--parser lxml]
+                                               [--kind auto|tiktok|youtube]
+                                               [--snapshots [--since 2025-01-01]]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers import tiktok_ugc_counter, youtube_ugc_counter
+from src.scrapers.html_parser import make_soup, is_parser_available, DEFAULT_PARSER, PARSER
+from src.database import snapshot_store
+
+logger = get_logger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+
+# 비교할 스냅샷 종류 → 추출 종류 (렌더링된 HTML만)
+SNAPSHOT_KINDS = {
+    'tiktok_sound_html': 'tiktok',
+    'youtube_shorts_rendered_html': 'youtube'
+}
+
+
+def find_pages(paths):
+    """파일/디렉터리 목록에서 .html 파일 경로를 모읍니다."""
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                pages.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(('.html', '.htm')))
+        else:
+            pages.append(path)
+    return pages
+
+
+def read_page(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def snapshot_pages(since=None):
+    """스냅샷 저장소의 렌더링된 HTML을 (이름, 종류, 읽기 함수) 목록으로 반환합니다."""
+    pages = []
+    for snapshot in snapshot_store.list_snapshots(list(SNAPSHOT_KINDS), since):
+        content_hash = snapshot['content_hash']
+        pages.append((f"{snapshot['kind']}:{content_hash[:12]}", SNAPSHOT_KINDS[snapshot['kind']],
+                      lambda content_hash=content_hash: snapshot_store.load_snapshot(content_hash)))
+    return pages
+
+
+def detect_kind(html_content):
+    return 'youtube' if 'ytInitialData' in html_content or 'youtube.com' in html_content[:5000] else 'tiktok'
+
+
+def extract(html_content, kind, parser):
+    """지정한 파서로 스크래퍼와 같은 추출을 수행하고 (결과, 파싱 시간)을 반환합니다."""
+    started = time.perf_counter()
+    soup = make_soup(html_content, parser)
+    if kind == 'tiktok':
+        result = {
+            'video_count': tiktok_ugc_counter.extract_video_count_from_soup(soup),
+            'hashtags': sorted(tiktok_ugc_counter.extract_hashtags_from_soup(soup).items())
+        }
+    else:
+        result = {'video_count': youtube_ugc_counter.extract_video_count_from_text(soup.get_text())}
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파서 결과 비교")
+    parser.add_argument('paths', nargs='*', help="저장된 HTML 파일 또는 디렉터리 (기본값: scripts/fixtures/pages)")
+    parser.add_argument('--parser', default=PARSER, help=f"비교할 파서 (기본값: 자동 선택된 '{PARSER}')")
+    parser.add_argument('--kind', choices=['auto', 'tiktok', 'youtube'], default='auto')
+    parser.add_argument('--snapshots', action='store_true', help="스냅샷 저장소의 렌더링된 HTML도 비교")
+    parser.add_argument('--since', help="--snapshots와 함께: 이 날짜(YYYY-MM-DD) 이후 스냅샷만")
+    args = parser.parse_args()
+
+    if not is_parser_available(args.parser):
+        logger.error(f"❌ 파서 '{args.parser}'를 사용할 수 없습니다.")
+        sys.exit(1)
+    if args.parser == DEFAULT_PARSER:
+        logger.warning(f"⚠️ 비교 대상이 기준 파서({DEFAULT_PARSER})와 같습니다. lxml을 설치하거나 --parser를 지정하세요.")
+
+    paths = args.paths or ([] if args.snapshots else [FIXTURE_DIR])
+    pages = [(os.path.basename(path), None, lambda path=path: read_page(path)) for path in find_pages(paths)]
+    if args.snapshots:
+        pages.extend(snapshot_pages(args.since))
+    if not pages:
+        logger.error("❌ 비교할 HTML 파일이 없습니다.")
+        sys.exit(1)
+
+    mismatches = 0
+    baseline_total = 0.0
+    candidate_total = 0.0
+
+    for name, kind, load in pages:
+        html_content = load()
+        if kind is None:
+            kind = detect_kind(html_content) if args.kind == 'auto' else args.kind
+
+        expected, baseline_time = extract(html_content, kind, DEFAULT_PARSER)
+        actual, candidate_time = extract(html_content, kind, args.parser)
+        baseline_total += baseline_time
+        candidate_total += candidate_time
+
+        if expected == actual:
+            logger.info(f"✅ {name} [{kind}] 일치 "
+                        f"({baseline_time * 1000:.0f}ms → {candidate_time * 1000:.0f}ms)")
+        else:
+            mismatches += 1
+            logger.error(f"❌ {name} [{kind}] 불일치")
+            for key in expected:
+                if expected[key] != actual.get(key):
+                    logger.error(f"   {key}: {DEFAULT_PARSER}={expected[key]} / {args.parser}={actual.get(key)}")
+
+    speedup = baseline_total / candidate_total if candidate_total else 0
+    logger.info(f"📊 {len(pages)}개 페이지: {DEFAULT_PARSER} {baseline_total:.2f}초, "
+                f"{args.parser} {candidate_total:.2f}초 ({speedup:.1f}배), 불일치 {mismatches}개")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
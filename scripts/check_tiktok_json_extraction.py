@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+TikTok JSON 추출 확인 스크립트
+scripts/fixtures/tiktok_json/ 에 저장해 둔 music detail 응답과 rehydration(__UNIVERSAL_DATA_FOR_REHYDRATION__,
+SIGI_STATE) JSON으로 추출 함수를 실행해 기대한 비디오 개수/해시태그가 나오는지 확인합니다.
+브라우저나 네트워크 없이 실행되며, 결과가 하나라도 다르면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/check_tiktok_json_extraction.py
+"""
+
+import sys
+import os
+import json
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers.tiktok_json_extractor import (
+    video_count_from_music_detail, video_count_from_rehydration, build_sound_result
+)
+
+logger = get_logger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'tiktok_json')
+
+# (파일, 확인할 값, 추출 함수, 기대값)
+CHECKS = [
+    ('music_detail.json', 'video_count', video_count_from_music_detail, 1523400),
+    # 사용자/작성자 stats의 videoCount가 아니라 musicInfo의 값을 읽어야 함
+    ('universal_rehydration.json', 'video_count', video_count_from_rehydration, 1523400),
+    ('sigi_state.json', 'video_count', video_count_from_rehydration, 1498200),
+    # 사운드 정보가 없으면 다른 videoCount를 쓰지 않고 None (HTML 파싱으로 전환)
+    ('rehydration_without_music.json', 'video_count', video_count_from_rehydration, None),
+    ('sigi_state.json', 'top_hashtags',
+     lambda data: build_sound_result(rehydration_data=data)['top_hashtags'],
+     [('espresso', 3), ('dance', 2), ('coffeetok', 1), ('transition', 1)]),
+]
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    failures = 0
+    for name, label, extract, expected in CHECKS:
+        actual = extract(load_fixture(name))
+        if label == 'top_hashtags':
+            # 같은 빈도의 해시태그는 순서가 정해져 있지 않으므로 정렬해서 비교
+            actual = sorted(actual, key=lambda item: (-item[1], item[0]))
+        if actual == expected:
+            logger.info(f"✅ {name} [{label}] {actual}")
+        else:
+            failures += 1
+            logger.error(f"❌ {name} [{label}] 기대값 {expected} / 실제값 {actual}")
+
+    logger.info(f"📊 {len(CHECKS)}개 확인, 실패 {failures}개")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+YouTube HTTP 수집 확인 스크립트
+scripts/fixtures/youtube_source/ 에 저장해 둔 /source/<id>/shorts 원본 HTML(ytInitialData 포함)을
+127.0.0.1의 로컬 HTTP 서버로 제공하고, fetch_shorts_count_http(url)가 기대한 카운트를 반환하는지 확인합니다.
+헤더에 카운트가 없는 페이지는 0(브라우저 경로로 전환)이어야 합니다.
+외부 네트워크 없이 실행되며, 결과가 하나라도 다르면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/check_youtube_http_fetch.py
+"""
+
+import sys
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# 확인용 요청이 스냅샷 저장소에 남지 않도록 (snapshot_store를 가져오기 전에 설정)
+os.environ['SCRAPER_SNAPSHOTS'] = '0'
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers.youtube_ugc_counter import fetch_shorts_count_http
+
+logger = get_logger(__name__)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'youtube_source')
+
+# 비디오 ID → 제공할 원본 페이지
+SOURCE_PAGES = {
+    'eVli-tstM5E': 'with_count.html',
+    'Qm1nUs2xYz0': 'without_count.html'
+}
+
+# (비디오 ID, 설명, 기대값)
+CHECKS = [
+    ('eVli-tstM5E', "헤더 렌더러에 카운트 있음", 480000),
+    # 본문 영상 제목("Top 500 shorts of 2025")을 카운트로 읽지 않고 0 (브라우저 경로로 전환)
+    ('Qm1nUs2xYz0', "헤더 렌더러에 카운트 없음", 0),
+    ('missing0000', "없는 페이지 (404)", 0),
+]
+
+
+class SourcePageHandler(BaseHTTPRequestHandler):
+    """/source/<id>/shorts 요청에 저장해 둔 페이지를 돌려줍니다."""
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        name = SOURCE_PAGES.get(parts[1]) if len(parts) == 3 and parts[::2] == ['source', 'shorts'] else None
+        if name is None:
+            self.send_error(404)
+            return
+
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"로컬 서버: {format % args}")
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SourcePageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    logger.info(f"🌐 로컬 서버 시작: {base_url}")
+
+    failures = 0
+    try:
+        for video_id, label, expected in CHECKS:
+            actual = fetch_shorts_count_http(f"{base_url}/source/{video_id}/shorts")
+            if actual == expected:
+                logger.info(f"✅ {video_id} [{label}] {actual:,}")
+            else:
+                failures += 1
+                logger.error(f"❌ {video_id} [{label}] 기대값 {expected:,} / 실제값 {actual:,}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    logger.info(f"📊 {len(CHECKS)}개 확인, 실패 {failures}개")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
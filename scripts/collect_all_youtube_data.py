@@ -6,13 +6,13 @@ YouTube 미수집 곡들의 UGC 카운트를 일괄 수집하는 스크립트
 import sys
 import os
 import time
-import subprocess
 from datetime import datetime
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 from src.database import database_manager as db
 from src.utils.logger_config import get_logger
+from src.collection.inprocess_worker import UGCTaskRunner
 
 logger = get_logger(__name__)
 
@@ -32,37 +32,22 @@ def get_missing_youtube_songs():
         logger.error(f"❌ 미수집 곡 조회 실패: {e}")
         return []
 
-def collect_single_youtube_song(song_id, title, artist, youtube_id):
+def collect_single_youtube_song(runner, song_id, title, artist, youtube_id):
     """개별 YouTube 곡의 UGC 수집"""
-    shorts_url = f"https://www.youtube.com/source/{youtube_id}/shorts"
+    logger.info(f"🎵 수집 시작: {title} - {artist}")
     
-    try:
-        logger.info(f"🎵 수집 시작: {title} - {artist}")
-        
-        # YouTube UGC 카운터 실행 (DB 저장 포함)
-        venv_python = os.path.join(os.path.dirname(__file__), 'test_env', 'bin', 'python')
-        result = subprocess.run([
-            venv_python, 'src/scrapers/youtube_ugc_counter.py', shorts_url, '--save-db'
-        ], capture_output=True, text=True, timeout=120)  # 2분 타임아웃
-        
-        if result.returncode == 0:
-            # 성공한 경우 출력에서 UGC 카운트 추출
-            try:
-                ugc_count = int(result.stdout.strip().split('\n')[0])
-                logger.info(f"✅ 수집 완료: {title} - {artist} → {ugc_count:,}개")
-            except:
-                logger.info(f"✅ 수집 완료: {title} - {artist}")
-            return True
-        else:
-            logger.error(f"❌ 수집 실패: {title} - {artist}")
-            logger.error(f"   오류: {result.stderr.strip()}")
-            return False
-            
-    except subprocess.TimeoutExpired:
+    # YouTube UGC 카운터 실행 (DB 저장 포함)
+    result = runner.collect('youtube', song_id, youtube_id, f"{title} - {artist}")
+    
+    if result['success']:
+        logger.info(f"✅ 수집 완료: {title} - {artist} → {result['video_count']:,}개")
+        return True
+    elif result['error_message'] == "타임아웃":
         logger.error(f"⏰ 타임아웃: {title} - {artist}")
         return False
-    except Exception as e:
-        logger.error(f"💥 예외 발생: {title} - {artist} → {e}")
+    else:
+        logger.error(f"❌ 수집 실패: {title} - {artist}")
+        logger.error(f"   오류: {result['error_message']}")
         return False
 
 def main():
@@ -85,19 +70,17 @@ def main():
     
     success_count = 0
     error_count = 0
+    runner = UGCTaskRunner(timeout=120)  # --subprocess 지정 시 곡마다 별도 프로세스
     
     for i, (song_id, title, artist, youtube_id) in enumerate(missing_songs, 1):
         logger.info(f"[{i}/{total_songs}] 처리 중...")
         
-        if collect_single_youtube_song(song_id, title, artist, youtube_id):
+        if collect_single_youtube_song(runner, song_id, title, artist, youtube_id):
             success_count += 1
         else:
             error_count += 1
-        
-        # 요청 간격 조절 (서버 부하 방지)
-        if i < total_songs:  # 마지막 곡이 아니면 대기
-            logger.info("⏳ 2초 대기 중...")
-            time.sleep(2)
+    
+    runner.close()
     
     # 최종 결과 요약
     duration = time.time() - start_time
@@ -8,23 +8,23 @@ TikTok 안전한 배치 수집 스크립트 (Windows 지원)
 import sys
 import os
 import time
-import subprocess
-import json
-from datetime import datetime
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.database import database_manager as db
 from src.utils.logger_config import get_logger
+from src.collection.inprocess_worker import UGCTaskRunner
+from src.collection import planner, scheduler, sharding
+from src.collection.run_journal import RunJournal
 
 logger = get_logger(__name__)
 
 class TikTokBatchCollector:
-    def __init__(self):
+    def __init__(self, worker_mode=None):
         self.batch_size = 10  # 한 번에 처리할 곡 수
         self.max_retries = 3  # 실패 시 최대 재시도 횟수
         self.timeout_per_song = 180  # 곡당 타임아웃 (3분)
-        self.progress_file = "progress_tiktok.json"
+        # 곡별 결과를 추가 기록하는 실행 저널 (샤드 워커(--shards N --shard-index i)마다 별도 파일)
+        self.journal = RunJournal(sharding.shard_file_name("progress_tiktok.ndjson"), platform='tiktok')
         
         # Python 실행 파일 경로 (Windows/Linux 자동 감지)
         project_root = os.path.join(os.path.dirname(__file__), '..')
@@ -37,6 +37,10 @@ class TikTokBatchCollector:
         if not os.path.exists(self.python_exe):
             self.python_exe = 'python'  # 시스템 기본 Python 사용
         
+        # 곡 수집 실행기 (기본: 인프로세스, --subprocess 지정 시 곡마다 별도 프로세스)
+        self.runner = UGCTaskRunner(mode=worker_mode, timeout=self.timeout_per_song,
+                                    python_exe=self.python_exe)
+        
         self.results = {
             'total_songs': 0,
             'success_count': 0,
@@ -47,102 +51,49 @@ class TikTokBatchCollector:
             'start_time': time.time()
         }
 
-    def load_progress(self):
-        """이전 진행 상황 로드"""
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, 'r', encoding='utf-8') as f:
-                    progress = json.load(f)
-                logger.info(f"📂 이전 진행 상황 로드: {len(progress.get('completed_songs', []))}개 완료")
-                return progress
-            except Exception as e:
-                logger.warning(f"⚠️ 진행 상황 로드 실패: {e}")
-        return {'completed_songs': [], 'failed_songs': []}
-
-    def save_progress(self, completed_songs, failed_songs):
-        """진행 상황 저장"""
-        progress = {
-            'completed_songs': completed_songs,
-            'failed_songs': failed_songs,
-            'last_update': datetime.now().isoformat()
-        }
-        try:
-            with open(self.progress_file, 'w', encoding='utf-8') as f:
-                json.dump(progress, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.warning(f"⚠️ 진행 상황 저장 실패: {e}")
-
     def get_songs_to_collect(self):
-        """수집할 TikTok 곡 목록 조회"""
+        """수집할 TikTok 곡 목록 조회 (재수집 주기가 된 곡만, --full 지정 시 전체)"""
         try:
-            with db.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, title, artist, tiktok_id 
-                    FROM songs 
-                    WHERE tiktok_id IS NOT NULL
-                    ORDER BY id
-                """)
-                return cursor.fetchall()
+            # 가치(차트 순위, 급상승 여부, 카운트 증가율)가 높은 곡부터 수집
+            jobs = scheduler.prioritize(planner.plan_jobs(['tiktok'], full=planner.is_full_scan()))
+            return [(job['song_id'], job['state']['title'], job['state']['artist'], job['platform_id'])
+                    for job in jobs]
         except Exception as e:
             logger.error(f"❌ 곡 목록 조회 실패: {e}")
             return []
 
     def collect_single_song(self, song_id, title, artist, tiktok_id, retry_count=0):
         """개별 곡 수집 (재시도 포함)"""
-        tiktok_url = f"https://www.tiktok.com/music/x-{tiktok_id}"
         song_info = f"{title} - {artist}"
         
-        try:
-            logger.info(f"🎵 수집 시작: {song_info}")
-            if retry_count > 0:
-                logger.info(f"   📝 재시도 {retry_count}/{self.max_retries}")
-            
-            # TikTok UGC 카운터 실행
-            project_root = os.path.join(os.path.dirname(__file__), '..')
-            script_path = os.path.join(project_root, 'src', 'scrapers', 'tiktok_ugc_counter.py')
-            
-            # 환경변수 설정
-            env = os.environ.copy()
-            env['PYTHONPATH'] = project_root
-            env['PYTHONIOENCODING'] = 'utf-8'
-            env['PYTHONUTF8'] = '1'
-            
-            result = subprocess.run([
-                self.python_exe, script_path, tiktok_url, '--save-db'
-            ], capture_output=True, text=True, timeout=self.timeout_per_song, 
-               cwd=project_root, env=env)
-            
-            if result.returncode == 0:
-                logger.info(f"   ✅ 수집 완료: {song_info}")
-                return True, None
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "알 수 없는 오류"
-                logger.error(f"   ❌ 수집 실패: {song_info} - {error_msg}")
-                return False, error_msg
-                
-        except subprocess.TimeoutExpired:
+        logger.info(f"🎵 수집 시작: {song_info}")
+        if retry_count > 0:
+            logger.info(f"   📝 재시도 {retry_count}/{self.max_retries}")
+        
+        # TikTok UGC 카운터 실행
+        result = self.runner.collect('tiktok', song_id, tiktok_id, song_info)
+        
+        if result['success']:
+            logger.info(f"   ✅ 수집 완료: {song_info}")
+            return True, None
+        
+        error_msg = result['error_message'] or "알 수 없는 오류"
+        if error_msg == "타임아웃":
             logger.error(f"   ⏰ 타임아웃: {song_info} ({self.timeout_per_song}초)")
-            return False, "타임아웃"
-        except Exception as e:
-            logger.error(f"   💥 예외 발생: {song_info} - {e}")
-            return False, str(e)
+        else:
+            logger.error(f"   ❌ 수집 실패: {song_info} - {error_msg}")
+        return False, error_msg
 
     def collect_with_retry(self, song_data):
         """재시도 로직이 포함된 곡 수집"""
         song_id, title, artist, tiktok_id = song_data
         
+        # 재시도 전 대기는 UGCTaskRunner의 요청 속도 제한기가 담당 (타임아웃/빈 카운트/429면 지터를 섞은 지수 백오프)
         for retry in range(self.max_retries):
             success, error = self.collect_single_song(song_id, title, artist, tiktok_id, retry)
             
             if success:
                 return True, None
-            
-            # 재시도 전 대기 (2초 * 재시도 횟수)
-            if retry < self.max_retries - 1:
-                wait_time = (retry + 1) * 2
-                logger.info(f"   ⏳ {wait_time}초 대기 후 재시도...")
-                time.sleep(wait_time)
         
         # 모든 재시도 실패
         return False, error
@@ -161,6 +112,8 @@ class TikTokBatchCollector:
             logger.info(f"[{i}/{len(batch_songs)}] 처리 중...")
             
             success, error = self.collect_with_retry(song_data)
+            # 곡이 끝날 때마다 저널에 한 줄 추가 (재시작 시 성공한 곡만 건너뜀)
+            self.journal.record(song_id, success, error=error)
             
             if success:
                 batch_success += 1
@@ -175,10 +128,6 @@ class TikTokBatchCollector:
                     'tiktok_id': tiktok_id,
                     'error': error
                 })
-            
-            # 배치 내 곡 간 간격 (서버 부하 방지)
-            if i < len(batch_songs):
-                time.sleep(2)
         
         logger.info(f"📊 배치 {batch_num} 완료: 성공 {batch_success}개, 실패 {batch_failed}개")
         logger.info("=" * 50)
@@ -192,25 +141,27 @@ class TikTokBatchCollector:
         logger.info("🚀 TikTok 안전한 배치 수집 시작")
         logger.info("=" * 60)
         
-        # 진행 상황 로드
-        progress = self.load_progress()
-        completed_songs = set(progress.get('completed_songs', []))
+        # 실행 저널 재생 (이전 실행이 중단됐으면 이어서)
+        self.journal.open()
         
         # 수집할 곡 목록 조회
         all_songs = self.get_songs_to_collect()
         
         if not all_songs:
             logger.info("✅ 수집할 TikTok 곡이 없습니다.")
+            self.journal.finish()
             return
         
-        # 이미 완료된 곡 제외
-        songs_to_collect = [song for song in all_songs if song[0] not in completed_songs]
+        # 이미 성공한 곡 제외
+        songs_to_collect = [song for song in all_songs if not self.journal.is_done(song[0])]
         
         if not songs_to_collect:
             logger.info("✅ 모든 TikTok 곡이 이미 수집되었습니다!")
+            self.journal.finish()
             return
         
         self.results['total_songs'] = len(songs_to_collect)
+        sharding.report_total(len(songs_to_collect))
         logger.info(f"📊 수집 대상: {len(songs_to_collect)}개 곡")
         logger.info(f"⚙️ 배치 크기: {self.batch_size}개씩")
         logger.info(f"⏱️ 곡당 타임아웃: {self.timeout_per_song}초")
@@ -224,19 +175,8 @@ class TikTokBatchCollector:
             end_idx = min(start_idx + self.batch_size, len(songs_to_collect))
             batch_songs = songs_to_collect[start_idx:end_idx]
             
-            batch_success, batch_failed = self.process_batch(batch_songs, batch_num, total_batches)
-            
-            # 진행 상황 저장
-            completed_song_ids = [song[0] for song in batch_songs if batch_success > 0]
-            completed_songs.update(completed_song_ids)
-            self.save_progress(list(completed_songs), self.results['failed_songs'])
-            
+            self.process_batch(batch_songs, batch_num, total_batches)
             self.results['batches_completed'] += 1
-            
-            # 배치 간 휴식 (마지막 배치가 아닌 경우)
-            if batch_num < total_batches:
-                logger.info("⏳ 5초 휴식 후 다음 배치 진행...")
-                time.sleep(5)
         
         # 최종 결과 출력
         self.print_final_summary(start_time)
@@ -269,26 +209,30 @@ class TikTokBatchCollector:
         
         logger.info("=" * 60)
         
-        # 진행 상황 파일 정리 (성공적으로 완료된 경우)
-        if self.results['failed_count'] == 0:
-            try:
-                os.remove(self.progress_file)
-                logger.info("🧹 진행 상황 파일 정리 완료")
-            except:
-                pass
+        # 실패한 곡이 없으면 저널 정리, 있으면 다음 실행에서 그 곡만 재시도
+        self.journal.finish()
 
 def main():
     """메인 실행 함수"""
-    collector = TikTokBatchCollector()
+    # --shards N (--shard-index 없이): 샤드 워커 N개를 띄워 감독
+    exit_code = sharding.supervise_if_requested(__file__)
+    if exit_code is not None:
+        sys.exit(exit_code)
+    
+    collector = TikTokBatchCollector()  # --subprocess 지정 시 곡마다 별도 프로세스로 실행
     
     try:
         collector.run_collection()
     except KeyboardInterrupt:
         logger.info("⏹️ 사용자에 의해 중단되었습니다.")
+        collector.runner.cancel()
         sys.exit(1)
     except Exception as e:
         logger.error(f"💥 예상치 못한 오류: {e}")
         sys.exit(1)
+    finally:
+        collector.runner.close()
+        collector.journal.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+TikTok + YouTube UGC 동시 수집 스크립트
+비동기 수집 엔진으로 여러 곡을 동시에 수집하고, 결과를 완료 즉시 DB에 기록합니다.
+
+사용법:
+    python scripts/collect_ugc_async.py [--concurrency 8] [--tiktok-limit 4] [--youtube-limit 4]
+                                        [--deadline-minutes 60] [--platform tiktok|youtube|both] [--full]
+                                        [--shards N [--shard-index i]]
+"""
+
+import sys
+import os
+import argparse
+from datetime import datetime
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.collection import planner, scheduler, sharding
+from src.collection.async_engine import AsyncCollectionEngine, DEFAULT_CONCURRENCY, DEFAULT_DOMAIN_LIMITS
+
+logger = get_logger(__name__)
+
+
+def load_jobs(platform='both', full=False):
+    """재수집 주기가 된 곡들을 수집 작업 목록으로 변환 (full=True면 플랫폼 ID가 있는 전체 곡)"""
+    platforms = ['tiktok', 'youtube'] if platform == 'both' else [platform]
+    return planner.plan_jobs(platforms, full=full)
+
+
+def interleave_platforms(jobs):
+    """플랫폼을 번갈아 배치해 양쪽 동시 실행 슬롯을 고르게 사용 (플랫폼 안의 순서는 유지)"""
+    tiktok_jobs = [job for job in jobs if job['platform'] == 'tiktok']
+    youtube_jobs = [job for job in jobs if job['platform'] == 'youtube']
+    interleaved = []
+    for i in range(max(len(tiktok_jobs), len(youtube_jobs))):
+        if i < len(tiktok_jobs):
+            interleaved.append(tiktok_jobs[i])
+        if i < len(youtube_jobs):
+            interleaved.append(youtube_jobs[i])
+    return interleaved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TikTok/YouTube UGC 동시 수집")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="전체 동시 실행 곡 수")
+    parser.add_argument('--tiktok-limit', type=int, default=DEFAULT_DOMAIN_LIMITS['tiktok'], help="TikTok 동시 실행 수")
+    parser.add_argument('--youtube-limit', type=int, default=DEFAULT_DOMAIN_LIMITS['youtube'], help="YouTube 동시 실행 수")
+    parser.add_argument('--deadline-minutes', type=float, default=None, help="전체 마감 시간 (분)")
+    parser.add_argument('--platform', choices=['tiktok', 'youtube', 'both'], default='both')
+    parser.add_argument('--full', action='store_true', help="재수집 주기와 관계없이 전체 곡 수집")
+    parser.add_argument('--shards', type=int, default=None, help="샤드 수 (--shard-index 없이 지정하면 워커 N개를 감독)")
+    parser.add_argument('--shard-index', type=int, default=None, help="이 워커가 맡을 샤드 번호 (0부터)")
+    args = parser.parse_args()
+
+    exit_code = sharding.supervise_if_requested(__file__)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    logger.info("🌅 비동기 UGC 수집 시작")
+    logger.info(f"📅 수집 날짜: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    jobs = load_jobs(args.platform, full=args.full or planner.is_full_scan([]))
+    if not jobs:
+        logger.info("✅ 수집할 곡이 없습니다.")
+        return
+
+    # 마감 시간 안에 끝낼 수 있는 곡을 가치 순으로 선택 (플랫폼별 실측 소요 시간 기준)
+    domain_limits = {'tiktok': args.tiktok_limit, 'youtube': args.youtube_limit}
+    deadline_seconds = args.deadline_minutes * 60 if args.deadline_minutes else None
+    jobs, deferred = scheduler.schedule(jobs, deadline_seconds, slots=domain_limits)
+    sharding.report_total(len(jobs))
+
+    engine = AsyncCollectionEngine(
+        concurrency=args.concurrency,
+        domain_limits=domain_limits,
+        deadline_seconds=deadline_seconds
+    )
+    stats = engine.run(interleave_platforms(jobs))
+
+    # 마감 시간 때문에 실행하지 못한 곡도 연기 목록에 추가
+    attempted = {(result['platform'], result['song_id']) for result in stats['results']}
+    deferred = [job for job in jobs if (job['platform'], job['song_id']) not in attempted] + deferred
+    scheduler.record_latencies(stats['results'])
+    scheduler.record_deferred(deferred)
+
+    if stats['total'] > 0:
+        success_rate = stats['success'] / stats['total'] * 100
+        logger.info(f"🎯 성공률: {success_rate:.1f}%")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("⏹️ 사용자에 의해 중단되었습니다.")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"💥 예상치 못한 오류: {e}")
+        sys.exit(1)
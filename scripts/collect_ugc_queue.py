@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+작업 큐 기반 UGC 수집 스크립트
+계획기가 고른 곡을 collection_jobs 큐에 넣고(enqueue), 여러 프로세스/호스트에서 워커(work)를
+동시에 실행해 같은 큐를 나눠 처리합니다. 워커가 죽어도 리스가 만료되면 다른 워커가 이어받습니다.
+
+사용법:
+    python scripts/collect_ugc_queue.py enqueue [--full] [--queue 이름]
+    python scripts/collect_ugc_queue.py work [--enqueue] [--batch-size 5] [--platform tiktok|youtube|both]
+                                             [--deadline-minutes 60] [--queue 이름]
+    python scripts/collect_ugc_queue.py status [--queue 이름]
+
+    # 한 호스트에서 워커 8개:
+    python scripts/collection_supervisor.py --shards 8 --script queue -- work
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.collection import planner, scheduler, job_queue
+from src.collection.inprocess_worker import UGCTaskRunner
+
+logger = get_logger(__name__)
+
+
+def enqueue(queue, full=False):
+    """재수집 주기가 된 곡을 우선순위와 함께 큐에 넣습니다."""
+    jobs = scheduler.prioritize(planner.plan_jobs(['tiktok', 'youtube'], full=full))
+    return job_queue.enqueue_jobs(jobs, queue)
+
+
+def log_status(queue):
+    stats = job_queue.queue_stats(queue)
+    logger.info(f"📋 큐 '{queue}': 대기 {stats['pending']}개, 진행 중 {stats['leased']}개, "
+                f"완료 {stats['done']}개, 실패 {stats['failed']}개")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 큐 기반 UGC 수집")
+    parser.add_argument('--shards', type=int, default=None, help="감독 스크립트가 넘기는 값 (큐 워커는 사용하지 않음)")
+    parser.add_argument('--shard-index', type=int, default=None, help="감독 스크립트가 넘기는 값 (큐 워커는 사용하지 않음)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="수집 대상 곡을 큐에 추가")
+    enqueue_parser.add_argument('--full', action='store_true', help="재수집 주기와 관계없이 전체 곡 추가")
+    enqueue_parser.add_argument('--queue', default=None, help="큐 이름 (기본값: ugc-오늘날짜)")
+
+    work_parser = subparsers.add_parser('work', help="큐에서 작업을 가져와 수집")
+    work_parser.add_argument('--enqueue', action='store_true', help="시작 전에 수집 대상 곡을 큐에 추가")
+    work_parser.add_argument('--batch-size', type=int, default=5, help="한 번에 가져올 작업 수")
+    work_parser.add_argument('--platform', choices=['tiktok', 'youtube', 'both'], default='both')
+    work_parser.add_argument('--deadline-minutes', type=float, default=None, help="새 작업을 가져오지 않을 마감 시간 (분)")
+    work_parser.add_argument('--queue', default=None, help="큐 이름 (기본값: ugc-오늘날짜)")
+
+    status_parser = subparsers.add_parser('status', help="큐 상태 출력")
+    status_parser.add_argument('--queue', default=None, help="큐 이름 (기본값: ugc-오늘날짜)")
+
+    args = parser.parse_args()
+    queue = args.queue or job_queue.default_queue_name()
+
+    if args.command == 'enqueue':
+        enqueue(queue, args.full)
+        log_status(queue)
+        return
+
+    if args.command == 'status':
+        log_status(queue)
+        return
+
+    if args.enqueue:
+        # 여러 워커가 동시에 넣어도 같은 큐의 (플랫폼, 곡)은 한 번만 추가됨
+        enqueue(queue)
+
+    runner = UGCTaskRunner(timeout=180)
+    worker = job_queue.QueueWorker(
+        runner, queue=queue, batch_size=args.batch_size,
+        platforms=None if args.platform == 'both' else [args.platform])
+    deadline = time.time() + args.deadline_minutes * 60 if args.deadline_minutes else None
+    try:
+        worker.run(deadline)
+    except KeyboardInterrupt:
+        logger.info("⏹️ 사용자에 의해 중단되었습니다. (가져간 작업은 리스 만료 후 다른 워커가 처리)")
+        worker.stop()
+        runner.cancel()
+        sys.exit(1)
+    finally:
+        runner.close()
+    log_status(queue)
+
+
+if __name__ == "__main__":
+    main()
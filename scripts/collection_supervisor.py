@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+샤드 수집 감독 스크립트
+수집 스크립트를 `--shards N --shard-index i`로 N개 프로세스에 나눠 실행하고,
+워커별 진행 상황과 종료 코드를 모아 보여 줍니다. 곡은 songs.id의 고정 해시로 나뉘며
+각 워커는 자기 브라우저 풀을 가집니다. 워커 로그는 logs/<스크립트>_<실행ID>_shard-<i>.log에 남습니다.
+워커가 하나라도 비정상 종료하면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/collection_supervisor.py [--shards 8] [--script scripts/collect_ugc_async.py]
+                                            [--timeout-minutes 240] [-- 워커에 넘길 인자...]
+"""
+
+import sys
+import os
+import argparse
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.logger_config import get_logger
+from src.collection.sharding import run_shards
+
+logger = get_logger(__name__)
+
+WORKER_SCRIPTS = {
+    'async': 'scripts/collect_ugc_async.py',
+    'tiktok': 'scripts/collect_tiktok_batch_safe.py',
+    'youtube': 'scripts/collect_youtube_batch_safe.py',
+    'daily': 'scripts/daily_complete_collection.py',
+    'queue': 'scripts/collect_ugc_queue.py'  # 워커 인자로 `-- work` 지정
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 수집 감독")
+    parser.add_argument('--shards', type=int, default=os.cpu_count() or 2, help="워커 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--script', default='async',
+                        help=f"워커 스크립트 ({', '.join(WORKER_SCRIPTS)} 또는 경로, 기본값: async)")
+    parser.add_argument('--timeout-minutes', type=float, default=None, help="전체 제한 시간 (분)")
+    parser.add_argument('worker_args', nargs=argparse.REMAINDER, help="-- 뒤에 워커에 넘길 인자")
+    args = parser.parse_args()
+
+    worker_args = args.worker_args[1:] if args.worker_args[:1] == ['--'] else args.worker_args
+    script = WORKER_SCRIPTS.get(args.script, args.script)
+
+    result = run_shards(script, max(1, args.shards), worker_args,
+                        timeout_seconds=args.timeout_minutes * 60 if args.timeout_minutes else None)
+
+    for platform, counts in sorted(result['platforms'].items()):
+        logger.info(f"   [{platform}] 성공 {counts['success']}곡, 실패 {counts['failed']}곡")
+    if result['done'] > 0:
+        logger.info(f"🎯 성공률: {result['success'] / result['done'] * 100:.1f}%, "
+                    f"처리량 {result['done'] / max(result['duration'], 1) * 60:.1f}곡/분")
+
+    sys.exit(0 if all(code == 0 for code in result['exit_codes']) else 1)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("⏹️ 사용자에 의해 중단되었습니다.")
+        sys.exit(1)
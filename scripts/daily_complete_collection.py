@@ -2,40 +2,77 @@
 """
 일일 완전한 음악 트렌드 데이터 수집 마스터 스크립트
 매일 실행하여 모든 트렌드 데이터, UGC 카운트, 해시태그를 업데이트합니다.
+
+단계는 DAG로 실행됩니다. TikTok(트렌드 → UGC)과 YouTube(트렌드 → UGC) 브랜치가 동시에 진행되고,
+리포트는 두 브랜치가 모두 끝난 뒤 생성됩니다. --sequential 지정 시 단계를 하나씩 실행합니다.
+기본적으로 차트 스크래퍼가 곡을 파싱하는 즉시 UGC 수집을 시작하며(스트리밍),
+--no-stream(또는 UGC_STREAM=0) 지정 시 차트 스크립트를 별도 프로세스로 끝까지 실행한 뒤 수집합니다.
 """
 
 import sys
 import os
 import time
+import threading
 import subprocess
 from datetime import datetime
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.database import snapshot_store
 from src.database import database_manager as db
 from src.utils.logger_config import get_logger
+from src.collection.inprocess_worker import UGCTaskRunner
+from src.collection import planner, scheduler, sharding, song_stream
+from src.collection.pipeline_dag import PipelineDAG
 
 logger = get_logger(__name__)
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PLATFORMS = ('tiktok', 'youtube')
+PLATFORM_NAMES = {'tiktok': 'TikTok', 'youtube': 'YouTube'}
+TREND_SCRIPTS = {
+    'tiktok': 'src/scrapers/tiktok_music_scraper.py',
+    'youtube': 'src/scrapers/youtube_csv_scraper.py'
+}
+
 class DailyCollectionManager:
     def __init__(self):
         self.start_time = time.time()
         self.results = {
-            'trend_collection': False,
+            'trend_collection': {platform: False for platform in PLATFORMS},
             'tiktok_ugc_collection': {'success': 0, 'failed': 0},
             'youtube_ugc_collection': {'success': 0, 'failed': 0},
-            'total_songs_processed': 0
+            'total_songs_processed': 0,
+            'deferred': 0,
+            'streaming': {}
         }
+        # 플랫폼 브랜치마다 별도 UGC 곡 수집 실행기 (기본: 인프로세스, --subprocess 지정 시 곡마다 별도 프로세스)
+        self.ugc_runners = {platform: UGCTaskRunner(timeout=120) for platform in PLATFORMS}
+        self._results_lock = threading.Lock()
+        self._stop = threading.Event()
+        # UGC 수집 대상 (기본: 재수집 주기가 된 곡만, --full 지정 시 전체 곡)
+        self.full_scan = planner.is_full_scan()
+        # 전체 실행 시간 예산 (--budget-minutes N 또는 UGC_TIME_BUDGET_MINUTES, 기본: 제한 없음)
+        self.time_budget = scheduler.get_time_budget()
+        # 차트 → UGC 스트리밍 (샤드 감독 모드에서는 트렌드 수집이 끝난 뒤 워커로 나눠 수집)
+        shards, shard_index = sharding.get_shard_config()
+        self.stream = (not (shards > 1 and shard_index is None) and '--no-stream' not in sys.argv
+                       and os.getenv('UGC_STREAM', '1') != '0')
+        self._stream_runners = []
     
     def run_script(self, script_path, description, timeout=300):
         """스크립트 실행 및 결과 반환"""
         logger.info(f"🚀 {description} 시작...")
         
+        env = os.environ.copy()
+        env['PYTHONPATH'] = PROJECT_ROOT
+        env['PYTHONIOENCODING'] = 'utf-8'
+        
         try:
-            venv_python = os.path.join(os.path.dirname(__file__), 'test_env', 'bin', 'python')
+            # 이 스크립트를 실행한 인터프리터(가상환경 포함)로 실행
             result = subprocess.run([
-                venv_python, script_path
-            ], capture_output=True, text=True, timeout=timeout)
+                sys.executable, script_path
+            ], capture_output=True, text=True, timeout=timeout, cwd=PROJECT_ROOT, env=env)
             
             if result.returncode == 0:
                 logger.info(f"✅ {description} 완료")
@@ -52,172 +89,156 @@ class DailyCollectionManager:
             logger.error(f"💥 {description} 예외 발생: {e}")
             return False
     
-    def collect_trend_data(self):
-        """1단계: 트렌드 데이터 수집"""
-        logger.info("=" * 60)
-        logger.info("📊 1단계: 트렌드 데이터 수집")
-        logger.info("=" * 60)
-        
-        # TikTok 트렌드 수집
-        tiktok_success = self.run_script(
-            'src/scrapers/tiktok_music_scraper.py', 
-            'TikTok 트렌드 수집',
+    def collect_trend_data(self, platform):
+        """1단계: 플랫폼 트렌드 데이터 수집"""
+        success = self.run_script(
+            TREND_SCRIPTS[platform],
+            f'{PLATFORM_NAMES[platform]} 트렌드 수집',
             timeout=600  # 10분
         )
+        self.results['trend_collection'][platform] = success
+        return success
+    
+    def stream_trend_and_ugc(self, platform):
+        """1단계 + 2단계 (스트리밍): 차트를 스크래핑하면서 파싱된 곡의 UGC를 바로 수집"""
+        is_due = song_stream.make_due_filter(platform)
+        results = []
+        runners = []
         
-        # YouTube 트렌드 수집
-        youtube_success = self.run_script(
-            'src/scrapers/youtube_csv_scraper.py',
-            'YouTube 트렌드 수집', 
-            timeout=600  # 10분
-        )
+        def handler_factory():
+            # 워커 스레드마다 별도 실행기 (실행기는 한 번에 곡 하나만 처리)
+            runner = UGCTaskRunner(timeout=120)
+            runners.append(runner)
+            self._stream_runners.append(runner)
+            
+            def handle(job):
+                if self._stop.is_set():
+                    return None
+                due, reason = is_due(job)
+                if not due:
+                    logger.debug(f"⏭️ [{PLATFORM_NAMES[platform]}] {job['label']}: {reason}")
+                    return None
+                
+                logger.info(f"🌊 [{PLATFORM_NAMES[platform]}] {job['label']} "
+                            f"({job['category']} {job['rank']}위, {reason})")
+                result = runner.collect(platform, job['song_id'], job['platform_id'], job['label'])
+                with self._results_lock:
+                    results.append(dict(result, platform=platform))
+                    self.results[f"{platform}_ugc_collection"]['success' if result['success'] else 'failed'] += 1
+                if result['success']:
+                    logger.info(f"   ✅ 완료")
+                else:
+                    logger.error(f"   ❌ 실패: {result['error_message']}")
+                return result['success']
+            
+            return handle
         
-        self.results['trend_collection'] = tiktok_success and youtube_success
+        try:
+            success, stats = song_stream.SongStream(PLATFORM_NAMES[platform]).run(
+                song_stream.CHART_PRODUCERS[platform], handler_factory)
+        finally:
+            for runner in runners:
+                runner.close()
         
-        if self.results['trend_collection']:
-            logger.info("✅ 트렌드 데이터 수집 완료")
-        else:
-            logger.warning("⚠️ 일부 트렌드 데이터 수집 실패")
+        self.results['trend_collection'][platform] = bool(success)
+        self.results['streaming'][platform] = stats
+        try:
+            scheduler.record_latencies(results)
+        except Exception as e:
+            logger.warning(f"⚠️ 스케줄 기록 저장 실패: {e}")
+        return bool(success)
     
-    def collect_all_ugc_data(self):
-        """2단계: 모든 곡의 UGC 데이터 수집"""
+    def collect_all_ugc_data(self, platforms=PLATFORMS):
+        """2단계: 재수집이 필요한 곡의 UGC 데이터 수집 (시간 예산 안에서 가치가 높은 곡부터)"""
         logger.info("=" * 60)
-        logger.info("🎬 2단계: UGC 데이터 수집")
+        logger.info(f"🎬 2단계: UGC 데이터 수집 ({', '.join(PLATFORM_NAMES[platform] for platform in platforms)})")
         logger.info("=" * 60)
         
-        # TikTok UGC + 해시태그 수집
-        logger.info("🎭 TikTok UGC + 해시태그 수집 중...")
-        tiktok_success = self.collect_tiktok_ugc_data()
-        
-        # YouTube UGC 수집
-        logger.info("📺 YouTube UGC 수집 중...")
-        youtube_success = self.collect_youtube_ugc_data()
+        shards, shard_index = sharding.get_shard_config()
+        if shards > 1 and shard_index is None:
+            self.collect_ugc_sharded(shards)
+            return
         
-        total_processed = (self.results['tiktok_ugc_collection']['success'] + 
-                          self.results['tiktok_ugc_collection']['failed'] +
-                          self.results['youtube_ugc_collection']['success'] + 
-                          self.results['youtube_ugc_collection']['failed'])
+        try:
+            # 재수집 주기가 된 곡만 조회 (--full 지정 시 전체)
+            jobs = planner.plan_jobs(list(platforms), full=self.full_scan)
+            deadline = self.start_time + self.time_budget if self.time_budget else None
+            remaining = max(0, deadline - time.time()) if deadline else None
+            jobs, deferred = scheduler.schedule(jobs, remaining)
+        except Exception as e:
+            logger.error(f"❌ UGC 수집 계획 중 오류: {e}")
+            return
         
-        self.results['total_songs_processed'] = total_processed
+        logger.info(f"📊 UGC 수집 대상: {len(jobs)}개 곡")
+        sharding.report_total(len(jobs))
+        results = []
         
-        if tiktok_success and youtube_success:
-            logger.info("✅ 모든 UGC 데이터 수집 완료")
-        else:
-            logger.warning("⚠️ 일부 UGC 데이터 수집 실패")
-    
-    def collect_tiktok_ugc_data(self):
-        """TikTok 곡들의 UGC + 해시태그 수집"""
-        try:
-            # 모든 TikTok 곡 조회 (이미 수집된 것도 재수집하여 업데이트)
-            with db.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, title, artist, tiktok_id 
-                    FROM songs 
-                    WHERE tiktok_id IS NOT NULL
-                    ORDER BY id
-                """)
-                tiktok_songs = cursor.fetchall()
+        for i, job in enumerate(jobs, 1):
+            if self._stop.is_set():
+                break
+            if deadline and time.time() >= deadline:
+                # 예산을 넘기면 남은 (가치가 낮은) 작업은 다음 실행으로 연기
+                logger.warning(f"⏰ 시간 예산 소진: 남은 {len(jobs) - i + 1}곡 연기")
+                deferred = jobs[i - 1:] + deferred
+                break
             
-            logger.info(f"📊 TikTok 수집 대상: {len(tiktok_songs)}개 곡")
+            platform_name = PLATFORM_NAMES[job['platform']]
+            logger.info(f"[{i}/{len(jobs)}] [{platform_name}] {job['label']} "
+                        f"({job['tier']}, 우선순위 {job['priority']:.0f}, {job['reason']})")
             
-            success_count = 0
-            failed_count = 0
-            
-            for i, (song_id, title, artist, tiktok_id) in enumerate(tiktok_songs, 1):
-                tiktok_url = f"https://www.tiktok.com/music/x-{tiktok_id}"
-                
-                logger.info(f"[{i}/{len(tiktok_songs)}] {title} - {artist}")
+            try:
+                result = self.ugc_runners[job['platform']].collect(job['platform'], job['song_id'], job['platform_id'], job['label'])
+                results.append(dict(result, platform=job['platform']))
                 
-                try:
-                    venv_python = os.path.join(os.path.dirname(__file__), 'test_env', 'bin', 'python')
-                    result = subprocess.run([
-                        venv_python, 'src/scrapers/tiktok_ugc_counter.py', tiktok_url, '--save-db'
-                    ], capture_output=True, text=True, timeout=120)
+                if result['success']:
+                    self.results[f"{job['platform']}_ugc_collection"]['success'] += 1
+                    logger.info(f"   ✅ 완료")
+                else:
+                    self.results[f"{job['platform']}_ugc_collection"]['failed'] += 1
+                    logger.error(f"   ❌ 실패: {result['error_message']}")
                     
-                    if result.returncode == 0:
-                        success_count += 1
-                        logger.info(f"   ✅ 완료")
-                    else:
-                        failed_count += 1
-                        logger.error(f"   ❌ 실패")
-                        
-                except:
-                    failed_count += 1
-                    logger.error(f"   💥 오류")
-                
-                # 요청 간격 조절
-                if i < len(tiktok_songs):
-                    time.sleep(2)
-            
-            self.results['tiktok_ugc_collection'] = {
-                'success': success_count,
-                'failed': failed_count
-            }
-            
-            logger.info(f"🎭 TikTok 수집 완료: 성공 {success_count}개, 실패 {failed_count}개")
-            return failed_count == 0
-            
-        except Exception as e:
-            logger.error(f"❌ TikTok UGC 수집 중 오류: {e}")
-            return False
-    
-    def collect_youtube_ugc_data(self):
-        """YouTube 곡들의 UGC 수집"""
+            except:
+                self.results[f"{job['platform']}_ugc_collection"]['failed'] += 1
+                logger.error(f"   💥 오류")
+        
         try:
-            # 모든 YouTube 곡 조회 (이미 수집된 것도 재수집하여 업데이트)
-            with db.get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, title, artist, youtube_id 
-                    FROM songs 
-                    WHERE youtube_id IS NOT NULL
-                    ORDER BY id
-                """)
-                youtube_songs = cursor.fetchall()
-            
-            logger.info(f"📊 YouTube 수집 대상: {len(youtube_songs)}개 곡")
-            
-            success_count = 0
-            failed_count = 0
-            
-            for i, (song_id, title, artist, youtube_id) in enumerate(youtube_songs, 1):
-                shorts_url = f"https://www.youtube.com/source/{youtube_id}/shorts"
-                
-                logger.info(f"[{i}/{len(youtube_songs)}] {title} - {artist}")
-                
-                try:
-                    venv_python = os.path.join(os.path.dirname(__file__), 'test_env', 'bin', 'python')
-                    result = subprocess.run([
-                        venv_python, 'src/scrapers/youtube_ugc_counter.py', shorts_url, '--save-db'
-                    ], capture_output=True, text=True, timeout=120)
-                    
-                    if result.returncode == 0:
-                        success_count += 1
-                        logger.info(f"   ✅ 완료")
-                    else:
-                        failed_count += 1
-                        logger.error(f"   ❌ 실패")
-                        
-                except:
-                    failed_count += 1
-                    logger.error(f"   💥 오류")
-                
-                # 요청 간격 조절
-                if i < len(youtube_songs):
-                    time.sleep(2)
-            
-            self.results['youtube_ugc_collection'] = {
-                'success': success_count,
-                'failed': failed_count
-            }
-            
-            logger.info(f"📺 YouTube 수집 완료: 성공 {success_count}개, 실패 {failed_count}개")
-            return failed_count == 0
-            
+            scheduler.record_latencies(results)
+            scheduler.record_deferred(deferred)
         except Exception as e:
-            logger.error(f"❌ YouTube UGC 수집 중 오류: {e}")
-            return False
+            logger.warning(f"⚠️ 스케줄 기록 저장 실패: {e}")
+        
+        with self._results_lock:
+            # 두 브랜치가 동시에 끝날 수 있으므로 잠금 안에서 누적
+            self.results['deferred'] += len(deferred)
+        
+        for platform in platforms:
+            counts = self.results[f"{platform}_ugc_collection"]
+            logger.info(f"{'🎭' if platform == 'tiktok' else '📺'} {PLATFORM_NAMES[platform]} 수집 완료: "
+                        f"성공 {counts['success']}개, 실패 {counts['failed']}개")
+        
+        if not (any(self.results[f"{platform}_ugc_collection"]['failed'] for platform in platforms)
+                or deferred):
+            logger.info("✅ 모든 UGC 데이터 수집 완료")
+        else:
+            logger.warning("⚠️ 일부 UGC 데이터 수집 실패 또는 연기")
+    
+    def collect_ugc_sharded(self, shards):
+        """UGC 단계를 샤드 워커 N개(이 스크립트를 --shard-index로 실행)로 나눠 수집"""
+        worker_args = sharding.strip_shard_args(sys.argv[1:], extra_flags=('--budget-minutes',))
+        if self.time_budget:
+            # 트렌드 수집에 쓴 시간을 뺀 나머지 예산을 워커에 전달
+            remaining = max(0, self.start_time + self.time_budget - time.time())
+            worker_args += ['--budget-minutes', f"{remaining / 60:.1f}"]
+        
+        result = sharding.run_shards(__file__, shards, worker_args)
+        for platform, counts in result['platforms'].items():
+            self.results[f"{platform}_ugc_collection"] = counts
+        self.results['total_songs_processed'] = result['done']
+        
+        if all(code == 0 for code in result['exit_codes']) and result['failed'] == 0:
+            logger.info("✅ 모든 UGC 데이터 수집 완료")
+        else:
+            logger.warning("⚠️ 일부 UGC 데이터 수집 실패 또는 워커 비정상 종료")
     
     def generate_daily_report(self):
         """3단계: 수집 완료 보고서 생성"""
@@ -227,7 +248,7 @@ class DailyCollectionManager:
         
         try:
             # 향상된 리포트 생성 (백업에서 복원 필요 시)
-            if os.path.exists('backup/generate_enhanced_report.py.backup'):
+            if os.path.exists(os.path.join(PROJECT_ROOT, 'backup', 'generate_enhanced_report.py.backup')):
                 report_success = self.run_script(
                     'backup/generate_enhanced_report.py.backup',
                     '일일 HTML 리포트 생성',
@@ -251,13 +272,22 @@ class DailyCollectionManager:
         logger.info("=" * 60)
         logger.info("🎉 일일 완전 수집 완료!")
         logger.info("=" * 60)
-        logger.info(f"📊 트렌드 데이터: {'✅ 성공' if self.results['trend_collection'] else '❌ 실패'}")
+        trend_ok = all(self.results['trend_collection'].values())
+        logger.info(f"📊 트렌드 데이터: {'✅ 성공' if trend_ok else '❌ 실패'}")
         logger.info(f"🎭 TikTok UGC: 성공 {self.results['tiktok_ugc_collection']['success']}개, "
                    f"실패 {self.results['tiktok_ugc_collection']['failed']}개")
         logger.info(f"📺 YouTube UGC: 성공 {self.results['youtube_ugc_collection']['success']}개, "
                    f"실패 {self.results['youtube_ugc_collection']['failed']}개")
         logger.info(f"⏱️ 총 소요 시간: {duration_min:.1f}분")
-        logger.info(f"📈 처리된 곡 수: {self.results['total_songs_processed']}개")
+        processed = self.results['total_songs_processed'] or sum(
+            counts['success'] + counts['failed']
+            for counts in (self.results[f"{platform}_ugc_collection"] for platform in PLATFORMS))
+        logger.info(f"📈 처리된 곡 수: {processed}개")
+        if self.results['deferred']:
+            logger.info(f"⏭️ 다음 실행으로 연기된 곡 수: {self.results['deferred']}개")
+        for platform, stats in self.results['streaming'].items():
+            if stats['first_result_seconds'] is not None:
+                logger.info(f"⚡ {PLATFORM_NAMES[platform]} 첫 UGC 결과까지: {stats['first_result_seconds']:.1f}초")
         
         # 성공률 계산
         total_success = (self.results['tiktok_ugc_collection']['success'] + 
@@ -270,6 +300,54 @@ class DailyCollectionManager:
             logger.info(f"🎯 전체 성공률: {success_rate:.1f}%")
         
         logger.info("=" * 60)
+    
+    def build_pipeline(self):
+        """
+        일일 수집 단계 DAG
+        
+        TikTok 트렌드 → TikTok UGC, YouTube 트렌드 → YouTube UGC 두 브랜치가 동시에 실행되고,
+        리포트는 두 브랜치가 모두 끝난 뒤 실행됩니다. 기존 순차 실행과 같이 앞 단계가 실패해도
+        뒤 단계는 건너뛰지 않습니다 (DB에 이미 있는 곡의 UGC와 리포트는 여전히 유효).
+        """
+        pipeline = PipelineDAG('daily')
+        for platform in PLATFORMS:
+            if self.stream:
+                # 차트 곡을 파싱 즉시 UGC 수집. 뒤의 UGC 단계는 차트 밖에서 재수집 주기가 된 곡을 수집
+                pipeline.add_stage(f'{platform}_trends', lambda platform=platform: self.stream_trend_and_ugc(platform),
+                                   description=f'{PLATFORM_NAMES[platform]} 트렌드 수집 + UGC 스트리밍')
+            else:
+                pipeline.add_stage(f'{platform}_trends', lambda platform=platform: self.collect_trend_data(platform),
+                                   description=f'{PLATFORM_NAMES[platform]} 트렌드 수집')
+        
+        shards, shard_index = sharding.get_shard_config()
+        if shards > 1 and shard_index is None:
+            # 샤드 워커는 두 플랫폼을 함께 수집하므로 UGC는 트렌드 수집이 모두 끝난 뒤 한 단계로 실행
+            ugc_stages = ['ugc']
+            pipeline.add_stage('ugc', self.collect_all_ugc_data, deps=[f'{platform}_trends' for platform in PLATFORMS],
+                               description=f'UGC 샤드 수집 ({shards}개 워커)', skip_on_failed_deps=False)
+        else:
+            ugc_stages = [f'{platform}_ugc' for platform in PLATFORMS]
+            for platform in PLATFORMS:
+                pipeline.add_stage(f'{platform}_ugc', lambda platform=platform: self.collect_all_ugc_data((platform,)),
+                                   deps=[f'{platform}_trends'], description=f'{PLATFORM_NAMES[platform]} UGC 수집',
+                                   skip_on_failed_deps=False)
+        
+        pipeline.add_stage('report', self.generate_daily_report, deps=ugc_stages,
+                           description='일일 리포트 생성', skip_on_failed_deps=False)
+        # 보존 기간이 지난 페이지 스냅샷 정리
+        pipeline.add_stage('snapshot_retention', snapshot_store.apply_retention, deps=['report'],
+                           description='스냅샷 보존 기간 정리', skip_on_failed_deps=False)
+        return pipeline
+    
+    def cancel(self):
+        """진행 중인 UGC 수집을 멈춥니다 (현재 곡 이후 새 곡을 시작하지 않음)."""
+        self._stop.set()
+        for runner in list(self.ugc_runners.values()) + self._stream_runners:
+            runner.cancel()
+    
+    def close(self):
+        for runner in self.ugc_runners.values():
+            runner.close()
 
 def main():
     """메인 실행 함수"""
@@ -279,24 +357,32 @@ def main():
     logger.info(f"📅 수집 날짜: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
-        # 1단계: 트렌드 데이터 수집
-        collector.collect_trend_data()
+        if sharding.is_shard_worker():
+            # 샤드 워커: 감독 프로세스가 나머지 단계를 맡으므로 자기 샤드의 UGC만 수집
+            collector.collect_all_ugc_data()
+            collector.print_final_summary()
+            return
         
-        # 2단계: UGC 데이터 수집
-        collector.collect_all_ugc_data()
+        # 여러 단계가 동시에 DB에 쓰므로 읽기가 쓰기를 막지 않도록 WAL 모드 사용
+        db.enable_wal_mode()
         
-        # 3단계: 리포트 생성
-        collector.generate_daily_report()
+        # 트렌드 → UGC (플랫폼 브랜치 병렬, --shards N 지정 시 워커 N개로 나눠 수집) → 리포트
+        # Ctrl-C 시 실행 중인 단계를 기다리기 전에 UGC 수집부터 멈춤
+        collector.build_pipeline().run(max_workers=1 if '--sequential' in sys.argv else None,
+                                       on_cancel=collector.cancel)
         
         # 최종 결과 요약
         collector.print_final_summary()
         
     except KeyboardInterrupt:
         logger.info("⏹️ 사용자에 의해 중단되었습니다.")
+        collector.cancel()
         sys.exit(1)
     except Exception as e:
         logger.error(f"💥 예상치 못한 오류: {e}")
         sys.exit(1)
+    finally:
+        collector.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+스냅샷 재추출 스크립트
+저장된 페이지 스냅샷(page_snapshots)에 현재 추출기를 다시 실행해 DB의 파생 데이터
+(날짜별 UGC 카운트 이력, 날짜별 해시태그)를 다시 씁니다. 네트워크를 사용하지 않으며 파싱은 프로세스 풀에서 실행합니다.
+
+사용법:
+    python scripts/reextract_snapshots.py [--kind tiktok_sound_html ...] [--since 2025-01-01] [--until 2025-01-31]
+                                          [--workers 4] [--dry-run] [--prune]
+"""
+
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.database import database_manager as db
+from src.database import snapshot_store
+from src.utils.logger_config import get_logger, log_error_with_context
+from src.scrapers import tiktok_ugc_counter, youtube_ugc_counter
+from src.scrapers.tiktok_json_extractor import result_from_snapshot
+from src.scrapers.youtube_initial_data import parse_initial_data
+from src.scrapers.html_parser import make_soup
+
+logger = get_logger(__name__)
+
+# 스냅샷 종류 → 플랫폼
+SNAPSHOT_PLATFORMS = {
+    'tiktok_sound_json': 'tiktok',
+    'tiktok_sound_html': 'tiktok',
+    'youtube_shorts_html': 'youtube',
+    'youtube_shorts_rendered_html': 'youtube'
+}
+
+
+def extract_snapshot(snapshot):
+    """스냅샷 하나를 다시 추출합니다 (프로세스 풀 작업자에서 실행)."""
+    kind = snapshot['kind']
+    result = dict(snapshot, video_count=0, top_hashtags=[], error=None)
+    try:
+        if kind == 'tiktok_sound_json':
+            structured = result_from_snapshot(snapshot_store.load_snapshot_json(snapshot['content_hash']))
+            result['video_count'] = structured['video_count'] or 0
+            result['top_hashtags'] = structured['top_hashtags']
+        elif kind == 'tiktok_sound_html':
+            html_content = snapshot_store.load_snapshot(snapshot['content_hash'])
+            result['video_count'], result['top_hashtags'] = tiktok_ugc_counter.parse_sound_html(html_content)
+        elif kind == 'youtube_shorts_html':
+            data = parse_initial_data(snapshot_store.load_snapshot(snapshot['content_hash']))
+            result['video_count'] = youtube_ugc_counter.extract_count_from_initial_data(data) if data else 0
+        elif kind == 'youtube_shorts_rendered_html':
+            soup = make_soup(snapshot_store.load_snapshot(snapshot['content_hash']))
+            result['video_count'] = youtube_ugc_counter.extract_video_count_from_text(soup.get_text())
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def build_song_lookup():
+    """플랫폼별 {플랫폼 ID: (곡 ID, 라벨)}"""
+    lookup = {}
+    for platform in ('tiktok', 'youtube'):
+        lookup[platform] = {
+            platform_id: (song_id, f"{title} - {artist}")
+            for song_id, title, artist, platform_id in db.get_songs_with_platform_ids(platform)
+        }
+    return lookup
+
+
+def platform_id_from_url(platform, url):
+    if platform == 'tiktok':
+        return tiktok_ugc_counter.extract_tiktok_id(url)
+    return youtube_ugc_counter.extract_youtube_id(url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 스냅샷으로 UGC 데이터 재추출")
+    parser.add_argument('--kind', action='append', choices=list(SNAPSHOT_PLATFORMS),
+                        help="재추출할 스냅샷 종류 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument('--since', help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--until', help="종료 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help="파싱 프로세스 수")
+    parser.add_argument('--dry-run', action='store_true', help="DB에 쓰지 않고 결과만 출력")
+    parser.add_argument('--prune', action='store_true', help="시작 전에 보존 기간이 지난 스냅샷 정리")
+    args = parser.parse_args()
+
+    if args.prune:
+        snapshot_store.apply_retention()
+
+    kinds = args.kind or list(SNAPSHOT_PLATFORMS)
+    snapshots = snapshot_store.list_snapshots(kinds, args.since, args.until)
+    if not snapshots:
+        logger.info("✅ 재추출할 스냅샷이 없습니다.")
+        return
+
+    # 곡 테이블의 현재 카운트는 URL별 가장 최근 스냅샷으로만 갱신 (과거 날짜 백필이 덮어쓰지 않도록)
+    latest_dates = {}
+    for snapshot in snapshot_store.list_snapshots(kinds):
+        latest_dates[snapshot['url']] = max(latest_dates.get(snapshot['url'], ''), snapshot['snapshot_date'])
+
+    songs = build_song_lookup()
+    stats = {'total': len(snapshots), 'updated': 0, 'unmatched': 0, 'failed': 0}
+    started = time.time()
+    logger.info(f"🔁 스냅샷 {len(snapshots)}개 재추출 시작 (프로세스 {args.workers}개)")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for result in executor.map(extract_snapshot, snapshots, chunksize=8):
+            platform = SNAPSHOT_PLATFORMS[result['kind']]
+            if result['error'] or result['video_count'] <= 0:
+                stats['failed'] += 1
+                logger.warning(f"   ❌ {result['url']} ({result['snapshot_date']}): "
+                               f"{result['error'] or '비디오 카운트를 찾을 수 없음'}")
+                continue
+
+            song = songs[platform].get(platform_id_from_url(platform, result['url']))
+            if not song:
+                stats['unmatched'] += 1
+                logger.debug(f"곡을 찾을 수 없음: {result['url']}")
+                continue
+            song_id, label = song
+
+            logger.info(f"   ✅ [{platform}] {label} ({result['snapshot_date']}) → {result['video_count']:,}개, "
+                        f"해시태그 {len(result['top_hashtags'])}개")
+            if args.dry_run:
+                continue
+
+            try:
+                # 카운트 이력은 스냅샷을 받은 시점 날짜로 기록하고 ugc_last_updated는 그대로 둠
+                # (계획기가 재추출한 곡을 방금 수집한 것으로 보고 건너뛰지 않도록)
+                db.backfill_ugc_count(song_id, platform, result['video_count'],
+                                      result.get('fetched_at') or result['snapshot_date'],
+                                      update_current=result['snapshot_date'] == latest_dates.get(result['url']))
+                if result['top_hashtags']:
+                    db.save_song_hashtags(song_id, result['top_hashtags'], collected_date=result['snapshot_date'])
+                stats['updated'] += 1
+            except Exception as e:
+                stats['failed'] += 1
+                log_error_with_context(logger, e, f"{label} 재추출 결과 저장")
+
+    duration = time.time() - started
+    logger.info(f"🎉 재추출 완료: 갱신 {stats['updated']}개, 곡 없음 {stats['unmatched']}개, "
+                f"실패 {stats['failed']}개 / 전체 {stats['total']}개 ({duration:.1f}초)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("⏹️ 사용자에 의해 중단되었습니다.")
+        sys.exit(1)
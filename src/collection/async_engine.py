@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+asyncio 기반 UGC 동시 수집 엔진
+playwright.async_api로 브라우저 하나를 띄우고, TikTok/YouTube 곡 K개를 동시에 수집합니다.
+플랫폼(도메인)별 동시 실행 수 제한과 전체 마감 시간을 지원하며,
+완료된 결과는 기다리지 않고 바로 데이터베이스에 기록합니다.
+"""
+
+import os
+import sys
+import time
+import asyncio
+from playwright.async_api import async_playwright
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger, log_error_with_context
+from src.scrapers.html_parser import make_soup
+from src.scrapers import tiktok_ugc_counter, youtube_ugc_counter
+from src.scrapers.tiktok_json_extractor import (
+    TikTokResponseCollector, REHYDRATION_SCRIPT_IDS, parse_rehydration_text
+)
+from src.collection.inprocess_worker import build_song_url
+from src.database.snapshot_store import save_snapshot
+from src.scrapers.request_filter import install_route_policy_async, log_bandwidth_summary
+from src.scrapers.har_replay import is_har_active, new_context_async
+from src.scrapers import browser_state
+from src.collection import sharding, rate_limiter
+from src.scrapers.wait_strategies import wait_for_dom_quiet_async, log_wait_summary
+
+logger = get_logger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DOMAIN_LIMITS = {'tiktok': 4, 'youtube': 4}
+DEFAULT_TASK_TIMEOUT = 120  # 곡당 타임아웃 (초)
+LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+
+YOUTUBE_COUNT_SELECTOR = 'text=/\\d+[.,]?\\d*[KMB만억천백십]?\\s*(?:videos?|shorts?|개|결과)/'
+
+
+def _parse_youtube_html(html_content):
+    """YouTube Shorts 페이지 HTML 전체 텍스트에서 비디오 개수를 추출합니다."""
+    soup = make_soup(html_content)
+    return youtube_ugc_counter.extract_video_count_from_text(soup.get_text())
+
+
+async def collect_structured_data_async(page, collector, scroll_pages=tiktok_ugc_counter.JSON_SCROLL_PAGES):
+    """tiktok_ugc_counter.collect_structured_data의 async 버전 (개수를 찾지 못하면 None)"""
+    script_text = await page.evaluate(tiktok_ugc_counter.REHYDRATION_TEXT_SCRIPT, REHYDRATION_SCRIPT_IDS)
+    collector.rehydration_data = parse_rehydration_text(script_text)
+
+    # 첫 item list 응답 + 스크롤당 한 페이지씩 추가 응답 대기
+    for i in range(scroll_pages + 1):
+        if i > 0 or not collector.item_list_payloads:
+            try:
+                async with page.expect_response(TikTokResponseCollector.is_item_list_response,
+                                                timeout=tiktok_ugc_counter.JSON_RESPONSE_TIMEOUT):
+                    if i > 0:
+                        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            except Exception:
+                logger.debug(f"📜 item list 응답 대기 타임아웃 ({i}번째)")
+                break
+
+    return tiktok_ugc_counter.build_structured_result(collector)
+
+
+async def load_rendered_html_async(page, url):
+    """HTML 모드: 비디오 카운트 요소를 기다리고 스크롤한 뒤 전체 HTML을 반환합니다."""
+    try:
+        await page.wait_for_selector('text=videos', timeout=30000)
+    except Exception:
+        logger.warning(f"⚠️ 비디오 카운트 요소 타임아웃: {url}")
+
+    for _ in range(3):
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await wait_for_dom_quiet_async(page, quiet_ms=300, cap_ms=1000, legacy_ms=1000,
+                                       label="TikTok 사운드 페이지 스크롤 (async)")
+    return await page.content()
+
+
+async def scrape_tiktok_sound_async(page, url, extraction_mode=None):
+    """scrape_tiktok_sound_data의 async 버전 (동일한 결과 dict 반환, JSON 추출 우선)"""
+    result = {'video_count': 0, 'top_hashtags': [], 'success': False, 'error_message': None}
+    extraction_mode = extraction_mode or tiktok_ugc_counter.DEFAULT_EXTRACTION_MODE
+    collector = TikTokResponseCollector().attach_async(page) if extraction_mode == 'json' else None
+
+    response = await page.goto(url, wait_until="domcontentloaded")
+    if response is not None:
+        rate_limiter.observe_status(url, response.status)
+
+    structured = await collect_structured_data_async(page, collector) if collector is not None else None
+    if structured is not None:
+        await asyncio.to_thread(save_snapshot, url, 'tiktok_sound_json', collector.to_snapshot())
+        video_count, top_hashtags = structured['video_count'], structured['top_hashtags']
+    else:
+        html_content = await load_rendered_html_async(page, url)
+        await asyncio.to_thread(save_snapshot, url, 'tiktok_sound_html', html_content)
+        # HTML 파싱은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        video_count, top_hashtags = await asyncio.to_thread(tiktok_ugc_counter.parse_sound_html, html_content)
+
+    result.update(video_count=video_count, top_hashtags=top_hashtags, success=True)
+    return result
+
+
+async def scrape_youtube_shorts_async(page, url):
+    """scrape_youtube_shorts_data의 async 버전 (비디오 개수 반환)"""
+    if youtube_ugc_counter.DEFAULT_FETCH_MODE == 'http' and not is_har_active():
+        # 브라우저 없이 ytInitialData로 먼저 시도 (블로킹 HTTP는 스레드에서 실행)
+        count = await asyncio.to_thread(youtube_ugc_counter.fetch_shorts_count_http, url)
+        if count > 0:
+            return count
+
+    page.set_default_timeout(30000)
+    response = await page.goto(url, wait_until="networkidle", timeout=20000)
+    if response is not None:
+        rate_limiter.observe_status(url, response.status)
+    try:
+        await page.wait_for_selector(YOUTUBE_COUNT_SELECTOR, timeout=15000)
+    except Exception:
+        logger.debug(f"비디오 카운트 요소 대기 타임아웃: {url}")
+
+    await page.evaluate("window.scrollTo(0, 500)")
+    await wait_for_dom_quiet_async(page, quiet_ms=300, cap_ms=2000, legacy_ms=2000,
+                                   label="YouTube Shorts 스크롤 (async)")
+
+    try:
+        candidates = await page.evaluate(youtube_ugc_counter.SELECTOR_TEXTS_SCRIPT,
+                                         [list(spec) for spec in youtube_ugc_counter.COUNT_SELECTORS])
+        count, _ = youtube_ugc_counter.count_from_selector_texts(candidates)
+        if count > 0:
+            return count
+    except Exception as e:
+        logger.debug(f"선택자 검사 실패: {e}")
+
+    html_content = await page.content()
+    await asyncio.to_thread(save_snapshot, url, 'youtube_shorts_rendered_html', html_content)
+    return await asyncio.to_thread(_parse_youtube_html, html_content)
+
+
+async def _close_quietly(*targets):
+    """페이지/컨텍스트를 닫습니다. 닫다가 난 오류는 이미 계산한 결과를 덮지 않도록 무시합니다."""
+    for target in targets:
+        if target is None:
+            continue
+        try:
+            await target.close()
+        except Exception as e:
+            logger.debug(f"페이지/컨텍스트 종료 중 오류 (무시): {e}")
+
+
+def _save_result(job, result):
+    """완료된 작업 결과를 데이터베이스에 기록합니다 (쓰기 전용 스레드에서 호출)."""
+    if job['platform'] == 'tiktok':
+        tiktok_ugc_counter.save_result_for_song(job['song_id'], result, job.get('label'))
+    else:
+        youtube_ugc_counter.save_count_for_song(job['song_id'], result['video_count'], job.get('label'))
+
+
+class AsyncCollectionEngine:
+    """
+    플랫폼별 동시 실행 수 제한이 있는 비동기 UGC 수집 엔진
+
+    jobs는 {'platform': 'tiktok'|'youtube', 'song_id': int, 'platform_id': str, 'label': str}
+    형태의 dict 목록입니다.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, domain_limits=None,
+                 deadline_seconds=None, task_timeout=DEFAULT_TASK_TIMEOUT, save_db=True):
+        self.concurrency = concurrency
+        self.domain_limits = dict(DEFAULT_DOMAIN_LIMITS, **(domain_limits or {}))
+        self.deadline_seconds = deadline_seconds
+        self.task_timeout = task_timeout
+        self.save_db = save_db
+
+        self.stats = {
+            'total': 0,
+            'success': 0,
+            'failed': 0,
+            'skipped': 0,
+            'results': []
+        }
+
+    def run(self, jobs):
+        """동기 코드에서 호출하는 진입점"""
+        return asyncio.run(self.run_async(jobs))
+
+    async def run_async(self, jobs):
+        started = time.time()
+        deadline = started + self.deadline_seconds if self.deadline_seconds else None
+        self.stats['total'] = len(jobs)
+
+        global_limit = asyncio.Semaphore(self.concurrency)
+        domain_limits = {
+            platform: asyncio.Semaphore(limit) for platform, limit in self.domain_limits.items()
+        }
+        write_queue = asyncio.Queue()
+
+        logger.info(f"🚀 비동기 UGC 수집 시작: {len(jobs)}곡, 동시 {self.concurrency}개 "
+                    f"(플랫폼별 {self.domain_limits})")
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            # 플랫폼 컨텍스트는 공유 storage-state(쿠키/localStorage)로 미리 채움
+            contexts = {platform: await browser_state.new_context_async(browser) for platform in domain_limits}
+            writer = asyncio.create_task(self._db_writer(write_queue))
+
+            tasks = [
+                asyncio.create_task(
+                    self._run_job(job, browser, contexts[job['platform']], global_limit,
+                                  domain_limits[job['platform']], deadline, write_queue)
+                )
+                for job in jobs
+            ]
+
+            remaining = (deadline - time.time()) if deadline else None
+            done, pending = await asyncio.wait(tasks, timeout=remaining) if tasks else (set(), set())
+            if pending:
+                logger.warning(f"⏰ 전체 마감 시간 도달: 진행 중/대기 중인 {len(pending)}곡 취소")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                self.stats['skipped'] += len(pending)
+
+            await write_queue.put(None)
+            await writer
+
+            for context in contexts.values():
+                await browser_state.save_context_state_async(context)
+                await context.close()
+            await browser.close()
+
+        log_bandwidth_summary()
+        log_wait_summary()
+        rate_limiter.save_all()
+        rate_limiter.log_rate_summary()
+        duration = time.time() - started
+        self.stats['duration'] = duration
+        logger.info(f"🎉 비동기 수집 완료: 성공 {self.stats['success']}곡, 실패 {self.stats['failed']}곡, "
+                    f"건너뜀 {self.stats['skipped']}곡, 소요 {duration / 60:.1f}분")
+        return self.stats
+
+    async def _run_job(self, job, browser, context, global_limit, domain_limit, deadline, write_queue):
+        limiter = rate_limiter.get_limiter(job['platform'])
+        async with domain_limit:
+            if limiter is not None:
+                # 도메인 요청 속도 토큰을 기다리는 동안에는 전체 동시 실행 슬롯을 잡지 않음
+                await limiter.acquire_async()
+            async with global_limit:
+                if deadline and time.time() >= deadline:
+                    # 마감 이후에는 새 작업을 시작하지 않음
+                    self.stats['skipped'] += 1
+                    return None
+
+                url = build_song_url(job['platform'], job['platform_id'])
+                started = time.time()
+                har_context = None
+                page = None
+                try:
+                    # HAR 녹화/재생 모드에서는 곡(URL)마다 별도 컨텍스트
+                    har_context = await new_context_async(browser, url) if is_har_active() else None
+                    page = await (har_context or context).new_page()
+                    await install_route_policy_async(page, job['platform'])
+                    if job['platform'] == 'tiktok':
+                        result = await asyncio.wait_for(
+                            scrape_tiktok_sound_async(page, url), timeout=self.task_timeout)
+                    else:
+                        video_count = await asyncio.wait_for(
+                            scrape_youtube_shorts_async(page, url), timeout=self.task_timeout)
+                        result = {'video_count': video_count, 'top_hashtags': [],
+                                  'success': video_count > 0,
+                                  'error_message': None if video_count > 0 else "비디오 카운트를 찾을 수 없음"}
+                except asyncio.TimeoutError:
+                    result = {'video_count': 0, 'top_hashtags': [], 'success': False, 'error_message': "타임아웃"}
+                except Exception as e:
+                    log_error_with_context(logger, e, f"{job.get('label', url)} 비동기 수집")
+                    result = {'video_count': 0, 'top_hashtags': [], 'success': False, 'error_message': str(e)}
+                finally:
+                    # 녹화 모드에서는 HAR 컨텍스트를 닫을 때 HAR 파일이 기록됨
+                    await _close_quietly(page, har_context)
+
+        result['duration'] = time.time() - started
+        if limiter is not None:
+            limiter.record_result(result)
+        self._record(job, result)
+        if result['success'] and self.save_db:
+            await write_queue.put((job, result))
+        return result
+
+    def _record(self, job, result):
+        label = job.get('label', job['platform_id'])
+        sharding.report_result(job['platform'], result['success'])
+        if result['success']:
+            self.stats['success'] += 1
+            logger.info(f"   ✅ [{job['platform']}] {label} → {result['video_count']:,}개 "
+                        f"({result['duration']:.1f}초)")
+        else:
+            self.stats['failed'] += 1
+            logger.error(f"   ❌ [{job['platform']}] {label}: {result['error_message']}")
+        self.stats['results'].append({
+            'song_id': job['song_id'],
+            'platform': job['platform'],
+            'success': result['success'],
+            'video_count': result['video_count'],
+            'error_message': result['error_message'],
+            'duration': result['duration']
+        })
+
+    async def _db_writer(self, write_queue):
+        """완료된 결과를 순서대로 DB에 기록하는 단일 writer (SQLite 잠금 경합 방지)"""
+        while True:
+            item = await write_queue.get()
+            if item is None:
+                break
+            job, result = item
+            try:
+                await asyncio.to_thread(_save_result, job, result)
+            except Exception as e:
+                log_error_with_context(logger, e, f"곡 {job['song_id']} 결과 저장")
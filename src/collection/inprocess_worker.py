@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+UGC 수집 작업 실행기
+곡마다 Python 서브프로세스를 띄우는 대신, 전용 워커 스레드에서 스크래퍼 함수를
+직접 호출합니다. 인터프리터 시작, playwright/bs4 import, 로거 설정 비용은
+프로세스당 한 번만 발생하고 브라우저도 공유 풀에서 재사용됩니다.
+서브프로세스 격리는 --subprocess 옵션(또는 UGC_WORKER_MODE=subprocess)으로만 사용합니다.
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger, log_error_with_context
+from src.scrapers import tiktok_ugc_counter, youtube_ugc_counter
+from src.scrapers.browser_pool import shutdown_browser_pool
+from src.collection import sharding, rate_limiter
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+WORKER_MODE_INPROCESS = 'inprocess'
+WORKER_MODE_SUBPROCESS = 'subprocess'
+
+NO_COUNT_ERROR = "비디오 카운트를 찾을 수 없음"
+
+COUNTER_SCRIPTS = {
+    'tiktok': os.path.join(PROJECT_ROOT, 'src', 'scrapers', 'tiktok_ugc_counter.py'),
+    'youtube': os.path.join(PROJECT_ROOT, 'src', 'scrapers', 'youtube_ugc_counter.py')
+}
+
+
+class TaskCancelledError(Exception):
+    """작업이 타임아웃 또는 사용자 요청으로 취소되었을 때 발생"""
+
+
+def get_worker_mode(argv=None):
+    """명령행 인자와 환경변수에서 워커 모드를 결정합니다."""
+    argv = sys.argv if argv is None else argv
+    if '--subprocess' in argv:
+        return WORKER_MODE_SUBPROCESS
+    mode = os.getenv('UGC_WORKER_MODE', WORKER_MODE_INPROCESS).lower()
+    return mode if mode in (WORKER_MODE_INPROCESS, WORKER_MODE_SUBPROCESS) else WORKER_MODE_INPROCESS
+
+
+def build_song_url(platform, platform_id):
+    """플랫폼 ID로 UGC 카운터용 URL을 생성합니다."""
+    if platform == 'tiktok':
+        return f"https://www.tiktok.com/music/x-{platform_id}"
+    return f"https://www.youtube.com/source/{platform_id}/shorts"
+
+
+def collect_tiktok_song(song_id, tiktok_id, song_label=None, save_db=True, token=None):
+    """TikTok 곡 하나의 UGC 카운트와 해시태그를 수집하고 저장합니다."""
+    result = tiktok_ugc_counter.scrape_tiktok_sound_data(build_song_url('tiktok', tiktok_id))
+    if not result['success']:
+        return {'success': False, 'video_count': 0,
+                'error_message': result['error_message'] or "수집 실패"}
+
+    if save_db:
+        # 타임아웃으로 호출자가 포기한 작업의 늦은 결과는 저장하지 않음 (재시도와 경합 방지)
+        if token is not None:
+            token.raise_if_cancelled()
+        tiktok_ugc_counter.save_result_for_song(song_id, result, song_label)
+    return {'success': True, 'video_count': result['video_count'], 'error_message': None}
+
+
+def collect_youtube_song(song_id, youtube_id, song_label=None, save_db=True, token=None):
+    """YouTube 곡 하나의 Shorts UGC 카운트를 수집하고 저장합니다."""
+    video_count = youtube_ugc_counter.scrape_youtube_shorts_data(build_song_url('youtube', youtube_id))
+    if video_count <= 0:
+        return {'success': False, 'video_count': 0, 'error_message': NO_COUNT_ERROR}
+
+    if save_db:
+        if token is not None:
+            token.raise_if_cancelled()
+        youtube_ugc_counter.save_count_for_song(song_id, video_count, song_label)
+    return {'success': True, 'video_count': video_count, 'error_message': None}
+
+
+def parse_counter_output(platform, stdout):
+    """
+    서브프로세스 카운터의 출력을 인프로세스 수집기와 같은 결과 dict로 바꿉니다.
+    카운트를 찾지 못한 경우(YouTube 0, TikTok '오류:' 출력)는 종료 코드가 0이어도 실패로 처리합니다.
+    """
+    lines = [line.strip() for line in (stdout or '').splitlines() if line.strip()]
+    video_count = 0
+    if platform == 'youtube':
+        # YouTube 카운터는 첫 줄에 카운트를 출력함
+        try:
+            video_count = int(lines[0])
+        except (ValueError, IndexError):
+            pass
+        if video_count <= 0:
+            return {'success': False, 'video_count': 0, 'error_message': NO_COUNT_ERROR}
+    else:
+        # TikTok 카운터는 '비디오 개수: 1,234' 또는 '오류: ...'를 출력함
+        for line in lines:
+            if line.startswith('오류:'):
+                return {'success': False, 'video_count': 0,
+                        'error_message': line[len('오류:'):].strip() or "수집 실패"}
+            if line.startswith('비디오 개수:'):
+                try:
+                    video_count = int(line.split(':', 1)[1].replace(',', '').strip())
+                except ValueError:
+                    pass
+                break
+    return {'success': True, 'video_count': video_count, 'error_message': None}
+
+
+SONG_COLLECTORS = {
+    'tiktok': collect_tiktok_song,
+    'youtube': collect_youtube_song
+}
+
+
+class CancellationToken:
+    """워커 스레드와 호출자 사이에서 취소 여부를 공유하는 토큰"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise TaskCancelledError("작업이 취소되었습니다")
+
+
+class InProcessWorker:
+    """
+    전용 스레드 하나에서 함수를 실행하고, 호출자 쪽에서 타임아웃을 거는 워커
+
+    Playwright sync 호출은 외부에서 중단할 수 없으므로, 타임아웃이 나면 해당 스레드를
+    버리고 새 스레드로 교체합니다. 버려진 스레드는 진행 중인 호출이 끝나는 즉시
+    자신의 브라우저 풀을 정리하고 종료합니다.
+    """
+
+    def __init__(self, name='ugc-worker'):
+        self.name = name
+        self._executor = None
+        self._current_token = None
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+        return self._executor
+
+    @staticmethod
+    def _invoke(token, func, args, kwargs):
+        token.raise_if_cancelled()
+        try:
+            return func(*args, token=token, **kwargs)
+        finally:
+            if token.cancelled:
+                # 호출자가 이미 포기한 스레드: 브라우저를 남기지 않고 정리
+                shutdown_browser_pool()
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        """
+        워커 스레드에서 func(*args, token=token, **kwargs)를 실행하고 결과를 반환합니다.
+        func는 DB 저장 같은 부수 효과 전에 token.raise_if_cancelled()로 취소 여부를 확인해야 합니다.
+
+        Raises:
+            TimeoutError: timeout(초) 안에 끝나지 않은 경우
+            TaskCancelledError: cancel()로 취소된 경우
+        """
+        token = CancellationToken()
+        self._current_token = token
+        future = self._ensure_executor().submit(self._invoke, token, func, args, kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            token.cancel()
+            self._abandon()
+            raise TimeoutError(f"작업 타임아웃 ({timeout}초)")
+        finally:
+            self._current_token = None
+
+    def cancel(self):
+        """진행 중인 작업을 취소하고 워커 스레드를 교체합니다."""
+        if self._current_token is not None:
+            self._current_token.cancel()
+            self._abandon()
+
+    def _abandon(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def close(self):
+        """워커 스레드의 브라우저 풀을 정리하고 스레드를 종료합니다."""
+        if self._executor is not None:
+            try:
+                self._executor.submit(shutdown_browser_pool).result(timeout=30)
+            except Exception as e:
+                logger.debug(f"워커 브라우저 풀 정리 실패 (무시): {e}")
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class UGCTaskRunner:
+    """
+    곡 단위 UGC 수집 작업을 실행합니다.
+
+    기본은 인프로세스 모드이고, subprocess 모드에서는 기존처럼
+    `<counter>.py <url> --save-db`를 별도 프로세스로 실행합니다.
+    """
+
+    def __init__(self, mode=None, timeout=180, python_exe=None):
+        self.mode = mode or get_worker_mode()
+        self.timeout = timeout
+        self.python_exe = python_exe or sys.executable
+        self._worker = InProcessWorker() if self.mode == WORKER_MODE_INPROCESS else None
+
+    def collect(self, platform, song_id, platform_id, song_label=None):
+        """
+        곡 하나를 수집합니다.
+
+        Returns:
+            dict: {'success': bool, 'video_count': int, 'error_message': str or None, 'duration': float}
+        """
+        # 같은 도메인의 모든 수집기가 공유하는 요청 속도 제한 (고정 대기 대신)
+        limiter = rate_limiter.get_limiter(platform)
+        if limiter is not None:
+            waited = limiter.acquire()
+            if waited >= 1:
+                logger.info(f"   🚦 [{platform}] 요청 속도 조절: {waited:.1f}초 대기")
+        started = time.time()
+        if self.mode == WORKER_MODE_SUBPROCESS:
+            result = self._collect_subprocess(platform, platform_id)
+        else:
+            result = self._collect_inprocess(platform, song_id, platform_id, song_label)
+        result['duration'] = time.time() - started
+        if limiter is not None:
+            limiter.record_result(result)
+        sharding.report_result(platform, result['success'])
+        return result
+
+    def _collect_inprocess(self, platform, song_id, platform_id, song_label):
+        try:
+            return self._worker.run(SONG_COLLECTORS[platform], song_id, platform_id, song_label,
+                                    timeout=self.timeout)
+        except TimeoutError:
+            return {'success': False, 'video_count': 0, 'error_message': "타임아웃"}
+        except Exception as e:
+            log_error_with_context(logger, e, f"{platform} 인프로세스 수집")
+            return {'success': False, 'video_count': 0, 'error_message': str(e)}
+
+    def _collect_subprocess(self, platform, platform_id):
+        env = os.environ.copy()
+        env['PYTHONPATH'] = PROJECT_ROOT
+        env['PYTHONIOENCODING'] = 'utf-8'
+        env['PYTHONUTF8'] = '1'
+
+        try:
+            completed = subprocess.run([
+                self.python_exe, COUNTER_SCRIPTS[platform], build_song_url(platform, platform_id), '--save-db'
+            ], capture_output=True, text=True, timeout=self.timeout, cwd=PROJECT_ROOT, env=env)
+        except subprocess.TimeoutExpired:
+            return {'success': False, 'video_count': 0, 'error_message': "타임아웃"}
+        except Exception as e:
+            return {'success': False, 'video_count': 0, 'error_message': str(e)}
+
+        if completed.returncode != 0:
+            error_msg = completed.stderr.strip() if completed.stderr else "알 수 없는 오류"
+            return {'success': False, 'video_count': 0, 'error_message': error_msg}
+
+        return parse_counter_output(platform, completed.stdout)
+
+    def cancel(self):
+        """진행 중인 인프로세스 작업을 취소합니다."""
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.close()
+        rate_limiter.save_all()
+        rate_limiter.log_rate_summary()
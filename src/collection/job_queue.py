@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+SQLite 기반 UGC 수집 작업 큐
+collection_jobs 테이블에 곡 단위 작업을 넣고, 여러 수집 프로세스(같은 DB 파일을 쓰는 여러 호스트 포함)가
+리스(lease)를 잡아 작업을 나눠 가져갑니다. 작업을 가져가는 과정은 BEGIN IMMEDIATE 트랜잭션 안에서
+한 번에 처리되므로 같은 곡을 두 프로세스가 동시에 수집하지 않습니다.
+
+- 리스 만료 시각이 지난 작업은 다음 claim에서 자동으로 다시 배정됩니다 (워커가 죽은 경우).
+- 실패한 작업은 max_attempts까지 지수 백오프(next_run_at)로 재시도하고, 그 뒤에는 failed로 남습니다.
+- 완료/실패 기록은 리스를 가진 워커(owner)만 할 수 있어, 리스를 잃은 워커의 늦은 결과는 무시됩니다.
+
+공유 볼륨에서 쓰는 경우 파일 잠금을 제대로 지원하는 파일 시스템이어야 합니다 (SQLite 제약).
+"""
+
+import os
+import sys
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.collection import sharding, rate_limiter
+from src.utils.logger_config import get_logger, log_database_operation, log_error_with_context
+
+logger = get_logger(__name__)
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+DEFAULT_LEASE_SECONDS = int(os.getenv('UGC_QUEUE_LEASE_SECONDS', '300'))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('UGC_QUEUE_MAX_ATTEMPTS', '3'))
+RETRY_BASE_SECONDS = 60       # 첫 재시도 대기, 이후 두 배씩
+IDLE_POLL_SECONDS = 10        # 다른 워커의 리스가 남아 있을 때 다시 확인하는 간격
+
+
+def default_queue_name():
+    """오늘 날짜의 큐 이름 (같은 날 다시 넣어도 이미 있는 작업은 중복되지 않음)"""
+    return f"ugc-{datetime.now().strftime('%Y-%m-%d')}"
+
+
+def make_owner_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def enqueue_jobs(jobs, queue=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    계획기 작업 목록을 큐에 넣습니다. 같은 큐에 이미 있는 (플랫폼, 곡)은 건너뜁니다.
+
+    Returns:
+        int: 새로 추가한 작업 수
+    """
+    queue = queue or default_queue_name()
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.executemany("""
+            INSERT OR IGNORE INTO collection_jobs
+            (queue, platform, song_id, platform_id, label, priority, max_attempts)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(queue, job['platform'], job['song_id'], job['platform_id'], job.get('label'),
+               job.get('priority', 0), max_attempts) for job in jobs])
+        added = cur.rowcount
+        conn.commit()
+    log_database_operation(logger, f"작업 큐 '{queue}'에 추가", "collection_jobs", added)
+    return added
+
+
+def claim_jobs(owner, limit=5, lease_seconds=DEFAULT_LEASE_SECONDS, queue=None, platforms=None):
+    """
+    실행할 작업을 최대 limit개 가져와 리스를 잡습니다 (우선순위 높은 순).
+    대기 중인 작업과 리스가 만료된 작업이 대상입니다.
+
+    Returns:
+        list of dict: 가져온 작업 (id, platform, song_id, platform_id, label, attempts ...)
+    """
+    queue = queue or default_queue_name()
+    db.ensure_schema()
+    now = time.time()
+    platform_filter = ""
+    params = [queue, now, now]
+    if platforms:
+        platform_filter = f"AND platform IN ({', '.join('?' for _ in platforms)})"
+        params.extend(platforms)
+
+    with db.get_db_connection() as conn:
+        conn.isolation_level = None  # 트랜잭션을 직접 관리
+        try:
+            # 쓰기 잠금을 먼저 잡아 다른 프로세스가 같은 작업을 고르지 못하게 함
+            conn.execute("BEGIN IMMEDIATE")
+
+            # 만료된 리스 중 재시도 횟수를 다 쓴 작업은 실패 처리
+            conn.execute("""
+                UPDATE collection_jobs
+                SET status = ?, owner = NULL, last_error = '리스 만료 (워커 응답 없음)',
+                    updated_at = datetime('now', 'localtime')
+                WHERE queue = ? AND status = ? AND lease_expires_at < ? AND attempts >= max_attempts
+            """, (STATUS_FAILED, queue, STATUS_LEASED, now))
+
+            rows = conn.execute(f"""
+                SELECT * FROM collection_jobs
+                WHERE queue = ?
+                  AND ((status = 'pending' AND next_run_at <= ?) OR (status = 'leased' AND lease_expires_at < ?))
+                  {platform_filter}
+                ORDER BY priority DESC, id
+                LIMIT ?
+            """, params + [limit]).fetchall()
+
+            if rows:
+                ids = [row['id'] for row in rows]
+                expired = [row['id'] for row in rows if row['status'] == STATUS_LEASED]
+                conn.execute(f"""
+                    UPDATE collection_jobs
+                    SET status = ?, owner = ?, lease_expires_at = ?, attempts = attempts + 1,
+                        updated_at = datetime('now', 'localtime')
+                    WHERE id IN ({', '.join('?' for _ in ids)})
+                """, [STATUS_LEASED, owner, now + lease_seconds] + ids)
+                if expired:
+                    logger.warning(f"♻️ 리스가 만료된 작업 {len(expired)}개를 다시 가져옴: {expired}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    return [dict(row, owner=owner, attempts=row['attempts'] + 1) for row in rows]
+
+
+def renew_lease(job_id, owner, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """리스를 연장합니다. 이미 리스를 잃었으면 False."""
+    with db.get_db_connection() as conn:
+        cur = conn.execute("""
+            UPDATE collection_jobs SET lease_expires_at = ?, updated_at = datetime('now', 'localtime')
+            WHERE id = ? AND owner = ? AND status = ?
+        """, (time.time() + lease_seconds, job_id, owner, STATUS_LEASED))
+        conn.commit()
+        return cur.rowcount > 0
+
+
+def complete_job(job_id, owner, video_count=None):
+    """작업을 완료 처리합니다. 리스를 잃은 뒤의 결과면 False."""
+    with db.get_db_connection() as conn:
+        cur = conn.execute("""
+            UPDATE collection_jobs
+            SET status = ?, owner = NULL, lease_expires_at = NULL, video_count = ?, last_error = NULL,
+                updated_at = datetime('now', 'localtime')
+            WHERE id = ? AND owner = ? AND status = ?
+        """, (STATUS_DONE, video_count, job_id, owner, STATUS_LEASED))
+        conn.commit()
+        completed = cur.rowcount > 0
+    if not completed:
+        logger.warning(f"⚠️ 작업 {job_id}: 리스를 잃어 완료 기록을 건너뜀")
+    return completed
+
+
+def fail_job(job_id, owner, error_message):
+    """
+    작업 실패를 기록합니다. 재시도 횟수가 남았으면 지수 백오프 후 다시 대기 상태로 돌립니다.
+
+    Returns:
+        str: 바뀐 상태 (pending/failed), 리스를 잃었으면 None
+    """
+    with db.get_db_connection() as conn:
+        row = conn.execute("SELECT attempts, max_attempts FROM collection_jobs WHERE id = ? AND owner = ? AND status = ?",
+                           (job_id, owner, STATUS_LEASED)).fetchone()
+        if row is None:
+            logger.warning(f"⚠️ 작업 {job_id}: 리스를 잃어 실패 기록을 건너뜀")
+            return None
+
+        if row['attempts'] < row['max_attempts']:
+            status = STATUS_PENDING
+            next_run_at = time.time() + RETRY_BASE_SECONDS * (2 ** (row['attempts'] - 1))
+        else:
+            status = STATUS_FAILED
+            next_run_at = None
+        conn.execute("""
+            UPDATE collection_jobs
+            SET status = ?, owner = NULL, lease_expires_at = NULL, next_run_at = COALESCE(?, next_run_at),
+                last_error = ?, updated_at = datetime('now', 'localtime')
+            WHERE id = ? AND owner = ? AND status = ?
+        """, (status, next_run_at, error_message, job_id, owner, STATUS_LEASED))
+        conn.commit()
+    return status
+
+
+def release_job(job_id, owner):
+    """시작하지 않은 작업의 리스를 반납합니다 (시도 횟수도 되돌림)."""
+    with db.get_db_connection() as conn:
+        conn.execute("""
+            UPDATE collection_jobs
+            SET status = ?, owner = NULL, lease_expires_at = NULL, attempts = MAX(0, attempts - 1),
+                updated_at = datetime('now', 'localtime')
+            WHERE id = ? AND owner = ? AND status = ?
+        """, (STATUS_PENDING, job_id, owner, STATUS_LEASED))
+        conn.commit()
+
+
+def queue_stats(queue=None):
+    """상태별 작업 수 {'pending': n, 'leased': n, 'done': n, 'failed': n}"""
+    queue = queue or default_queue_name()
+    db.ensure_schema()
+    stats = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+    with db.get_db_connection() as conn:
+        for row in conn.execute("SELECT status, COUNT(*) AS count FROM collection_jobs WHERE queue = ? GROUP BY status",
+                                (queue,)):
+            stats[row['status']] = row['count']
+    return stats
+
+
+class QueueWorker:
+    """
+    큐에서 작업을 배치 단위로 가져와 UGCTaskRunner로 수집하는 워커 루프
+
+    대기 작업이 없어도 다른 워커가 리스를 가진 작업이 남아 있으면,
+    그 리스가 만료될 경우를 대비해 IDLE_POLL_SECONDS마다 다시 확인합니다.
+    """
+
+    def __init__(self, runner, queue=None, owner=None, batch_size=5, lease_seconds=None,
+                 platforms=None):
+        self.runner = runner
+        self.queue = queue or default_queue_name()
+        self.owner = owner or make_owner_id()
+        self.batch_size = batch_size
+        # 곡 하나(요청 속도 백오프 대기 포함)를 처리할 수 있을 만큼 리스를 잡고, 곡마다 연장
+        self.lease_seconds = lease_seconds or max(
+            DEFAULT_LEASE_SECONDS, int(runner.timeout * 1.5 + rate_limiter.BACKOFF_MAX_SECONDS))
+        self.platforms = platforms
+        self.stats = {'success': 0, 'failed': 0, 'lost_leases': 0}
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, deadline=None):
+        """
+        큐가 빌 때까지 (또는 deadline 유닉스 시각까지) 작업을 처리합니다.
+
+        Returns:
+            dict: {'success', 'failed', 'lost_leases'}
+        """
+        logger.info(f"🧵 큐 워커 시작: {self.owner} (큐 '{self.queue}', 배치 {self.batch_size}개)")
+        while not self._stop.is_set():
+            if deadline and time.time() >= deadline:
+                logger.warning("⏰ 마감 시간 도달: 새 작업을 가져오지 않습니다")
+                break
+
+            batch = claim_jobs(self.owner, self.batch_size, self.lease_seconds, self.queue, self.platforms)
+            if not batch:
+                # 다른 워커의 리스나 재시도 대기 작업이 남아 있으면 잠시 후 다시 확인
+                stats = queue_stats(self.queue)
+                if stats[STATUS_LEASED] == 0 and stats[STATUS_PENDING] == 0:
+                    break
+                time.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            sharding.report_total(len(batch))
+            for i, job in enumerate(batch):
+                if self._stop.is_set() or (deadline and time.time() >= deadline):
+                    for unstarted in batch[i:]:
+                        release_job(unstarted['id'], self.owner)
+                    break
+                # 곡 사이 간격은 runner의 도메인별 요청 속도 제한기가 조절
+                self._process(job)
+
+        logger.info(f"🧵 큐 워커 종료: 성공 {self.stats['success']}개, 실패 {self.stats['failed']}개, "
+                    f"리스 상실 {self.stats['lost_leases']}개")
+        return self.stats
+
+    def _process(self, job):
+        if not renew_lease(job['id'], self.owner, self.lease_seconds):
+            self.stats['lost_leases'] += 1
+            logger.warning(f"⚠️ [{job['platform']}] {job['label']}: 리스를 잃어 건너뜀")
+            return
+
+        logger.info(f"🎵 [{job['platform']}] {job['label']} (시도 {job['attempts']}/{job['max_attempts']})")
+        try:
+            result = self.runner.collect(job['platform'], job['song_id'], job['platform_id'], job['label'])
+        except Exception as e:
+            log_error_with_context(logger, e, f"{job['label']} 큐 작업")
+            result = {'success': False, 'video_count': 0, 'error_message': str(e)}
+
+        try:
+            if result['success']:
+                if complete_job(job['id'], self.owner, result.get('video_count')):
+                    self.stats['success'] += 1
+                    logger.info(f"   ✅ 완료 ({result.get('video_count', 0):,}개)")
+                else:
+                    self.stats['lost_leases'] += 1
+            else:
+                status = fail_job(job['id'], self.owner, result['error_message'])
+                if status is None:
+                    self.stats['lost_leases'] += 1
+                else:
+                    self.stats['failed'] += 1
+                    retry_note = "재시도 예정" if status == STATUS_PENDING else "재시도 없음"
+                    logger.error(f"   ❌ 실패 ({retry_note}): {result['error_message']}")
+        except sqlite3.Error as e:
+            # 기록에 실패해도 리스가 만료되면 다른 워커가 다시 가져감
+            log_error_with_context(logger, e, f"작업 {job['id']} 결과 기록")
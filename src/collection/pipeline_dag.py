@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계 DAG 실행기
+단계(stage)와 단계 사이 의존 관계를 선언하면, 의존 단계가 끝난 단계부터 스레드 풀에서 바로 실행합니다.
+서로 독립인 단계(예: TikTok 브랜치와 YouTube 브랜치)는 겹쳐서 실행되고,
+실행이 끝나면 단계별 타임라인(시작 시각, 소요 시간, 임계 경로)을 로그와 pipeline_stage_runs 테이블에 남깁니다.
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.utils.logger_config import get_logger, log_error_with_context, log_database_operation
+
+logger = get_logger(__name__)
+
+STATUS_SUCCESS = 'success'
+STATUS_FAILED = 'failed'
+STATUS_SKIPPED = 'skipped'
+
+STATUS_ICONS = {
+    STATUS_SUCCESS: '✅',
+    STATUS_FAILED: '❌',
+    STATUS_SKIPPED: '⏭️'
+}
+
+TIMELINE_WIDTH = 40  # 타임라인 막대 길이 (문자)
+
+
+class Stage:
+    """
+    파이프라인 단계 하나
+
+    Args:
+        name: 단계 이름 (DAG 안에서 유일)
+        func: 인자 없이 호출하는 함수. False를 반환하거나 예외가 나면 실패로 처리
+        deps: 먼저 끝나야 하는 단계 이름 목록
+        description: 로그에 표시할 설명
+        skip_on_failed_deps: True면 의존 단계가 실패/건너뜀일 때 이 단계를 건너뜀.
+                             False면 순서만 지키고 결과와 관계없이 실행
+    """
+
+    def __init__(self, name, func, deps=(), description=None, skip_on_failed_deps=True):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.description = description or name
+        self.skip_on_failed_deps = skip_on_failed_deps
+
+
+class PipelineDAG:
+    """의존 관계가 있는 단계들을 겹쳐서 실행하는 실행기"""
+
+    def __init__(self, name='pipeline'):
+        self.name = name
+        self.stages = {}
+
+    def add_stage(self, name, func, deps=(), description=None, skip_on_failed_deps=True):
+        if name in self.stages:
+            raise ValueError(f"중복된 단계 이름: {name}")
+        self.stages[name] = Stage(name, func, deps, description, skip_on_failed_deps)
+        return self.stages[name]
+
+    def validate(self):
+        """알 수 없는 의존 단계와 순환 의존을 검사합니다. 위상 정렬 순서를 반환합니다."""
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"단계 '{stage.name}'의 의존 단계가 없습니다: {', '.join(unknown)}")
+
+        order = []
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"순환 의존이 있습니다: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _run_stage(self, stage, started_at):
+        result = {'stage': stage.name, 'status': STATUS_SUCCESS, 'error': None,
+                  'thread': threading.current_thread().name}
+        result['start'] = time.time() - started_at
+        logger.info(f"▶️ [{stage.name}] {stage.description} 시작")
+        try:
+            if stage.func() is False:
+                result['status'] = STATUS_FAILED
+        except Exception as e:
+            log_error_with_context(logger, e, f"단계 '{stage.name}'")
+            result['status'] = STATUS_FAILED
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['end'] = time.time() - started_at
+        result['duration'] = result['end'] - result['start']
+        logger.info(f"{STATUS_ICONS[result['status']]} [{stage.name}] {stage.description} 종료 "
+                    f"({result['duration']:.1f}초)")
+        return result
+
+    def run(self, max_workers=None, on_cancel=None):
+        """
+        모든 단계를 의존 순서대로 실행합니다. 독립 단계는 동시에 실행됩니다.
+
+        Args:
+            max_workers: 동시에 실행할 단계 수 (None이면 단계 수, 1이면 순차 실행)
+            on_cancel: 기다리는 중 예외(Ctrl-C 등)가 나면 실행 중인 단계를 멈추도록 호출하는 함수.
+                       실행 중인 단계가 끝나기를 기다리지 않고 예외를 그대로 다시 발생시킴
+
+        Returns:
+            dict: {'run_id', 'duration', 'stages': {이름: {'status', 'start', 'end', 'duration', 'error'}},
+                   'critical_path': [단계 이름...]}
+        """
+        order = self.validate()
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        started_at = time.time()
+        results = {}
+        pending = list(order)
+        running = {}
+
+        logger.info(f"🧩 파이프라인 '{self.name}' 시작: 단계 {len(order)}개, 동시 실행 최대 "
+                    f"{max_workers or len(order)}개")
+
+        # with 블록은 종료 시 shutdown(wait=True)로 실행 중인 단계를 끝까지 기다리므로 Ctrl-C가 막힘
+        executor = ThreadPoolExecutor(max_workers=max_workers or max(1, len(order)),
+                                      thread_name_prefix=f"{self.name}-stage")
+        try:
+            while pending or running:
+                # 의존 단계가 모두 끝난 단계를 시작 (위상 정렬 순서 유지)
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(dep not in results for dep in stage.deps):
+                        continue
+                    pending.remove(name)
+                    failed_deps = [dep for dep in stage.deps if results[dep]['status'] != STATUS_SUCCESS]
+                    if failed_deps and stage.skip_on_failed_deps:
+                        offset = time.time() - started_at
+                        results[name] = {'stage': name, 'status': STATUS_SKIPPED, 'start': offset, 'end': offset,
+                                         'duration': 0.0, 'error': f"의존 단계 실패: {', '.join(failed_deps)}"}
+                        logger.warning(f"⏭️ [{name}] 건너뜀 (의존 단계 실패: {', '.join(failed_deps)})")
+                        continue
+                    running[executor.submit(self._run_stage, stage, started_at)] = name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        except BaseException:
+            logger.warning(f"⏹️ 파이프라인 '{self.name}' 중단: 실행 중인 단계 "
+                           f"{', '.join(running.values()) or '없음'}")
+            if on_cancel:
+                try:
+                    on_cancel()
+                except Exception as e:
+                    log_error_with_context(logger, e, f"파이프라인 '{self.name}' 취소")
+            # 아직 시작하지 않은 단계는 취소하고, 실행 중인 단계는 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+
+        duration = time.time() - started_at
+        summary = {
+            'run_id': run_id,
+            'duration': duration,
+            'stages': {name: results[name] for name in order},
+            'critical_path': self.critical_path(results)
+        }
+        log_timeline(self.name, summary)
+        save_timeline(self.name, summary)
+        return summary
+
+    def critical_path(self, results):
+        """끝 시각이 가장 늦은 단계에서 의존 단계를 거슬러 올라간 경로 (종단 간 지연을 결정한 단계들)"""
+        if not results:
+            return []
+        path = [max(results, key=lambda name: results[name]['end'])]
+        while True:
+            deps = [dep for dep in self.stages[path[-1]].deps if dep in results]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda name: results[name]['end']))
+        return list(reversed(path))
+
+
+def log_timeline(pipeline, summary):
+    """단계별 타임라인을 막대 그래프로 로그에 남깁니다."""
+    duration = max(summary['duration'], 1e-6)
+    stages = summary['stages']
+    sequential = sum(result['duration'] for result in stages.values())
+    name_width = max((len(name) for name in stages), default=0)
+
+    logger.info("=" * 60)
+    logger.info(f"🕒 '{pipeline}' 단계별 타임라인: 전체 {duration / 60:.1f}분 "
+                f"(순차 실행 시 {sequential / 60:.1f}분)")
+    for name, result in sorted(stages.items(), key=lambda item: item[1]['start']):
+        begin = int(result['start'] / duration * TIMELINE_WIDTH)
+        length = max(1, int(round(result['duration'] / duration * TIMELINE_WIDTH))) if result['duration'] else 0
+        bar = (' ' * begin + '█' * length).ljust(TIMELINE_WIDTH)[:TIMELINE_WIDTH]
+        logger.info(f"   {name.ljust(name_width)} |{bar}| {result['start']:7.1f}초 +{result['duration']:7.1f}초 "
+                    f"{STATUS_ICONS[result['status']]}")
+    if summary['critical_path']:
+        logger.info(f"🧭 임계 경로: {' → '.join(summary['critical_path'])}")
+    logger.info("=" * 60)
+
+
+def save_timeline(pipeline, summary):
+    """단계별 타임라인을 pipeline_stage_runs 테이블에 저장합니다 (실패해도 무시)."""
+    try:
+        db.ensure_schema()
+        rows = [(pipeline, summary['run_id'], name, result['status'], result['start'],
+                 result['duration'], result['error'])
+                for name, result in summary['stages'].items()]
+        with db.get_db_connection() as conn:
+            conn.executemany("""
+                INSERT INTO pipeline_stage_runs (pipeline, run_id, stage, status, started_offset, duration, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+        log_database_operation(logger, "파이프라인 타임라인 저장", "pipeline_stage_runs", len(rows))
+    except Exception as e:
+        logger.warning(f"⚠️ 파이프라인 타임라인 저장 실패: {e}")
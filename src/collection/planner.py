@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+UGC 수집 계획기
+DB 상태(차트 진입 여부, 마지막 수집 시각, 직전 카운트 변화량)로 이번 실행에서 꼭 다시 수집해야 하는
+곡만 골라 작업 목록을 만듭니다. 차트에서 내려간 지 오래된 곡은 드물게만 다시 수집하므로
+야간 작업량이 누적 곡 수가 아니라 활성 곡 수에 비례합니다.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.collection import sharding
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# 곡 등급별 재수집 주기 (일)
+TIER_CHARTING = 'charting'  # 가장 최근 차트 수집일에 차트에 있음
+TIER_RECENT = 'recent'      # RECENT_CHART_DAYS 이내에 차트에 있었음
+TIER_DORMANT = 'dormant'    # 그 외
+TIER_REFRESH_DAYS = {
+    TIER_CHARTING: 1,
+    TIER_RECENT: 3,
+    TIER_DORMANT: 14
+}
+TIER_ORDER = [TIER_CHARTING, TIER_RECENT, TIER_DORMANT]
+RECENT_CHART_DAYS = 14
+
+# 직전 수집 대비 카운트가 이 비율 이상 변했으면 재수집 주기를 절반으로 줄임
+VOLATILE_CHANGE_RATIO = 0.05
+# 매일 같은 시각에 실행해도 몇 분 차이로 하루를 건너뛰지 않도록 주는 여유
+SCHEDULE_SLACK = timedelta(hours=2)
+
+PLATFORM_ID_COLUMNS = {
+    'tiktok': 'tiktok_id',
+    'youtube': 'youtube_id'
+}
+PLATFORM_COUNT_COLUMNS = {
+    'tiktok': 'tiktok_ugc_count',
+    'youtube': 'youtube_ugc_count'
+}
+
+
+def is_full_scan(argv=None):
+    """명령행 인자(--full)와 환경변수(UGC_PLAN_FULL=1)에서 전체 수집 여부를 결정합니다."""
+    argv = sys.argv if argv is None else argv
+    return '--full' in argv or os.getenv('UGC_PLAN_FULL', '0') == '1'
+
+
+def _parse_datetime(value):
+    if not value:
+        return None
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def load_song_states(platform):
+    """
+    플랫폼 ID가 있는 곡들의 계획용 상태를 읽습니다.
+
+    Returns:
+        list of dict: song_id, title, artist, platform_id, last_chart_date, latest_chart_date,
+                      best_rank, last_collected_at, last_count, previous_count, is_trending, is_new_hit
+    """
+    id_column = PLATFORM_ID_COLUMNS[platform]
+    count_column = PLATFORM_COUNT_COLUMNS[platform]
+
+    with db.get_db_connection() as conn:
+        cur = conn.cursor()
+        latest_chart_date = cur.execute("SELECT MAX(date) FROM daily_trends").fetchone()[0]
+
+        cur.execute(f"""
+            SELECT s.id, s.title, s.artist, s.{id_column} AS platform_id, s.{count_column} AS song_count,
+                   s.ugc_last_updated, s.is_trending, s.is_new_hit,
+                   (SELECT MAX(t.date) FROM daily_trends t WHERE t.song_id = s.id) AS last_chart_date,
+                   (SELECT MIN(t.rank) FROM daily_trends t WHERE t.song_id = s.id AND t.date = ?) AS best_rank
+            FROM songs s
+            WHERE s.{id_column} IS NOT NULL AND s.{id_column} != ''
+        """, (latest_chart_date,))
+        songs = cur.fetchall()
+
+        # 곡별 최근 2회 수집 이력
+        history = {}
+        try:
+            cur.execute("""
+                SELECT song_id, video_count, collected_at FROM (
+                    SELECT song_id, video_count, collected_at,
+                           ROW_NUMBER() OVER (PARTITION BY song_id ORDER BY collected_date DESC) AS rn
+                    FROM ugc_count_history WHERE platform = ?
+                ) WHERE rn <= 2 ORDER BY song_id, rn
+            """, (platform,))
+            for row in cur.fetchall():
+                history.setdefault(row['song_id'], []).append(row)
+        except Exception as e:
+            logger.debug(f"UGC 이력 조회 실패 (이력 없이 계획): {e}")
+
+    states = []
+    for song in songs:
+        rows = history.get(song['id'], [])
+        if rows:
+            last_collected_at = _parse_datetime(rows[0]['collected_at'])
+            last_count = rows[0]['video_count']
+        else:
+            # 이력 테이블 도입 이전 데이터: 카운트가 있으면 ugc_last_updated를 마지막 수집 시각으로 사용
+            last_collected_at = _parse_datetime(song['ugc_last_updated']) if song['song_count'] else None
+            last_count = song['song_count']
+
+        states.append({
+            'song_id': song['id'],
+            'title': song['title'],
+            'artist': song['artist'],
+            'platform_id': song['platform_id'],
+            'last_chart_date': song['last_chart_date'],
+            'latest_chart_date': latest_chart_date,
+            'best_rank': song['best_rank'],
+            'is_trending': bool(song['is_trending']),
+            'is_new_hit': bool(song['is_new_hit']),
+            'last_collected_at': last_collected_at,
+            'last_count': last_count,
+            'previous_count': rows[1]['video_count'] if len(rows) > 1 else None
+        })
+    return states
+
+
+def classify_tier(state):
+    """차트 진입 상태로 곡 등급을 정합니다."""
+    last_chart = _parse_datetime(state.get('last_chart_date'))
+    latest_chart = _parse_datetime(state.get('latest_chart_date'))
+    if last_chart is None or latest_chart is None:
+        return TIER_DORMANT
+    days_off_chart = (latest_chart - last_chart).days
+    if days_off_chart <= 0:
+        return TIER_CHARTING
+    if days_off_chart <= RECENT_CHART_DAYS:
+        return TIER_RECENT
+    return TIER_DORMANT
+
+
+def change_ratio(state):
+    """직전 두 번의 수집 사이 카운트 변화율. 알 수 없으면 None."""
+    last_count = state.get('last_count')
+    previous_count = state.get('previous_count')
+    if not last_count or not previous_count:
+        return None
+    return abs(last_count - previous_count) / previous_count
+
+
+def refresh_window(state):
+    """곡의 재수집 주기 (timedelta)"""
+    days = TIER_REFRESH_DAYS[classify_tier(state)]
+    ratio = change_ratio(state)
+    if ratio is not None and ratio >= VOLATILE_CHANGE_RATIO:
+        days = max(1, days // 2)
+    return timedelta(days=days)
+
+
+def plan_song(state, now=None):
+    """
+    곡 하나의 수집 필요 여부를 판단합니다.
+
+    Returns:
+        dict: {'due': bool, 'tier': str, 'reason': str, 'overdue': float(주기 대비 경과 비율)}
+    """
+    now = now or datetime.now()
+    tier = classify_tier(state)
+    window = refresh_window(state)
+    last_collected_at = state.get('last_collected_at')
+
+    if last_collected_at is None:
+        return {'due': True, 'tier': tier, 'reason': "수집 이력 없음", 'overdue': float('inf')}
+
+    age = now - last_collected_at
+    overdue = age / window
+    if age + SCHEDULE_SLACK >= window:
+        return {'due': True, 'tier': tier, 'reason': f"{age.days}일 경과 (주기 {window.days}일)", 'overdue': overdue}
+    return {'due': False, 'tier': tier, 'reason': f"최신 ({age.days}일 경과, 주기 {window.days}일)", 'overdue': overdue}
+
+
+def build_job(platform, state, plan):
+    return {
+        'platform': platform,
+        'song_id': state['song_id'],
+        'platform_id': state['platform_id'],
+        'label': f"{state['title']} - {state['artist']}",
+        'tier': plan['tier'],
+        'reason': plan['reason'],
+        'overdue': plan['overdue'],
+        'state': state
+    }
+
+
+def plan_jobs(platforms=('tiktok', 'youtube'), now=None, full=False):
+    """
+    이번 실행의 UGC 수집 작업 목록을 만듭니다.
+
+    Args:
+        platforms: 계획할 플랫폼 목록
+        now: 기준 시각 (None이면 현재)
+        full: True면 주기와 관계없이 모든 곡을 포함 (기존 동작)
+
+    Returns:
+        list of dict: {'platform', 'song_id', 'platform_id', 'label', 'tier', 'reason', 'overdue', 'state'}
+                      등급(차트 진입 순) → 주기 대비 경과 비율이 큰 순으로 정렬
+    """
+    jobs = []
+    shards, shard_index = sharding.get_shard_config()
+    for platform in platforms:
+        # 샤드 워커는 songs.id 해시가 자기 샤드인 곡만 계획
+        states = [state for state in load_song_states(platform) if sharding.in_shard(state['song_id'])]
+        tier_counts = {tier: 0 for tier in TIER_ORDER}
+        due_count = 0
+        for state in states:
+            plan = plan_song(state, now)
+            if plan['due']:
+                due_count += 1
+                tier_counts[plan['tier']] += 1
+            if full or plan['due']:
+                jobs.append(build_job(platform, state, plan))
+
+        tier_summary = ", ".join(f"{tier} {count}" for tier, count in tier_counts.items())
+        shard_label = f" [샤드 {shard_index}/{shards}]" if shard_index is not None and shards > 1 else ""
+        logger.info(f"🗓️ [{platform}]{shard_label} 수집 계획: 전체 {len(states)}곡 중 재수집 필요 {due_count}곡 "
+                    f"({tier_summary})" + (" - 전체 수집 모드" if full else ""))
+
+    jobs.sort(key=lambda job: (TIER_ORDER.index(job['tier']), -job['overdue']))
+    return jobs
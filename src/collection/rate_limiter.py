@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+도메인별 적응형 요청 속도 제한기
+곡 사이 고정 대기(time.sleep) 대신 도메인마다 토큰 버킷 하나를 두고, 응답 상태에 따라 속도를 AIMD로 조정합니다.
+정상 응답이 이어지면 초당 요청 수를 조금씩 올리고, 타임아웃/빈 카운트/HTTP 429가 나오면 속도를 절반으로 줄이고
+지터를 섞은 지수 백오프 동안 요청을 멈춥니다.
+한 프로세스의 모든 수집기(UGCTaskRunner, 비동기 엔진, 큐 워커)가 같은 제한기를 공유하고,
+학습된 속도는 rate_limits 테이블에 저장되어 다음 실행과 상태 확인에 사용됩니다.
+
+사용법:
+    python src/collection/rate_limiter.py          # 도메인별 현재 속도 출력
+    python src/collection/rate_limiter.py --reset  # 학습된 속도 초기화
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.collection import sharding
+from src.scrapers.har_replay import HAR_MODE, HAR_MODE_REPLAY
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DOMAINS = {
+    'tiktok': 'www.tiktok.com',
+    'youtube': 'www.youtube.com'
+}
+
+# 도메인 전체 초당 요청 수 (샤드 워커는 샤드 수로 나눠 사용)
+DEFAULT_RATE = float(os.getenv('UGC_RATE_DEFAULT', '0.5'))  # 기존 곡 간 2초 간격과 같음
+MIN_RATE = float(os.getenv('UGC_RATE_MIN', '0.02'))
+MAX_RATE = float(os.getenv('UGC_RATE_MAX', '2.0'))
+BURST = 1  # 버킷 용량: 쉬고 난 직후에도 한 번에 몰아서 요청하지 않음
+
+# AIMD: 정상 응답마다 +ADDITIVE_STEP, 스로틀 신호마다 ×DECREASE_FACTOR
+ADDITIVE_STEP = 0.05
+DECREASE_FACTOR = 0.5
+
+# 스로틀 신호 후 백오프: BASE × 2^(연속 횟수-1), 상한 MAX, 절반~전체 구간에서 무작위
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 300.0
+
+SAVE_INTERVAL_SECONDS = 30
+
+RATE_LIMIT_ENABLED = os.getenv('UGC_RATE_LIMIT', '1') != '0'
+
+OUTCOME_OK = 'ok'
+OUTCOME_THROTTLED = 'throttled'
+OUTCOME_ERROR = 'error'  # 파싱 오류 등 서버 부하와 무관한 실패: 속도 유지
+
+THROTTLE_STATUSES = (429,)
+THROTTLE_MARKERS = ('타임아웃', 'timeout', 'timed out', '429', 'too many requests',
+                    '비디오 카운트를 찾을 수 없음')
+
+_limiters_lock = threading.Lock()
+_limiters = {}
+
+
+def backoff_delay(attempt):
+    """연속 attempt번째 스로틀 신호 후의 대기 시간 (초, 지터 포함)"""
+    cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** max(0, attempt - 1))
+    return random.uniform(cap / 2, cap)
+
+
+def classify_result(result):
+    """
+    수집 결과 dict로 속도 조정 신호를 정합니다.
+
+    Returns:
+        str: OUTCOME_OK / OUTCOME_THROTTLED (타임아웃, 빈 카운트, HTTP 429) / OUTCOME_ERROR
+    """
+    if result.get('success') and result.get('video_count'):
+        return OUTCOME_OK
+    error = (result.get('error_message') or '').lower()
+    if result.get('success') or any(marker in error for marker in THROTTLE_MARKERS):
+        # 성공이지만 카운트 0도 빈 응답으로 취급
+        return OUTCOME_THROTTLED
+    return OUTCOME_ERROR
+
+
+def domain_for(platform_or_url):
+    """플랫폼 이름 또는 URL을 제한기 도메인으로 바꿉니다. 알 수 없으면 None."""
+    if platform_or_url in DOMAINS:
+        return DOMAINS[platform_or_url]
+    host = urlparse(platform_or_url).hostname or ''
+    for platform, domain in DOMAINS.items():
+        if host == f"{platform}.com" or host.endswith(f".{platform}.com"):
+            return domain
+    return None
+
+
+class DomainLimiter:
+    """
+    도메인 하나의 토큰 버킷 + AIMD 속도 조정기 (스레드 안전)
+
+    rate는 도메인 전체 속도이고, 이 프로세스는 rate × share 만큼 사용합니다.
+    """
+
+    def __init__(self, domain, rate=DEFAULT_RATE, share=1.0):
+        self.domain = domain
+        self.rate = rate
+        self.share = share
+        self.consecutive_throttles = 0
+        self.backoff_until = 0.0
+        self.successes = 0
+        self.throttles = 0
+        self._unsaved = [0, 0]  # 마지막 저장 이후 (정상, 스로틀) 횟수
+        self._tokens = BURST
+        self._refilled_at = time.time()
+        self._pending_throttle = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.time()
+            rate = max(MIN_RATE, self.rate) * self.share
+            self._tokens = min(BURST, self._tokens + (now - self._refilled_at) * rate)
+            self._refilled_at = now
+            self._tokens -= 1
+            wait = -self._tokens / rate if self._tokens < 0 else 0.0
+            return max(wait, self.backoff_until - now)
+
+    def acquire(self):
+        """요청 하나를 보낼 수 있을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        if not RATE_LIMIT_ENABLED:
+            return 0.0
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """acquire의 async 버전 (이벤트 루프를 막지 않음)"""
+        if not RATE_LIMIT_ENABLED:
+            return 0.0
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe_status(self, status):
+        """스크래퍼가 본 HTTP 상태 코드. 429면 이번 곡 결과를 스로틀로 처리합니다."""
+        if status in THROTTLE_STATUSES:
+            with self._lock:
+                self._pending_throttle = True
+
+    def record(self, outcome):
+        """요청 결과로 속도를 조정합니다."""
+        with self._lock:
+            now = time.time()
+            if self._pending_throttle:
+                outcome = OUTCOME_THROTTLED
+                self._pending_throttle = False
+
+            if outcome == OUTCOME_OK:
+                self.successes += 1
+                self._unsaved[0] += 1
+                self.consecutive_throttles = 0
+                self.rate = min(MAX_RATE, self.rate + ADDITIVE_STEP)
+            elif outcome == OUTCOME_THROTTLED:
+                self.throttles += 1
+                self._unsaved[1] += 1
+                if now < self.backoff_until:
+                    # 같은 백오프 구간에 동시에 끝난 요청들: 한 번만 줄임
+                    return
+                self.consecutive_throttles += 1
+                previous = self.rate
+                self.rate = max(MIN_RATE, self.rate * DECREASE_FACTOR)
+                delay = backoff_delay(self.consecutive_throttles)
+                self.backoff_until = now + delay
+                self._tokens = 0
+                logger.warning(f"🐢 [{self.domain}] 스로틀 신호 {self.consecutive_throttles}회 연속: "
+                               f"{previous:.2f} → {self.rate:.2f}회/초, {delay:.0f}초 대기")
+            else:
+                return
+
+        if outcome == OUTCOME_THROTTLED or now - self._saved_at >= SAVE_INTERVAL_SECONDS:
+            self.save()
+
+    def record_result(self, result):
+        """수집 결과 dict로 record를 호출합니다."""
+        self.record(classify_result(result))
+
+    def snapshot(self):
+        """현재 상태 (관찰용)"""
+        with self._lock:
+            return {
+                'domain': self.domain,
+                'rate': round(self.rate, 3),
+                'process_rate': round(self.rate * self.share, 3),
+                'consecutive_throttles': self.consecutive_throttles,
+                'backoff_remaining': round(max(0.0, self.backoff_until - time.time()), 1),
+                'successes': self.successes,
+                'throttles': self.throttles
+            }
+
+    def save(self):
+        """현재 속도를 rate_limits 테이블에 저장합니다 (실패해도 수집은 계속)."""
+        with self._lock:
+            values = (self.domain, self.rate, self.consecutive_throttles, self.backoff_until,
+                      self._unsaved[0], self._unsaved[1])
+            self._saved_at = time.time()
+            self._unsaved = [0, 0]
+        try:
+            db.ensure_schema()
+            with db.get_db_connection() as conn:
+                conn.execute("""
+                    INSERT INTO rate_limits (domain, rate, consecutive_throttles, backoff_until,
+                                             successes, throttles, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
+                    ON CONFLICT(domain) DO UPDATE SET
+                        rate = excluded.rate,
+                        consecutive_throttles = excluded.consecutive_throttles,
+                        backoff_until = MAX(backoff_until, excluded.backoff_until),
+                        successes = successes + excluded.successes,
+                        throttles = throttles + excluded.throttles,
+                        updated_at = excluded.updated_at
+                """, values)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ [{self.domain}] 요청 속도 저장 실패: {e}")
+
+
+def _load_state(domain):
+    try:
+        db.ensure_schema()
+        with db.get_db_connection() as conn:
+            return conn.execute("SELECT * FROM rate_limits WHERE domain = ?", (domain,)).fetchone()
+    except Exception as e:
+        logger.debug(f"요청 속도 조회 실패 (기본값 사용): {e}")
+        return None
+
+
+def get_limiter(platform_or_url):
+    """
+    도메인의 공유 제한기를 반환합니다. 처음 호출 시 rate_limits 테이블에서 학습된 속도를 읽습니다.
+    HAR 재생 모드나 알 수 없는 도메인이면 None.
+    """
+    domain = domain_for(platform_or_url)
+    if domain is None or HAR_MODE == HAR_MODE_REPLAY:
+        return None
+
+    with _limiters_lock:
+        limiter = _limiters.get(domain)
+        if limiter is None:
+            shards, shard_index = sharding.get_shard_config()
+            share = 1.0 / shards if shard_index is not None and shards > 1 else 1.0
+            limiter = DomainLimiter(domain, share=share)
+            state = _load_state(domain)
+            if state is not None:
+                limiter.rate = min(MAX_RATE, max(MIN_RATE, state['rate']))
+                limiter.consecutive_throttles = state['consecutive_throttles']
+                limiter.backoff_until = state['backoff_until'] or 0.0
+            _limiters[domain] = limiter
+            logger.debug(f"🚦 [{domain}] 요청 속도 {limiter.rate:.2f}회/초 (이 프로세스 {limiter.rate * share:.2f}회/초)")
+        return limiter
+
+
+def observe_status(url, status):
+    """스크래퍼에서 응답 상태 코드를 알립니다 (429면 해당 도메인 백오프)."""
+    limiter = get_limiter(url) if status in THROTTLE_STATUSES else None
+    if limiter is not None:
+        logger.warning(f"🚫 HTTP {status}: {url}")
+        limiter.observe_status(status)
+
+
+def snapshot_all():
+    """이 프로세스의 도메인별 현재 상태 목록"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.snapshot() for limiter in limiters]
+
+
+def save_all():
+    """모든 제한기의 현재 속도를 저장합니다 (수집 종료 시 호출)."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    for limiter in limiters:
+        limiter.save()
+
+
+def log_rate_summary():
+    """도메인별 현재 속도를 로그로 남깁니다."""
+    for state in snapshot_all():
+        logger.info(f"🚦 [{state['domain']}] 요청 속도 {state['rate']:.2f}회/초 "
+                    f"(이 프로세스 {state['process_rate']:.2f}회/초), 정상 {state['successes']}회, "
+                    f"스로틀 {state['throttles']}회")
+
+
+def main():
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        if '--reset' in sys.argv:
+            conn.execute("DELETE FROM rate_limits")
+            conn.commit()
+            logger.info("🧹 학습된 요청 속도를 초기화했습니다.")
+            return
+        rows = conn.execute("SELECT * FROM rate_limits ORDER BY domain").fetchall()
+
+    if not rows:
+        logger.info(f"🚦 저장된 요청 속도 없음 (기본값 {DEFAULT_RATE:.2f}회/초)")
+    now = time.time()
+    for row in rows:
+        backoff = max(0.0, (row['backoff_until'] or 0) - now)
+        logger.info(f"🚦 [{row['domain']}] {row['rate']:.2f}회/초, 연속 스로틀 {row['consecutive_throttles']}회, "
+                    f"백오프 남음 {backoff:.0f}초, 누적 정상 {row['successes']}회 / 스로틀 {row['throttles']}회 "
+                    f"({row['updated_at']})")
+
+
+if __name__ == "__main__":
+    main()
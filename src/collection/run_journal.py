@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+추가 전용(append-only) 수집 실행 저널
+곡 하나가 끝날 때마다 결과 한 줄(NDJSON)을 파일 끝에 추가하고 바로 디스크에 씁니다.
+진행 상황 JSON 전체를 배치마다 다시 쓰지 않으므로 곡당 기록 비용이 일정하고,
+중간에 프로세스가 죽어도 마지막으로 끝난 곡까지 정확히 남습니다.
+재시작하면 저널을 처음부터 다시 읽어 성공한 곡만 건너뛰고, 실패한 곡은 다시 수집합니다.
+
+레코드 형식 (한 줄에 JSON 하나):
+    {"event": "start", "ts": ..., "run_id": ...}
+    {"event": "song", "ts": ..., "platform": "tiktok", "song_id": 12, "status": "success"|"failed",
+     "video_count": 1234, "error": null}
+    {"event": "end", "ts": ..., "success": 10, "failed": 2}
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_SUCCESS = 'success'
+STATUS_FAILED = 'failed'
+
+# 이 시간보다 오래된 저널은 이어서 쓰지 않고 새 실행으로 시작 (계획기가 다시 곡을 고르도록)
+RESUME_MAX_AGE_HOURS = float(os.getenv('UGC_JOURNAL_RESUME_HOURS', '12'))
+
+
+def _song_key(platform, song_id):
+    return f"{platform}:{song_id}"
+
+
+class RunJournal:
+    """
+    수집 실행 하나의 곡별 결과 저널
+
+    사용 예:
+        journal = RunJournal("progress_tiktok.ndjson", platform='tiktok').open()
+        todo = [song for song in songs if not journal.is_done(song[0])]
+        journal.record(song_id, success, error=error)
+        journal.finish()
+    """
+
+    def __init__(self, path, platform=None, resume_max_age_hours=RESUME_MAX_AGE_HOURS, durable=True):
+        self.path = path
+        self.platform = platform
+        self.resume_max_age_hours = resume_max_age_hours
+        self.durable = durable
+        self.run_id = None
+        self.started_at = None
+        self.states = {}  # 곡 키 → 마지막 song 레코드
+        self.stats = {'success': 0, 'failed': 0}
+        self._file = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 재생
+    # ------------------------------------------------------------------
+
+    def _read_records(self):
+        """저널의 레코드를 순서대로 읽습니다. 비정상 종료로 잘린 줄은 건너뜁니다."""
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"⚠️ 저널 {self.path}:{line_number} 손상된 줄 무시")
+        return records
+
+    def replay(self):
+        """기존 저널을 읽어 곡별 마지막 상태를 복원합니다. 이어서 쓸 수 있으면 True."""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            records = self._read_records()
+        except OSError as e:
+            logger.warning(f"⚠️ 저널 읽기 실패 ({self.path}): {e}")
+            return False
+
+        start = next((record for record in records if record.get('event') == 'start'), None)
+        started_at = start.get('ts') if start else None
+        if started_at is None or time.time() - started_at > self.resume_max_age_hours * 3600:
+            # 오래된 실행: 보관용으로 옮겨 두고 새로 시작
+            os.replace(self.path, self.path + '.prev')
+            logger.info(f"🗂️ 이전 저널이 {self.resume_max_age_hours:g}시간보다 오래되어 새 실행으로 시작합니다 "
+                        f"({self.path}.prev)")
+            return False
+
+        self.run_id = start.get('run_id')
+        self.started_at = started_at
+        for record in records:
+            if record.get('event') == 'song':
+                self.states[_song_key(record.get('platform'), record.get('song_id'))] = record
+        return True
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+
+    def open(self):
+        """저널을 재생하고 이어서 기록할 준비를 합니다. self를 반환합니다."""
+        resumed = self.replay()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if resumed:
+            self._repair_tail()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+        if resumed:
+            done = len(self.done_ids())
+            failed = len(self.failed_songs())
+            logger.info(f"📂 저널에서 이어서 실행: 성공 {done}곡 건너뜀, 실패 {failed}곡 재시도 ({self.path})")
+        else:
+            self.run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+            self.started_at = time.time()
+            self._append({'event': 'start', 'ts': self.started_at, 'run_id': self.run_id,
+                          'platform': self.platform})
+        return self
+
+    def _repair_tail(self):
+        """마지막 줄이 잘린 채 끝났으면 줄바꿈을 추가해 다음 레코드와 붙지 않게 합니다."""
+        with open(self.path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(line)
+                self._file.flush()
+                if self.durable:
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                logger.warning(f"⚠️ 저널 기록 실패 ({self.path}): {e}")
+
+    def record(self, song_id, success, platform=None, error=None, video_count=None):
+        """곡 하나의 결과를 저널 끝에 추가합니다."""
+        platform = platform or self.platform
+        record = {
+            'event': 'song',
+            'ts': time.time(),
+            'platform': platform,
+            'song_id': song_id,
+            'status': STATUS_SUCCESS if success else STATUS_FAILED,
+            'video_count': video_count,
+            'error': error
+        }
+        self.states[_song_key(platform, song_id)] = record
+        self.stats['success' if success else 'failed'] += 1
+        self._append(record)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def is_done(self, song_id, platform=None):
+        """이번 실행(재시작 포함)에서 이미 성공한 곡인지"""
+        state = self.states.get(_song_key(platform or self.platform, song_id))
+        return state is not None and state.get('status') == STATUS_SUCCESS
+
+    def done_ids(self):
+        return [state['song_id'] for state in self.states.values() if state.get('status') == STATUS_SUCCESS]
+
+    def failed_songs(self):
+        """마지막 결과가 실패인 곡 레코드 목록"""
+        return [state for state in self.states.values() if state.get('status') == STATUS_FAILED]
+
+    # ------------------------------------------------------------------
+    # 종료
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """종료 레코드를 남기고 파일을 닫습니다 (다음 실행에서 이어서 쓸 수 있음)."""
+        self._append({'event': 'end', 'ts': time.time(), 'success': self.stats['success'],
+                      'failed': self.stats['failed']})
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """
+        실행을 마칩니다. 실패한 곡이 남아 있지 않으면 저널을 지우고,
+        남아 있으면 다음 실행이 실패한 곡만 다시 수집하도록 저널을 남깁니다.
+        """
+        self.close()
+        remaining = self.failed_songs()
+        if remaining:
+            logger.info(f"📒 실패한 {len(remaining)}곡이 저널에 남아 다음 실행에서 재시도합니다 ({self.path})")
+            return False
+        try:
+            os.remove(self.path)
+            logger.info("🧹 실행 저널 정리 완료")
+        except OSError:
+            pass
+        return True
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+마감 시간 기반 UGC 작업 스케줄러
+계획기(planner)가 만든 작업을 가치(오늘 차트 순위, 급상승/신규 히트 여부, 최근 카운트 증가율) 순으로 정렬하고,
+플랫폼별 실측 소요 시간으로 시간 예산 안에 끝낼 수 있는 작업만 고릅니다.
+예산을 넘는 작업은 deferred_jobs 테이블에 기록하고, 다음 실행에서 연기된 횟수만큼 우선순위를 올립니다.
+연기 기록은 곡이 다시 수집되거나 보존 기간(UGC_DEFERRAL_RETENTION_DAYS)이 지나면 삭제합니다.
+실행이 예정보다 길어져도 건너뛰는 곡은 차트 상위가 아니라 가치가 낮은 곡이 됩니다.
+"""
+
+import os
+import sys
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.collection import planner
+from src.utils.logger_config import get_logger, log_database_operation
+
+logger = get_logger(__name__)
+
+# 실측값이 없을 때 사용하는 곡당 소요 시간 (초)
+DEFAULT_LATENCY_SECONDS = {
+    'tiktok': 30.0,
+    'youtube': 12.0
+}
+# 새 측정값 반영 비율 (지수 이동 평균)
+LATENCY_SMOOTHING = 0.2
+
+# 우선순위 점수 가중치
+CHART_SIZE = 100              # 오늘 차트 1위 = CHART_SIZE점, CHART_SIZE위 = 1점
+NEW_HIT_BONUS = 50            # 급상승 / 신규 히트
+TRENDING_BONUS = 20
+VELOCITY_WEIGHT = 200         # 직전 카운트 변화율 1%당 2점
+MAX_VELOCITY_SCORE = 50
+NEVER_COLLECTED_BONUS = 30
+DEFERRAL_BONUS = 15           # 연기될 때마다 추가 (굶주림 방지)
+
+# 이보다 오래된 연기 기록은 세지 않고 삭제 (수집된 곡의 기록도 삭제)
+DEFERRAL_RETENTION_DAYS = int(os.getenv('UGC_DEFERRAL_RETENTION_DAYS', '30'))
+
+# 마지막 수집(ugc_count_history) 이후이고 보존 기간 안인 연기 기록
+ACTIVE_DEFERRAL_CONDITION = """
+    deferred_at >= datetime('now', 'localtime', ?)
+    AND deferred_at > COALESCE((
+        SELECT MAX(h.collected_at) FROM ugc_count_history h
+        WHERE h.song_id = deferred_jobs.song_id AND h.platform = deferred_jobs.platform
+    ), '')
+"""
+
+
+def get_time_budget(argv=None):
+    """
+    명령행 인자(--budget-minutes N)와 환경변수(UGC_TIME_BUDGET_MINUTES)에서 시간 예산(초)을 읽습니다.
+    지정하지 않으면 None (예산 없음)을 반환합니다.
+    """
+    argv = sys.argv if argv is None else argv
+    minutes = os.getenv('UGC_TIME_BUDGET_MINUTES')
+    if '--budget-minutes' in argv:
+        index = argv.index('--budget-minutes')
+        if index + 1 < len(argv):
+            minutes = argv[index + 1]
+    try:
+        return float(minutes) * 60 if minutes else None
+    except ValueError:
+        logger.warning(f"⚠️ 잘못된 시간 예산 값: {minutes}")
+        return None
+
+
+def load_latencies():
+    """플랫폼별 곡당 평균 소요 시간(초). 측정값이 없으면 기본값을 사용합니다."""
+    latencies = dict(DEFAULT_LATENCY_SECONDS)
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        for row in conn.execute("SELECT platform, avg_seconds FROM platform_latency"):
+            latencies[row['platform']] = row['avg_seconds']
+    return latencies
+
+
+def record_latencies(results):
+    """
+    완료된 작업의 소요 시간을 플랫폼별 지수 이동 평균에 반영합니다.
+
+    Args:
+        results: {'platform': str, 'duration': float} 를 포함한 dict 목록
+    """
+    durations = {}
+    for result in results:
+        if result.get('duration'):
+            durations.setdefault(result['platform'], []).append(result['duration'])
+    if not durations:
+        return
+
+    latencies = load_latencies()
+    with db.get_db_connection() as conn:
+        for platform, values in durations.items():
+            average = latencies.get(platform, DEFAULT_LATENCY_SECONDS.get(platform, 30.0))
+            for value in values:
+                average += LATENCY_SMOOTHING * (value - average)
+            conn.execute("""
+                INSERT INTO platform_latency (platform, avg_seconds, samples, updated_at)
+                VALUES (?, ?, ?, datetime('now', 'localtime'))
+                ON CONFLICT(platform) DO UPDATE SET
+                    avg_seconds = excluded.avg_seconds,
+                    samples = samples + excluded.samples,
+                    updated_at = excluded.updated_at
+            """, (platform, average, len(values)))
+            logger.debug(f"⏱️ [{platform}] 곡당 평균 소요 시간 {average:.1f}초 ({len(values)}개 측정)")
+        conn.commit()
+
+
+def load_deferral_counts(jobs):
+    """작업별로 마지막 수집 이후 연기된 횟수 {(platform, song_id): count}"""
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT platform, song_id, COUNT(*) AS deferrals FROM deferred_jobs
+            WHERE {ACTIVE_DEFERRAL_CONDITION}
+            GROUP BY platform, song_id
+        """, (f"-{DEFERRAL_RETENTION_DAYS} days",)).fetchall()
+
+    deferrals = {(row['platform'], row['song_id']): row['deferrals'] for row in rows}
+    return {(job['platform'], job['song_id']): deferrals.get((job['platform'], job['song_id']), 0)
+            for job in jobs}
+
+
+def prune_deferred():
+    """수집이 끝난 곡과 보존 기간이 지난 연기 기록을 삭제합니다. 삭제한 행 수를 반환합니다."""
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        deleted = conn.execute(f"DELETE FROM deferred_jobs WHERE NOT ({ACTIVE_DEFERRAL_CONDITION})",
+                               (f"-{DEFERRAL_RETENTION_DAYS} days",)).rowcount
+        conn.commit()
+    if deleted:
+        log_database_operation(logger, "지난 연기 기록 정리", "deferred_jobs", deleted)
+    return deleted
+
+
+def job_priority(job, deferral_count=0):
+    """작업의 가치 점수 (높을수록 먼저 수집)"""
+    state = job.get('state', {})
+    score = 0.0
+
+    best_rank = state.get('best_rank')
+    if best_rank:
+        score += max(0, CHART_SIZE + 1 - best_rank)
+    if state.get('is_new_hit'):
+        score += NEW_HIT_BONUS
+    if state.get('is_trending'):
+        score += TRENDING_BONUS
+
+    ratio = planner.change_ratio(state)
+    if ratio is not None:
+        score += min(MAX_VELOCITY_SCORE, ratio * VELOCITY_WEIGHT)
+    if state.get('last_collected_at') is None:
+        score += NEVER_COLLECTED_BONUS
+
+    return score + deferral_count * DEFERRAL_BONUS
+
+
+def prioritize(jobs):
+    """작업에 'priority'를 채우고 가치가 높은 순으로 정렬한 새 목록을 반환합니다."""
+    deferral_counts = load_deferral_counts(jobs)
+    for job in jobs:
+        job['priority'] = job_priority(job, deferral_counts.get((job['platform'], job['song_id']), 0))
+    return sorted(jobs, key=lambda job: (-job['priority'], -job.get('overdue', 0)))
+
+
+def schedule(jobs, budget_seconds=None, slots=None, pause_seconds=0):
+    """
+    시간 예산 안에 끝낼 수 있는 작업을 가치 순으로 고릅니다.
+
+    Args:
+        jobs: 계획기 작업 목록
+        budget_seconds: 시간 예산 (None이면 모든 작업 실행)
+        slots: 플랫폼별 동시 실행 수 {'tiktok': 4, ...}. None이면 모든 작업을 하나씩 순서대로 실행한다고 가정
+        pause_seconds: 작업 사이 대기 시간 (요청 간격 조절)
+
+    Returns:
+        tuple: (실행할 작업 목록, 연기할 작업 목록) - 둘 다 가치가 높은 순
+    """
+    ordered = prioritize(jobs)
+    if budget_seconds is None:
+        return ordered, []
+
+    latencies = load_latencies()
+    # 순차 실행이면 모든 플랫폼이 한 줄의 시간을 공유하고, 동시 실행이면 플랫폼별로 슬롯 수만큼 시간이 늘어남
+    capacity = {None: budget_seconds} if slots is None else {
+        platform: budget_seconds * max(1, count) for platform, count in slots.items()
+    }
+    used = {lane: 0.0 for lane in capacity}
+
+    scheduled = []
+    deferred = []
+    for job in ordered:
+        lane = None if slots is None else job['platform']
+        cost = latencies.get(job['platform'], DEFAULT_LATENCY_SECONDS.get(job['platform'], 30.0)) + pause_seconds
+        if lane in capacity and used[lane] + cost <= capacity[lane]:
+            used[lane] += cost
+            scheduled.append(job)
+        else:
+            deferred.append(job)
+
+    predicted = max(
+        (seconds / (1 if lane is None else max(1, slots[lane])) for lane, seconds in used.items()), default=0)
+    logger.info(f"🧮 스케줄: 예산 {budget_seconds / 60:.0f}분 안에 {len(scheduled)}곡 실행 예정 "
+                f"(예상 {predicted / 60:.0f}분), {len(deferred)}곡 다음 실행으로 연기")
+    return scheduled, deferred
+
+
+def record_deferred(jobs, reason="시간 예산 초과"):
+    """연기한 작업을 deferred_jobs 테이블에 기록하고, 더 이상 세지 않는 기록은 정리합니다."""
+    prune_deferred()
+    if not jobs:
+        return
+    with db.get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO deferred_jobs (song_id, platform, priority, reason) VALUES (?, ?, ?, ?)",
+            [(job['song_id'], job['platform'], job.get('priority'), reason) for job in jobs]
+        )
+        conn.commit()
+
+    log_database_operation(logger, f"연기된 작업 기록 ({reason})", "deferred_jobs", len(jobs))
+    for job in jobs[:5]:
+        logger.info(f"   ⏭️ [{job['platform']}] {job['label']} (우선순위 {job.get('priority', 0):.0f})")
+    if len(jobs) > 5:
+        logger.info(f"   ... 외 {len(jobs) - 5}곡")
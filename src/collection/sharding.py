@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+멀티 프로세스 샤드 수집
+곡을 songs.id의 고정 해시로 N개 샤드에 나누고, 각 워커 프로세스가 자기 샤드만 수집합니다.
+워커는 `--shards N --shard-index i` (또는 UGC_SHARDS / UGC_SHARD_INDEX)로 실행하며,
+각자 브라우저 풀을 따로 가지므로 파싱·DOM 처리·렌더링이 CPU 코어 수만큼 병렬로 진행됩니다.
+
+감독 프로세스(run_shards, scripts/collection_supervisor.py)는 워커 N개를 띄우고,
+워커가 UGC_SHARD_STATUS_FILE에 기록하는 진행 상황과 종료 코드를 모아 보여 줍니다.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import atexit
+import signal
+import tempfile
+import threading
+import subprocess
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SHARD_STATUS_DIR = os.path.join(PROJECT_ROOT, 'data', 'shards')
+SHARD_LOG_DIR = os.path.join(PROJECT_ROOT, 'logs')
+STATUS_WRITE_INTERVAL = 2.0  # 진행 상황 파일 최소 기록 간격 (초)
+SUPERVISOR_POLL_SECONDS = 15
+
+
+def _argv_value(argv, flag):
+    if flag in argv:
+        index = argv.index(flag)
+        if index + 1 < len(argv):
+            return argv[index + 1]
+    return None
+
+
+def get_shard_config(argv=None):
+    """
+    명령행 인자와 환경변수에서 샤드 설정을 읽습니다.
+
+    Returns:
+        tuple: (shards, shard_index) - 샤드를 쓰지 않으면 (1, None),
+               --shards만 지정하면 (N, None) (감독 모드)
+    """
+    argv = sys.argv if argv is None else argv
+    shards = _argv_value(argv, '--shards') or os.getenv('UGC_SHARDS')
+    shard_index = _argv_value(argv, '--shard-index') or os.getenv('UGC_SHARD_INDEX')
+    try:
+        shards = max(1, int(shards)) if shards else 1
+        shard_index = int(shard_index) if shard_index is not None else None
+    except ValueError:
+        raise ValueError(f"잘못된 샤드 설정: --shards {shards} --shard-index {shard_index}")
+    if shard_index is not None and not 0 <= shard_index < shards:
+        raise ValueError(f"--shard-index는 0 이상 {shards} 미만이어야 합니다: {shard_index}")
+    return shards, shard_index
+
+
+def is_shard_worker(argv=None):
+    shards, shard_index = get_shard_config(argv)
+    return shards > 1 and shard_index is not None
+
+
+def shard_of(song_id, shards):
+    """곡 ID의 샤드 번호. 프로세스/실행과 관계없이 항상 같은 값입니다 (CRC32)."""
+    return zlib.crc32(str(song_id).encode('utf-8')) % shards
+
+
+def in_shard(song_id, argv=None):
+    shards, shard_index = get_shard_config(argv)
+    if shards <= 1 or shard_index is None:
+        return True
+    return shard_of(song_id, shards) == shard_index
+
+
+def shard_file_name(file_name, argv=None):
+    """샤드 워커마다 겹치지 않는 파일 이름 (예: progress_tiktok.json → progress_tiktok.shard-1-of-4.json)"""
+    shards, shard_index = get_shard_config(argv)
+    if shards <= 1 or shard_index is None:
+        return file_name
+    base, ext = os.path.splitext(file_name)
+    return f"{base}.shard-{shard_index}-of-{shards}{ext}"
+
+
+def strip_shard_args(args, extra_flags=()):
+    """
+    인자 목록에서 --shards / --shard-index (및 extra_flags)와 그 값을 제거합니다 (워커에 다시 넘길 인자용).
+    """
+    flags = ('--shards', '--shard-index') + tuple(extra_flags)
+    stripped = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+            continue
+        if arg in flags:
+            skip = True
+            continue
+        stripped.append(arg)
+    return stripped
+
+
+def supervise_if_requested(script_file, argv=None):
+    """
+    `--shards N`만 지정하고 --shard-index 없이 실행했으면, 같은 스크립트를 워커 N개로 실행하고 감독합니다.
+
+    Returns:
+        int 또는 None: 감독 모드로 실행했으면 종료 코드, 아니면 None (그대로 단일 프로세스로 진행)
+    """
+    argv = sys.argv if argv is None else argv
+    shards, shard_index = get_shard_config(argv)
+    if shards <= 1 or shard_index is not None:
+        return None
+    result = run_shards(script_file, shards, strip_shard_args(argv[1:]))
+    return 0 if all(code == 0 for code in result['exit_codes']) else 1
+
+
+# ---------------------------------------------------------------------------
+# 워커 쪽 진행 상황 보고
+# ---------------------------------------------------------------------------
+
+class ShardProgress:
+    """UGC_SHARD_STATUS_FILE이 지정된 워커에서 진행 상황을 JSON 파일로 기록합니다."""
+
+    def __init__(self, status_file):
+        self.status_file = status_file
+        self.status = {'pid': os.getpid(), 'total': 0, 'done': 0, 'success': 0, 'failed': 0,
+                       'platforms': {}, 'finished': False}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    def add_total(self, count):
+        with self._lock:
+            self.status['total'] += count
+        self._write(force=True)
+
+    def record(self, platform, success):
+        key = 'success' if success else 'failed'
+        with self._lock:
+            self.status['done'] += 1
+            self.status[key] += 1
+            counts = self.status['platforms'].setdefault(platform, {'success': 0, 'failed': 0})
+            counts[key] += 1
+        self._write()
+
+    def finish(self):
+        self.status['finished'] = True
+        self._write(force=True)
+
+    def _write(self, force=False):
+        now = time.time()
+        if not force and now - self._last_write < STATUS_WRITE_INTERVAL:
+            return
+        self._last_write = now
+        with self._lock:
+            payload = dict(self.status, updated_at=now)
+        try:
+            directory = os.path.dirname(self.status_file)
+            fd, temp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(temp_path, self.status_file)
+        except OSError as e:
+            logger.debug(f"샤드 진행 상황 기록 실패 (무시): {e}")
+
+
+_progress = None
+_progress_lock = threading.Lock()
+
+
+def get_progress():
+    """현재 프로세스의 진행 상황 보고기. 감독 프로세스 아래가 아니면 None."""
+    global _progress
+    status_file = os.getenv('UGC_SHARD_STATUS_FILE')
+    if not status_file:
+        return None
+    with _progress_lock:
+        if _progress is None:
+            _progress = ShardProgress(status_file)
+            atexit.register(_progress.finish)
+    return _progress
+
+
+def report_total(count):
+    progress = get_progress()
+    if progress is not None:
+        progress.add_total(count)
+
+
+def report_result(platform, success):
+    progress = get_progress()
+    if progress is not None:
+        progress.record(platform, success)
+
+
+# ---------------------------------------------------------------------------
+# 감독 프로세스
+# ---------------------------------------------------------------------------
+
+def _read_status(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _log_progress(workers):
+    totals = {'total': 0, 'done': 0, 'success': 0, 'failed': 0}
+    platforms = {}
+    running = 0
+    for worker in workers:
+        status = _read_status(worker['status_file'])
+        for key in totals:
+            totals[key] += status.get(key, 0)
+        for platform, counts in status.get('platforms', {}).items():
+            merged = platforms.setdefault(platform, {'success': 0, 'failed': 0})
+            merged['success'] += counts.get('success', 0)
+            merged['failed'] += counts.get('failed', 0)
+        if worker['process'].poll() is None:
+            running += 1
+    logger.info(f"📈 샤드 진행: {totals['done']}/{totals['total']}곡 "
+                f"(성공 {totals['success']}, 실패 {totals['failed']}), 실행 중인 워커 {running}/{len(workers)}개")
+    return dict(totals, platforms=platforms)
+
+
+def run_shards(script, shards, extra_args=None, timeout_seconds=None, python_exe=None):
+    """
+    스크립트를 샤드 워커 N개로 실행하고 모두 끝날 때까지 감독합니다.
+
+    Args:
+        script: 워커로 실행할 스크립트 경로 (프로젝트 루트 기준 또는 절대 경로)
+        shards: 워커 프로세스 수
+        extra_args: 모든 워커에 그대로 넘길 인자
+        timeout_seconds: 전체 제한 시간 (넘으면 남은 워커 종료)
+
+    Returns:
+        dict: {'exit_codes': [...], 'total', 'done', 'success', 'failed',
+               'platforms': {platform: {'success', 'failed'}}, 'duration'}
+    """
+    script_path = script if os.path.isabs(script) else os.path.join(PROJECT_ROOT, script)
+    run_id = time.strftime('%Y%m%d_%H%M%S')
+    status_dir = os.path.join(SHARD_STATUS_DIR, run_id)
+    os.makedirs(status_dir, exist_ok=True)
+    os.makedirs(SHARD_LOG_DIR, exist_ok=True)
+    script_name = os.path.splitext(os.path.basename(script_path))[0]
+
+    logger.info(f"🧩 샤드 수집 시작: {script_name} × {shards}개 워커")
+    # 워커들이 동시에 DB에 쓰므로 WAL 모드로 전환
+    db.enable_wal_mode()
+    started = time.time()
+    workers = []
+    for shard_index in range(shards):
+        status_file = os.path.join(status_dir, f"shard-{shard_index}.json")
+        log_path = os.path.join(SHARD_LOG_DIR, f"{script_name}_{run_id}_shard-{shard_index}.log")
+        env = os.environ.copy()
+        env.update({
+            'PYTHONPATH': PROJECT_ROOT,
+            'PYTHONIOENCODING': 'utf-8',
+            'PYTHONUTF8': '1',
+            'UGC_SHARD_STATUS_FILE': status_file
+        })
+        log_file = open(log_path, 'w', encoding='utf-8')
+        process = subprocess.Popen(
+            [python_exe or sys.executable, script_path, '--shards', str(shards), '--shard-index', str(shard_index)]
+            + list(extra_args or []),
+            stdout=log_file, stderr=subprocess.STDOUT, cwd=PROJECT_ROOT, env=env)
+        workers.append({'index': shard_index, 'process': process, 'status_file': status_file,
+                        'log_path': log_path, 'log_file': log_file})
+        logger.info(f"   🚀 샤드 {shard_index}: PID {process.pid} (로그: {log_path})")
+
+    try:
+        while any(worker['process'].poll() is None for worker in workers):
+            if timeout_seconds and time.time() - started > timeout_seconds:
+                logger.warning(f"⏰ 제한 시간 {timeout_seconds / 60:.0f}분 초과: 남은 워커 종료")
+                _terminate(workers)
+                break
+            time.sleep(SUPERVISOR_POLL_SECONDS)
+            _log_progress(workers)
+    except KeyboardInterrupt:
+        logger.info("⏹️ 중단 요청: 워커 종료 중...")
+        _terminate(workers)
+        raise
+    finally:
+        for worker in workers:
+            worker['process'].wait()
+            worker['log_file'].close()
+
+    totals = _log_progress(workers)
+    exit_codes = [worker['process'].returncode for worker in workers]
+    for worker, code in zip(workers, exit_codes):
+        if code != 0:
+            logger.error(f"   ❌ 샤드 {worker['index']} 종료 코드 {code} (로그: {worker['log_path']})")
+            for line in _tail(worker['log_path']):
+                logger.error(f"      {line}")
+
+    duration = time.time() - started
+    logger.info(f"🧩 샤드 수집 완료: 워커 {shards}개 중 정상 종료 {exit_codes.count(0)}개, "
+                f"{totals['done']}곡 처리, 소요 {duration / 60:.1f}분")
+    return dict(totals, exit_codes=exit_codes, duration=duration)
+
+
+def _terminate(workers):
+    for worker in workers:
+        if worker['process'].poll() is None:
+            worker['process'].send_signal(signal.SIGINT if os.name != 'nt' else signal.SIGTERM)
+    deadline = time.time() + 30
+    for worker in workers:
+        try:
+            worker['process'].wait(timeout=max(1, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            worker['process'].kill()
+
+
+def _tail(path, lines=5):
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return [line.rstrip() for line in f.readlines()[-lines:]]
+    except OSError:
+        return []
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+차트 스크래퍼 → UGC 수집 스트리밍 연결
+차트 스크래퍼가 곡 하나를 파싱할 때마다 바로 DB에 저장하고, 크기가 정해진 프로세스 내 큐에 넣습니다.
+UGC 워커 스레드는 차트 전체가 끝나기를 기다리지 않고 큐에서 곡을 꺼내 동시에 수집합니다.
+큐가 가득 차면 스크래퍼 쪽 put이 기다리므로(백프레셔) 워커가 밀려도 메모리가 늘지 않습니다.
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+from datetime import datetime
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger, log_error_with_context
+from src.collection import planner
+from src.scrapers import tiktok_music_scraper, youtube_csv_scraper
+
+logger = get_logger(__name__)
+
+DEFAULT_QUEUE_SIZE = int(os.getenv('UGC_STREAM_QUEUE_SIZE', '20'))
+DEFAULT_WORKERS = int(os.getenv('UGC_STREAM_WORKERS', '1'))
+
+_END = object()  # 생산 종료 표시
+
+
+class SongStream:
+    """
+    크기가 정해진 곡 큐 하나와 그 큐를 소비하는 워커 스레드들
+
+    emit(job)은 생산자(차트 스크래퍼) 스레드에서 호출하고, 큐가 가득 차면 자리가 날 때까지 기다립니다.
+    job은 {'platform', 'song_id', 'platform_id', 'label', ...} dict이며 (platform, song_id)당 한 번만 전달됩니다.
+    """
+
+    def __init__(self, name, maxsize=DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.started_at = time.time()
+        self.stats = {
+            'emitted': 0,
+            'duplicates': 0,
+            'consumed': 0,
+            'success': 0,
+            'failed': 0,
+            'skipped': 0,
+            'backpressure_seconds': 0.0,
+            'first_result_seconds': None
+        }
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def emit(self, job):
+        """곡 하나를 큐에 넣습니다. 이미 넣은 곡이면 False."""
+        key = (job['platform'], job['song_id'])
+        with self._lock:
+            if key in self._seen:
+                self.stats['duplicates'] += 1
+                return False
+            self._seen.add(key)
+            self.stats['emitted'] += 1
+
+        waited = time.time()
+        self.queue.put(job)  # 가득 차면 워커가 꺼낼 때까지 대기 (백프레셔)
+        waited = time.time() - waited
+        if waited >= 0.01:
+            with self._lock:
+                self.stats['backpressure_seconds'] += waited
+        return True
+
+    def _consume(self, handler):
+        while True:
+            job = self.queue.get()
+            if job is _END:
+                break
+            try:
+                outcome = handler(job)
+            except Exception as e:
+                log_error_with_context(logger, e, f"[{self.name}] {job.get('label', job['song_id'])} 스트리밍 수집")
+                outcome = False
+
+            with self._lock:
+                self.stats['consumed'] += 1
+                if outcome is None:
+                    self.stats['skipped'] += 1
+                else:
+                    self.stats['success' if outcome else 'failed'] += 1
+                    if self.stats['first_result_seconds'] is None:
+                        self.stats['first_result_seconds'] = time.time() - self.started_at
+                        logger.info(f"⚡ [{self.name}] 첫 UGC 결과: 시작 후 "
+                                    f"{self.stats['first_result_seconds']:.1f}초")
+
+    def run(self, producer, handler_factory, workers=DEFAULT_WORKERS):
+        """
+        워커를 띄우고 현재 스레드에서 생산자를 실행한 뒤, 큐가 빌 때까지 기다립니다.
+
+        Args:
+            producer: producer(emit)을 호출해 곡을 넣는 함수. 반환값을 그대로 돌려줌
+            handler_factory: 워커마다 한 번 호출해 handler(job)을 만드는 함수.
+                             handler는 True(성공) / False(실패) / None(건너뜀)을 반환
+            workers: UGC 워커 스레드 수
+
+        Returns:
+            (생산자 반환값, stats dict)
+        """
+        self.started_at = time.time()
+        threads = [
+            threading.Thread(target=self._consume, args=(handler_factory(),),
+                             name=f"{self.name}-ugc-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in threads:
+            thread.start()
+
+        logger.info(f"🌊 [{self.name}] 스트리밍 수집 시작: UGC 워커 {len(threads)}개, 큐 크기 {self.queue.maxsize}")
+        produced = None
+        try:
+            produced = producer(self.emit)
+        except Exception as e:
+            log_error_with_context(logger, e, f"[{self.name}] 차트 생산자")
+            produced = False
+        finally:
+            # 워커마다 종료 표시 하나씩 (큐에 남은 곡을 모두 처리한 뒤 종료)
+            for _ in threads:
+                self.queue.put(_END)
+            for thread in threads:
+                thread.join()
+
+        self.stats['duration'] = time.time() - self.started_at
+        first = self.stats['first_result_seconds']
+        logger.info(f"🌊 [{self.name}] 스트리밍 수집 완료: 곡 {self.stats['emitted']}개 중 성공 {self.stats['success']}개, "
+                    f"실패 {self.stats['failed']}개, 최신이라 건너뜀 {self.stats['skipped']}개, "
+                    f"첫 결과 {f'{first:.1f}초' if first is not None else '없음'}, "
+                    f"백프레셔 대기 {self.stats['backpressure_seconds']:.1f}초, 전체 {self.stats['duration']:.1f}초")
+        return produced, self.stats
+
+
+def make_due_filter(platform, now=None):
+    """
+    스트리밍으로 들어온 곡이 지금 UGC를 다시 수집해야 하는지 판단하는 함수를 만듭니다.
+    곡 상태는 한 번만 읽고, 오늘 차트에 있는 곡이므로 charting 등급 주기로 판단합니다.
+
+    Returns:
+        function(job) -> (due: bool, reason: str)
+    """
+    now = now or datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    try:
+        states = {state['song_id']: state for state in planner.load_song_states(platform)}
+    except Exception as e:
+        logger.warning(f"⚠️ [{platform}] 곡 상태 조회 실패 (모든 곡 수집): {e}")
+        states = {}
+
+    def is_due(job):
+        state = dict(states.get(job['song_id'], {}), last_chart_date=today, latest_chart_date=today)
+        plan = planner.plan_song(state, now)
+        return plan['due'], plan['reason']
+
+    return is_due
+
+
+def tiktok_chart_producer(emit, mode=None):
+    """TikTok Creative Center 차트를 스크래핑하며 곡마다 저장 후 emit합니다. 차트 항목이 있으면 True."""
+    def on_song(category, item):
+        try:
+            song_id = tiktok_music_scraper.save_chart_song(category, item)
+        except Exception as e:
+            logger.error(f"💥 {category} 곡 저장 실패 '{item.get('title')}': {e}")
+            return
+        if song_id and item.get('tiktok_id'):
+            emit({'platform': 'tiktok', 'song_id': song_id, 'platform_id': item['tiktok_id'],
+                  'label': f"{item['title']} - {item['artist']}", 'category': category, 'rank': item['rank']})
+
+    all_music_data = tiktok_music_scraper.scrape_tiktok_creative_center(mode, on_song=on_song)
+    return bool(all_music_data.get('popular') or all_music_data.get('breakout'))
+
+
+def youtube_chart_producer(emit):
+    """YouTube Charts CSV를 받아 행마다 저장 후 emit합니다. 곡이 있으면 True."""
+    def on_song(song):
+        try:
+            song_id = youtube_csv_scraper.save_song(song)
+        except Exception as e:
+            log_error_with_context(logger, e, f"곡 저장: {song['title']}")
+            return
+        if song_id and song.get('youtube_id'):
+            emit({'platform': 'youtube', 'song_id': song_id, 'platform_id': song['youtube_id'],
+                  'label': f"{song['title']} - {song['artist']}", 'category': 'trending', 'rank': song['rank']})
+
+    csv_path = youtube_csv_scraper.download_youtube_csv()
+    if not csv_path:
+        return False
+    return bool(youtube_csv_scraper.parse_csv_data(csv_path, on_song=on_song))
+
+
+CHART_PRODUCERS = {
+    'tiktok': tiktok_chart_producer,
+    'youtube': youtube_chart_producer
+}
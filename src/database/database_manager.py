@@ -1,6 +1,7 @@
 import sqlite3
 import json
 import os
+import threading
 from contextlib import contextmanager
 import sys
 
@@ -13,6 +14,12 @@ logger = get_logger(__name__)
 
 # 프로젝트 루트에서 data 폴더 내의 데이터베이스 파일 경로
 DB_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'music_trends.db')
+# 다른 프로세스(샤드 워커 등)가 쓰는 중일 때 잠금 해제를 기다리는 시간 (초)
+DB_BUSY_TIMEOUT = float(os.getenv('DB_BUSY_TIMEOUT', '30'))
+
+# ensure_schema()가 스키마를 이미 만들었는지 (프로세스당 한 번)
+_schema_lock = threading.Lock()
+_schema_ready = False
 
 def parse_metric_value(metric_str):
     """
@@ -42,7 +49,7 @@ def get_db_connection():
     """SQLite DB 커넥션을 생성하고 관리하는 컨텍스트 매니저"""
     conn = None
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = sqlite3.connect(DB_FILE, timeout=DB_BUSY_TIMEOUT)
         conn.row_factory = sqlite3.Row # 결과를 딕셔너리처럼 접근 가능하게 함
         yield conn
     except sqlite3.Error as e:
@@ -52,8 +59,20 @@ def get_db_connection():
         if conn:
             conn.close()
 
+def enable_wal_mode():
+    """
+    WAL 저널 모드로 전환합니다 (DB 파일에 영구 적용).
+    여러 프로세스가 동시에 쓰고 읽을 때 읽기가 쓰기를 막지 않습니다.
+    """
+    with get_db_connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    logger.debug(f"데이터베이스 저널 모드: {mode}")
+    return mode
+
 def create_tables():
-    """songs와 daily_trends 테이블을 생성합니다."""
+    """songs, daily_trends, song_hashtags, page_snapshots, ugc_count_history,
+    platform_latency, deferred_jobs, collection_jobs, rate_limits,
+    pipeline_stage_runs 테이블을 생성합니다."""
     commands = (
         """
         CREATE TABLE IF NOT EXISTS songs (
@@ -100,6 +119,97 @@ def create_tables():
             FOREIGN KEY (song_id) REFERENCES songs (id),
             UNIQUE(song_id, hashtag, collected_date)
         )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS page_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            kind TEXT NOT NULL, -- tiktok_sound_html, tiktok_sound_json, youtube_shorts_html 등
+            content_hash TEXT NOT NULL, -- 압축 전 원문의 SHA-256 (data/snapshots/objects/ 파일명)
+            size_bytes INTEGER NOT NULL,
+            compressed_bytes INTEGER NOT NULL,
+            snapshot_date DATE DEFAULT (date('now', 'localtime')),
+            fetched_at DATETIME DEFAULT (datetime('now', 'localtime')),
+            UNIQUE(url, kind, snapshot_date)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ugc_count_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            song_id INTEGER NOT NULL,
+            platform TEXT NOT NULL, -- tiktok, youtube
+            video_count INTEGER NOT NULL,
+            collected_date DATE DEFAULT (date('now', 'localtime')),
+            collected_at DATETIME DEFAULT (datetime('now', 'localtime')),
+            FOREIGN KEY (song_id) REFERENCES songs (id),
+            UNIQUE(song_id, platform, collected_date)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS platform_latency (
+            platform TEXT PRIMARY KEY, -- tiktok, youtube
+            avg_seconds REAL NOT NULL,
+            samples INTEGER DEFAULT 0,
+            updated_at DATETIME DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS deferred_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            song_id INTEGER NOT NULL,
+            platform TEXT NOT NULL,
+            priority REAL,
+            reason TEXT,
+            deferred_at DATETIME DEFAULT (datetime('now', 'localtime')),
+            FOREIGN KEY (song_id) REFERENCES songs (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS collection_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            queue TEXT NOT NULL, -- 큐 이름 (기본: ugc-YYYY-MM-DD)
+            platform TEXT NOT NULL,
+            song_id INTEGER NOT NULL,
+            platform_id TEXT NOT NULL,
+            label TEXT,
+            priority REAL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending', -- pending, leased, done, failed
+            owner TEXT, -- 리스를 가진 워커 (호스트:PID:토큰)
+            lease_expires_at REAL, -- 유닉스 시각
+            attempts INTEGER DEFAULT 0,
+            max_attempts INTEGER DEFAULT 3,
+            next_run_at REAL DEFAULT 0, -- 유닉스 시각, 재시도 대기
+            last_error TEXT,
+            video_count INTEGER,
+            created_at DATETIME DEFAULT (datetime('now', 'localtime')),
+            updated_at DATETIME DEFAULT (datetime('now', 'localtime')),
+            FOREIGN KEY (song_id) REFERENCES songs (id),
+            UNIQUE(queue, platform, song_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            domain TEXT PRIMARY KEY, -- www.tiktok.com, www.youtube.com
+            rate REAL NOT NULL, -- 도메인 전체 초당 요청 수 (AIMD로 조정)
+            consecutive_throttles INTEGER DEFAULT 0,
+            backoff_until REAL DEFAULT 0, -- 유닉스 시각
+            successes INTEGER DEFAULT 0,
+            throttles INTEGER DEFAULT 0,
+            updated_at DATETIME DEFAULT (datetime('now', 'localtime'))
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS pipeline_stage_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pipeline TEXT NOT NULL, -- daily 등
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            status TEXT NOT NULL, -- success, failed, skipped
+            started_offset REAL, -- 실행 시작 기준 (초)
+            duration REAL, -- 초
+            error TEXT,
+            created_at DATETIME DEFAULT (datetime('now', 'localtime'))
+        )
         """
     )
     with get_db_connection() as conn:
@@ -111,6 +221,19 @@ def create_tables():
     # 테이블 생성 후 인덱스도 함께 생성
     create_indexes()
 
+def ensure_schema():
+    """
+    create_tables()를 프로세스당 한 번만 실행합니다.
+    테이블에 직접 쓰는 모듈(스냅샷 저장소, 스케줄러, 작업 큐 등)이 첫 쿼리 전에 호출합니다.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            create_tables()
+            _schema_ready = True
+
 def create_indexes():
     """성능 최적화를 위한 필수 인덱스들을 생성합니다."""
     indexes = [
@@ -132,7 +255,23 @@ def create_indexes():
         "CREATE INDEX IF NOT EXISTS idx_song_hashtags_song_id ON song_hashtags (song_id)",
         "CREATE INDEX IF NOT EXISTS idx_song_hashtags_hashtag ON song_hashtags (hashtag)",
         "CREATE INDEX IF NOT EXISTS idx_song_hashtags_count ON song_hashtags (count)",
-        "CREATE INDEX IF NOT EXISTS idx_song_hashtags_date ON song_hashtags (collected_date)"
+        "CREATE INDEX IF NOT EXISTS idx_song_hashtags_date ON song_hashtags (collected_date)",
+
+        # page_snapshots 테이블 인덱스들
+        "CREATE INDEX IF NOT EXISTS idx_page_snapshots_kind_date ON page_snapshots (kind, snapshot_date)",
+        "CREATE INDEX IF NOT EXISTS idx_page_snapshots_hash ON page_snapshots (content_hash)",
+
+        # ugc_count_history 테이블 인덱스들
+        "CREATE INDEX IF NOT EXISTS idx_ugc_history_song_platform ON ugc_count_history (song_id, platform, collected_date)",
+
+        # deferred_jobs 테이블 인덱스들
+        "CREATE INDEX IF NOT EXISTS idx_deferred_jobs_song_platform ON deferred_jobs (song_id, platform, deferred_at)",
+
+        # collection_jobs 테이블 인덱스들
+        "CREATE INDEX IF NOT EXISTS idx_collection_jobs_claim ON collection_jobs (queue, status, next_run_at, priority)",
+
+        # pipeline_stage_runs 테이블 인덱스들
+        "CREATE INDEX IF NOT EXISTS idx_pipeline_stage_runs_run ON pipeline_stage_runs (pipeline, run_id)"
     ]
     
     with get_db_connection() as conn:
@@ -229,63 +368,109 @@ def add_trend(song_id, source, category, rank, metrics=None, daily_view_count=No
         conn.commit()
 
 def update_ugc_counts(song_id, youtube_count=None, tiktok_count=None):
-    """UGC 동영상 개수를 업데이트합니다."""
+    """UGC 동영상 개수를 업데이트하고 플랫폼별 수집 이력(ugc_count_history)에 기록합니다."""
     updates = []
     params = []
+    history = []
     
     if youtube_count is not None:
         updates.append("youtube_ugc_count = ?")
         params.append(youtube_count)
+        history.append((song_id, 'youtube', youtube_count))
     
     if tiktok_count is not None:
         updates.append("tiktok_ugc_count = ?")
         params.append(tiktok_count)
+        history.append((song_id, 'tiktok', tiktok_count))
     
     if updates:
         updates.append("ugc_last_updated = datetime('now', 'localtime')")
         params.append(song_id)
         
         sql = f"UPDATE songs SET {', '.join(updates)} WHERE id = ?"
+        history_sql = """
+        INSERT OR REPLACE INTO ugc_count_history (song_id, platform, video_count, collected_date, collected_at)
+        VALUES (?, ?, ?, date('now', 'localtime'), datetime('now', 'localtime'))
+        """
         
         with get_db_connection() as conn:
             cur = conn.cursor()
             cur.execute(sql, params)
+            updated = cur.rowcount > 0
+            try:
+                cur.executemany(history_sql, history)
+            except sqlite3.OperationalError as e:
+                # create_tables() 이전에 만든 DB에는 이력 테이블이 없을 수 있음
+                logger.debug(f"UGC 이력 기록 생략: {e}")
             conn.commit()
-            return cur.rowcount > 0
+            return updated
     return False
 
-def save_song_hashtags(song_id, top_hashtags):
+def backfill_ugc_count(song_id, platform, video_count, collected_at, update_current=False):
+    """
+    과거에 받은 페이지(스냅샷)에서 다시 추출한 UGC 카운트를 받은 시점 날짜로 수집 이력에 기록합니다.
+    songs.ugc_last_updated는 바꾸지 않으므로 계획기가 오래된 카운트를 오늘 수집한 것으로 보지 않습니다.
+
+    Args:
+        song_id: 곡 ID
+        platform: 'tiktok' 또는 'youtube'
+        video_count: 비디오 개수
+        collected_at: 스냅샷을 받은 시각 ('YYYY-MM-DD HH:MM:SS' 또는 'YYYY-MM-DD')
+        update_current: True면 songs의 현재 카운트도 바꿈 (그 날짜 이후에 수집한 값이 있으면 덮어쓰지 않음)
+    """
+    column = {'tiktok': 'tiktok_ugc_count', 'youtube': 'youtube_ugc_count'}[platform]
+    history_sql = """
+    INSERT OR REPLACE INTO ugc_count_history (song_id, platform, video_count, collected_date, collected_at)
+    VALUES (?, ?, ?, date(?), datetime(?))
+    """
+    current_sql = f"""
+    UPDATE songs SET {column} = ?
+    WHERE id = ? AND (ugc_last_updated IS NULL OR date(ugc_last_updated) <= date(?))
+    """
+
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(history_sql, (song_id, platform, video_count, collected_at, collected_at))
+        updated = False
+        if update_current:
+            cur.execute(current_sql, (video_count, song_id, collected_at))
+            updated = cur.rowcount > 0
+        conn.commit()
+        return updated
+
+def save_song_hashtags(song_id, top_hashtags, collected_date=None):
     """
     곡의 상위 해시태그들을 데이터베이스에 저장합니다.
     
     Args:
         song_id: 곡 ID
         top_hashtags: [(hashtag, count), ...] 형태의 리스트 (순위순으로 정렬됨)
+        collected_date: 저장할 수집 날짜 ('YYYY-MM-DD', None이면 오늘 - 스냅샷 재추출 시 사용)
     """
     if not top_hashtags:
         return
         
-    # 기존 해시태그 데이터 삭제 (오늘 날짜)
+    # 기존 해시태그 데이터 삭제 (같은 날짜)
     delete_sql = """
     DELETE FROM song_hashtags 
-    WHERE song_id = ? AND collected_date = date('now', 'localtime')
+    WHERE song_id = ? AND collected_date = COALESCE(?, date('now', 'localtime'))
     """
     
     # 새 해시태그 데이터 삽입
     insert_sql = """
     INSERT INTO song_hashtags (song_id, hashtag, count, rank, collected_date)
-    VALUES (?, ?, ?, ?, date('now', 'localtime'))
+    VALUES (?, ?, ?, ?, COALESCE(?, date('now', 'localtime')))
     """
     
     with get_db_connection() as conn:
         cur = conn.cursor()
         
         # 기존 데이터 삭제
-        cur.execute(delete_sql, (song_id,))
+        cur.execute(delete_sql, (song_id, collected_date))
         
         # 새 데이터 삽입
         for rank, (hashtag, count) in enumerate(top_hashtags, 1):
-            cur.execute(insert_sql, (song_id, hashtag, count, rank))
+            cur.execute(insert_sql, (song_id, hashtag, count, rank, collected_date))
         
         conn.commit()
         
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+페이지 스냅샷 저장소
+스크래퍼가 받아온 HTML/JSON 원문을 gzip으로 압축해 내용 해시(SHA-256) 이름으로 저장하고,
+URL·종류·날짜별 목록을 page_snapshots 테이블에 기록합니다. 같은 내용은 한 번만 저장되며,
+보존 기간이 지난 스냅샷은 apply_retention()으로 정리합니다.
+저장된 스냅샷은 scripts/reextract_snapshots.py로 네트워크 없이 다시 추출할 수 있습니다.
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.database import database_manager as db
+from src.utils.logger_config import get_logger, log_database_operation
+
+logger = get_logger(__name__)
+
+# 환경변수: SCRAPER_SNAPSHOTS=0 이면 저장하지 않음
+SNAPSHOTS_ENABLED = os.getenv('SCRAPER_SNAPSHOTS', '1') != '0'
+SNAPSHOT_RETENTION_DAYS = int(os.getenv('SCRAPER_SNAPSHOT_RETENTION_DAYS', '30'))
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'snapshots', 'objects')
+
+
+def _object_path(content_hash):
+    return os.path.join(SNAPSHOT_DIR, content_hash[:2], f"{content_hash}.gz")
+
+
+def _write_object(content_hash, raw_bytes):
+    """압축 파일을 저장합니다 (이미 있으면 그대로 사용). 압축 후 크기를 반환합니다."""
+    path = _object_path(content_hash)
+    if os.path.exists(path):
+        return os.path.getsize(path)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    compressed = gzip.compress(raw_bytes)
+    # 임시 파일에 쓴 뒤 교체해 동시에 저장해도 깨진 파일이 남지 않도록 함
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, 'wb') as f:
+        f.write(compressed)
+    os.replace(temp_path, path)
+    return len(compressed)
+
+
+def save_snapshot(url, kind, content):
+    """
+    원문 스냅샷을 저장합니다. 실패해도 스크래핑에 영향을 주지 않도록 예외를 삼킵니다.
+
+    Args:
+        url: 받아온 페이지 URL
+        kind: 스냅샷 종류 (tiktok_sound_html, tiktok_sound_json, youtube_shorts_html 등)
+        content: str(HTML) 또는 JSON으로 직렬화할 수 있는 객체
+
+    Returns:
+        str: 내용 해시, 저장하지 않았으면 None
+    """
+    if not SNAPSHOTS_ENABLED or content is None:
+        return None
+
+    try:
+        text = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+        raw_bytes = text.encode('utf-8')
+        content_hash = hashlib.sha256(raw_bytes).hexdigest()
+        compressed_bytes = _write_object(content_hash, raw_bytes)
+
+        db.ensure_schema()
+        with db.get_db_connection() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO page_snapshots
+                (url, kind, content_hash, size_bytes, compressed_bytes, snapshot_date, fetched_at)
+                VALUES (?, ?, ?, ?, ?, date('now', 'localtime'), datetime('now', 'localtime'))
+            """, (url, kind, content_hash, len(raw_bytes), compressed_bytes))
+            conn.commit()
+
+        logger.debug(f"🗄️ 스냅샷 저장 [{kind}] {url} ({len(raw_bytes) / 1024:.0f}KB → {compressed_bytes / 1024:.0f}KB)")
+        return content_hash
+    except Exception as e:
+        logger.warning(f"⚠️ 스냅샷 저장 실패 ({url}): {e}")
+        return None
+
+
+def load_snapshot(content_hash):
+    """내용 해시로 스냅샷 원문(str)을 읽습니다."""
+    with gzip.open(_object_path(content_hash), 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+def load_snapshot_json(content_hash):
+    return json.loads(load_snapshot(content_hash))
+
+
+def list_snapshots(kinds=None, since=None, until=None):
+    """
+    조건에 맞는 스냅샷 목록을 날짜순으로 반환합니다.
+
+    Args:
+        kinds: 스냅샷 종류 목록 (None이면 전체)
+        since / until: 'YYYY-MM-DD' 날짜 범위 (포함)
+    """
+    db.ensure_schema()
+    conditions = []
+    params = []
+    if kinds:
+        conditions.append(f"kind IN ({', '.join('?' for _ in kinds)})")
+        params.extend(kinds)
+    if since:
+        conditions.append("snapshot_date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("snapshot_date <= ?")
+        params.append(until)
+
+    sql = "SELECT url, kind, content_hash, snapshot_date, fetched_at FROM page_snapshots"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY snapshot_date, id"
+
+    with db.get_db_connection() as conn:
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def apply_retention(retention_days=SNAPSHOT_RETENTION_DAYS):
+    """
+    보존 기간이 지난 스냅샷 기록을 지우고, 더 이상 참조되지 않는 압축 파일을 삭제합니다.
+
+    Returns:
+        dict: {'rows': 삭제한 기록 수, 'files': 삭제한 파일 수}
+    """
+    db.ensure_schema()
+    with db.get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM page_snapshots WHERE snapshot_date < date('now', 'localtime', ?)",
+                    (f"-{retention_days} days",))
+        deleted_rows = cur.rowcount
+        conn.commit()
+        referenced = {row['content_hash'] for row in cur.execute("SELECT DISTINCT content_hash FROM page_snapshots")}
+
+    deleted_files = 0
+    if os.path.isdir(SNAPSHOT_DIR):
+        for root, _, files in os.walk(SNAPSHOT_DIR):
+            for name in files:
+                if name.endswith('.gz') and name[:-3] not in referenced:
+                    os.remove(os.path.join(root, name))
+                    deleted_files += 1
+
+    log_database_operation(logger, f"{retention_days}일 지난 스냅샷 삭제", "page_snapshots", deleted_rows)
+    return {'rows': deleted_rows, 'files': deleted_files}
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+UGC 카운터용 공유 Chromium 브라우저 풀
+곡마다 브라우저를 새로 띄우지 않고, 미리 띄워 둔 브라우저와 재사용 가능한
+컨텍스트에서 페이지를 빌려 줍니다. 일정 페이지 수 또는 메모리(RSS) 임계치를
+넘으면 브라우저를 재시작합니다.
+플랫폼 컨텍스트는 browser_state 설정에 따라 영구 프로필(쿠키 + HTTP 디스크 캐시 유지)
+또는 공유 storage-state로 채운 컨텍스트로 만듭니다.
+"""
+
+import os
+import sys
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger, log_performance_metric, log_error_with_context
+from src.scrapers.request_filter import install_route_policy, install_blocklist_policy, log_bandwidth_summary
+from src.scrapers.wait_strategies import log_wait_summary
+from src.scrapers.har_replay import is_har_active, new_context as new_har_context
+from src.scrapers import browser_state
+
+try:
+    import psutil  # 선택적 의존성: RSS 기반 재시작에만 사용
+except ImportError:
+    psutil = None
+
+try:
+    from playwright._impl._errors import TargetClosedError  # 공개 API에 없어 버전에 따라 없을 수 있음
+except ImportError:
+    TargetClosedError = None
+
+# 로거 설정
+logger = get_logger(__name__)
+
+# 환경변수로 조정 가능한 기본값
+DEFAULT_POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '1'))
+DEFAULT_MAX_PAGES_PER_BROWSER = int(os.getenv('BROWSER_POOL_MAX_PAGES', '50'))
+DEFAULT_MAX_RSS_MB = int(os.getenv('BROWSER_POOL_MAX_RSS_MB', '1500'))
+DEFAULT_LAUNCH_ARGS = ['--no-sandbox', '--disable-dev-shm-usage']
+
+# 브라우저/타깃이 닫히거나 연결이 끊겼을 때의 오류 메시지 (이 경우에만 브라우저를 재시작)
+BROWSER_CLOSED_MARKERS = (
+    'target page, context or browser has been closed',
+    'target closed',
+    'browser has been closed',
+    'browser has disconnected',
+    'connection closed'
+)
+
+
+def _chromium_pids():
+    """현재 프로세스 하위의 Chromium 프로세스 PID 집합을 반환합니다."""
+    if psutil is None:
+        return set()
+    try:
+        return {
+            child.pid for child in psutil.Process().children(recursive=True)
+            if 'chrom' in child.name().lower()
+        }
+    except psutil.Error:
+        return set()
+
+
+class PooledBrowser:
+    """풀에서 관리되는 단일 Chromium 인스턴스"""
+
+    def __init__(self, browser, launch_time, pid=None, playwright=None, headless=True, launch_args=None):
+        self.browser = browser
+        self.launch_time = launch_time
+        self.pid = pid
+        self.pages_served = 0
+        self.contexts = {}  # platform -> BrowserContext
+        self.profiles = {}  # platform -> 영구 프로필 디렉터리 (영구 컨텍스트인 경우)
+        self.in_use = False
+        self.healthy = True
+        self._playwright = playwright
+        self._headless = headless
+        self._launch_args = launch_args
+
+    def get_context(self, platform):
+        """플랫폼별 컨텍스트를 재사용하고, 없으면 새로 만듭니다."""
+        context = self.contexts.get(platform)
+        if context is None:
+            context = self._new_context(platform)
+            self.contexts[platform] = context
+        return context
+
+    def _new_context(self, platform):
+        if browser_state.is_persistent() and self._playwright is not None:
+            # 영구 컨텍스트는 별도 Chromium 프로세스로 뜨므로 RSS 측정(rss_mb) 대상에는 포함되지 않음
+            try:
+                context, profile_dir = browser_state.launch_persistent_context(
+                    self._playwright, platform, headless=self._headless, args=self._launch_args,
+                    browser_version=self.browser.version)
+                self.profiles[platform] = profile_dir
+                return context
+            except Exception as e:
+                logger.warning(f"⚠️ [{platform}] 영구 프로필 실행 실패, 일반 컨텍스트 사용: {e}")
+        return browser_state.new_context(self.browser)
+
+    def is_persistent(self, platform):
+        return platform in self.profiles
+
+    def is_broken_by(self, error):
+        """
+        예외가 브라우저 자체의 종료/연결 끊김 때문인지 확인합니다.
+        goto/선택자 타임아웃이나 파싱 오류 같은 페이지 단위 오류는 False (브라우저를 계속 사용).
+        """
+        try:
+            if not self.browser.is_connected():
+                return True
+        except Exception:
+            return True
+        if TargetClosedError is not None and isinstance(error, TargetClosedError):
+            return True
+        message = str(error).lower()
+        return any(marker in message for marker in BROWSER_CLOSED_MARKERS)
+
+    def rss_mb(self):
+        """브라우저 프로세스 트리의 RSS(MB)를 반환합니다. 측정 불가 시 None."""
+        if psutil is None or self.pid is None:
+            return None
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(proc.memory_info().rss for proc in processes) / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def close(self):
+        for platform, context in self.contexts.items():
+            try:
+                if platform in self.profiles:
+                    browser_state.close_persistent_context(context, self.profiles[platform])
+                else:
+                    browser_state.save_context_state(context)
+                    context.close()
+            except Exception:
+                pass
+        self.contexts.clear()
+        self.profiles.clear()
+        try:
+            self.browser.close()
+        except Exception as e:
+            logger.debug(f"브라우저 종료 중 오류 (무시): {e}")
+
+
+class BrowserPool:
+    """
+    스레드 하나에 묶인 Chromium 브라우저 풀
+
+    Playwright sync API 객체는 생성한 스레드에서만 사용할 수 있으므로,
+    풀은 스레드별로 하나씩 만들어 씁니다 (get_browser_pool 참고).
+    """
+
+    def __init__(self, size=None, max_pages_per_browser=None, max_rss_mb=None,
+                 headless=True, launch_args=None):
+        self.size = max(1, size or DEFAULT_POOL_SIZE)
+        self.max_pages_per_browser = max_pages_per_browser or DEFAULT_MAX_PAGES_PER_BROWSER
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else DEFAULT_MAX_RSS_MB
+        self.headless = headless
+        self.launch_args = launch_args if launch_args is not None else list(DEFAULT_LAUNCH_ARGS)
+
+        self._playwright = None
+        self._browsers = []
+        self._owner_thread = threading.get_ident()
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'launches': 0,
+            'recycles': 0,
+            'pages_served': 0,
+            'launch_time_total': 0.0,
+            'launch_time_max': 0.0
+        }
+
+        if psutil is None and self.max_rss_mb:
+            logger.debug("psutil 미설치: RSS 기반 브라우저 재시작 비활성화")
+
+    def start(self):
+        """Playwright 드라이버를 시작합니다 (첫 페이지 요청 시 자동 호출)."""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        return self
+
+    def warm_up(self):
+        """풀 크기만큼 브라우저를 미리 띄웁니다."""
+        self.start()
+        while len(self._browsers) < self.size:
+            self._launch()
+        return self
+
+    def _launch(self):
+        before = _chromium_pids()
+        started = time.time()
+        browser = self._playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+        launch_time = time.time() - started
+
+        # 새로 생긴 Chromium 프로세스 중 부모가 Chromium이 아닌 것이 메인 프로세스
+        pid = None
+        if psutil is not None:
+            new_pids = _chromium_pids() - before
+            for candidate in new_pids:
+                try:
+                    if psutil.Process(candidate).ppid() not in new_pids:
+                        pid = candidate
+                        break
+                except psutil.Error:
+                    continue
+
+        entry = PooledBrowser(browser, launch_time, pid, playwright=self._playwright,
+                              headless=self.headless, launch_args=self.launch_args)
+        self._browsers.append(entry)
+
+        self.metrics['launches'] += 1
+        self.metrics['launch_time_total'] += launch_time
+        self.metrics['launch_time_max'] = max(self.metrics['launch_time_max'], launch_time)
+        log_performance_metric(logger, "브라우저 실행 시간", launch_time, "s")
+        return entry
+
+    def _checkout(self):
+        """가장 적게 사용된 유휴 브라우저를 빌려 줍니다. 없으면 새로 띄웁니다."""
+        self.start()
+        idle = [entry for entry in self._browsers if not entry.in_use and entry.healthy]
+        if idle:
+            entry = min(idle, key=lambda e: e.pages_served)
+            self.metrics['hits'] += 1
+        elif len(self._browsers) < self.size:
+            entry = self._launch()
+            self.metrics['misses'] += 1
+        else:
+            raise RuntimeError(f"브라우저 풀의 모든 브라우저({self.size}개)가 사용 중입니다")
+        entry.in_use = True
+        return entry
+
+    def _maybe_recycle(self, entry):
+        """페이지 수/RSS/오류 상태에 따라 브라우저를 재시작 대상으로 처리합니다."""
+        reason = None
+        if not entry.healthy:
+            reason = "오류 발생"
+        elif entry.pages_served >= self.max_pages_per_browser:
+            reason = f"페이지 {entry.pages_served}개 처리"
+        elif self.max_rss_mb:
+            rss = entry.rss_mb()
+            if rss is not None and rss >= self.max_rss_mb:
+                reason = f"RSS {rss:.0f}MB"
+
+        if reason:
+            logger.info(f"♻️ 브라우저 재시작 ({reason})")
+            self._browsers.remove(entry)
+            entry.close()
+            self.metrics['recycles'] += 1
+
+    @contextmanager
+    def page(self, platform='default', har_key=None):
+        """
+        풀에서 페이지를 하나 빌려 줍니다.
+
+        Args:
+            platform: 컨텍스트 구분 키 (tiktok, youtube 등). 같은 플랫폼끼리 쿠키를 공유합니다.
+            har_key: HAR 녹화/재생 모드에서 사용할 HAR 키 (보통 URL). 이 경우 페이지마다 별도 컨텍스트를 씁니다.
+        """
+        entry = self._checkout()
+        page = None
+        har_context = None
+        try:
+            if har_key and is_har_active():
+                har_context = new_har_context(entry.browser, har_key)
+                page = har_context.new_page()
+                install_route_policy(page, platform)
+            else:
+                page = entry.get_context(platform).new_page()
+                if entry.is_persistent(platform):
+                    # page.route는 HTTP 캐시를 끄므로 영구 프로필에서는 CDP 차단 목록 사용
+                    install_blocklist_policy(page, platform)
+                else:
+                    install_route_policy(page, platform)
+            yield page
+        except Exception as e:
+            # 페이지 단위 오류(타임아웃, 파싱 실패 등)는 그대로 전달하고 브라우저는 계속 사용
+            if entry.is_broken_by(e):
+                entry.healthy = False
+            raise
+        finally:
+            if page is not None:
+                try:
+                    page.close()
+                except Exception as e:
+                    if entry.is_broken_by(e):
+                        entry.healthy = False
+            if har_context is not None:
+                try:
+                    har_context.close()  # 녹화 모드에서는 이때 HAR 파일이 기록됨
+                except Exception as e:
+                    logger.debug(f"HAR 컨텍스트 종료 중 오류 (무시): {e}")
+            entry.pages_served += 1
+            entry.in_use = False
+            self.metrics['pages_served'] += 1
+            self._maybe_recycle(entry)
+
+    def get_metrics(self):
+        """풀 히트/미스 및 실행 시간 지표를 반환합니다."""
+        metrics = dict(self.metrics)
+        requests = metrics['hits'] + metrics['misses']
+        metrics['hit_rate'] = (metrics['hits'] / requests * 100) if requests > 0 else 0
+        metrics['launch_time_avg'] = (
+            metrics['launch_time_total'] / metrics['launches'] if metrics['launches'] > 0 else 0
+        )
+        metrics['warm_browsers'] = len(self._browsers)
+        return metrics
+
+    def log_metrics(self):
+        """풀 지표를 로그로 남깁니다."""
+        metrics = self.get_metrics()
+        if metrics['hits'] + metrics['misses'] == 0:
+            return
+        logger.info(f"🧊 브라우저 풀: 히트 {metrics['hits']}회, 미스 {metrics['misses']}회 "
+                    f"(히트율 {metrics['hit_rate']:.1f}%), 재시작 {metrics['recycles']}회")
+        logger.info(f"🚀 브라우저 실행: {metrics['launches']}회, "
+                    f"평균 {metrics['launch_time_avg']:.2f}초, 최대 {metrics['launch_time_max']:.2f}초")
+        log_bandwidth_summary()
+        log_wait_summary()
+
+    def close(self):
+        """모든 브라우저와 Playwright 드라이버를 종료합니다."""
+        if threading.get_ident() != self._owner_thread:
+            logger.debug("다른 스레드의 브라우저 풀은 종료할 수 없어 건너뜁니다")
+            return
+        self.log_metrics()
+        for entry in self._browsers:
+            entry.close()
+        self._browsers = []
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                log_error_with_context(logger, e, "Playwright 종료")
+            self._playwright = None
+
+
+# 스레드별 공유 풀
+_thread_local = threading.local()
+
+
+def get_browser_pool(**kwargs):
+    """현재 스레드의 공유 브라우저 풀을 반환합니다 (없으면 생성)."""
+    pool = getattr(_thread_local, 'pool', None)
+    if pool is None:
+        pool = BrowserPool(**kwargs)
+        _thread_local.pool = pool
+    return pool
+
+
+def shutdown_browser_pool():
+    """현재 스레드의 공유 브라우저 풀을 종료합니다."""
+    pool = getattr(_thread_local, 'pool', None)
+    if pool is not None:
+        pool.close()
+        _thread_local.pool = None
+
+
+@atexit.register
+def _close_pools_at_exit():
+    shutdown_browser_pool()
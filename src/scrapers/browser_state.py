@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+실행 간 브라우저 상태 유지
+플랫폼별 영구 프로필(user_data_dir)로 쿠키·동의 상태와 HTTP 디스크 캐시(JS/CSS 번들)를 다음 실행까지 유지하고,
+모든 플랫폼이 공유하는 storage-state 파일(쿠키 + localStorage)로 새 컨텍스트/새 프로필을 미리 채웁니다.
+
+BROWSER_STATE_MODE:
+    persistent (기본값) - 영구 프로필 + 공유 storage-state
+    storage             - 일반 컨텍스트에 공유 storage-state만 사용
+    off                 - 매번 빈 프로필 (기존 동작)
+HAR 녹화/재생 모드에서는 결과가 재현되도록 항상 비활성화됩니다.
+
+오래된 상태(BROWSER_STATE_MAX_AGE_DAYS)와 브라우저 버전이 바뀐 프로필은 초기화하고,
+프로필 크기(BROWSER_PROFILE_MAX_MB)와 디스크 캐시 크기(BROWSER_DISK_CACHE_MAX_MB)에 상한을 둡니다.
+
+사용법:
+    python src/scrapers/browser_state.py [--info] [--clear]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import threading
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+from src.scrapers.har_replay import is_har_active
+
+try:
+    import psutil  # 선택적 의존성: 프로필 잠금의 소유 프로세스 확인에만 사용
+except ImportError:
+    psutil = None
+
+logger = get_logger(__name__)
+
+STATE_MODE_OFF = 'off'
+STATE_MODE_STORAGE = 'storage'
+STATE_MODE_PERSISTENT = 'persistent'
+
+BROWSER_STATE_MODE = os.getenv('BROWSER_STATE_MODE', STATE_MODE_PERSISTENT).lower()
+BROWSER_STATE_DIR = os.getenv('BROWSER_STATE_DIR',
+                              os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'browser_state'))
+STATE_MAX_AGE_DAYS = int(os.getenv('BROWSER_STATE_MAX_AGE_DAYS', '7'))
+PROFILE_MAX_MB = int(os.getenv('BROWSER_PROFILE_MAX_MB', '400'))
+DISK_CACHE_MAX_MB = int(os.getenv('BROWSER_DISK_CACHE_MAX_MB', '200'))
+STORAGE_STATE_MAX_KB = int(os.getenv('BROWSER_STORAGE_STATE_MAX_KB', '512'))
+
+# 공유 storage-state에 남길 도메인 (그 외 광고/추적 쿠키는 저장하지 않음)
+STATE_DOMAINS = ['tiktok.com', 'youtube.com', 'google.com']
+# 프로필 잠금 파일의 소유 프로세스를 확인할 수 없을 때 잠금을 무시하는 시간
+PROFILE_LOCK_STALE_SECONDS = 6 * 3600
+# 프로필이 크기 상한을 넘으면 먼저 비우는 캐시 디렉터리
+PROFILE_CACHE_DIRS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'Service Worker', 'CacheStorage'),
+    'GrShaderCache',
+    'ShaderCache'
+]
+
+_state_lock = threading.Lock()
+_claimed_profiles = set()
+
+
+def is_enabled():
+    return BROWSER_STATE_MODE in (STATE_MODE_STORAGE, STATE_MODE_PERSISTENT) and not is_har_active()
+
+
+def is_persistent():
+    return BROWSER_STATE_MODE == STATE_MODE_PERSISTENT and not is_har_active()
+
+
+def storage_state_path():
+    return os.path.join(BROWSER_STATE_DIR, 'storage_state.json')
+
+
+def _is_expired(path):
+    return time.time() - os.path.getmtime(path) > STATE_MAX_AGE_DAYS * 86400
+
+
+def _domain_matches(domain):
+    domain = domain.lstrip('.').lower()
+    return any(domain == allowed or domain.endswith('.' + allowed) for allowed in STATE_DOMAINS)
+
+
+def _dir_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total / (1024 * 1024)
+
+
+# ---------------------------------------------------------------------------
+# 공유 storage-state (쿠키 + localStorage)
+# ---------------------------------------------------------------------------
+
+def load_storage_state():
+    """
+    공유 storage-state를 읽습니다. 없거나, 만료됐거나, 깨졌으면 None.
+
+    Returns:
+        dict: Playwright storage_state 형식 {'cookies': [...], 'origins': [...]}
+    """
+    if not is_enabled():
+        return None
+    path = storage_state_path()
+    if not os.path.exists(path):
+        return None
+    if _is_expired(path):
+        logger.info(f"🧹 {STATE_MAX_AGE_DAYS}일 지난 브라우저 storage-state 삭제")
+        os.remove(path)
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ 브라우저 storage-state를 읽을 수 없어 삭제합니다: {e}")
+        os.remove(path)
+        return None
+
+    now = time.time()
+    state['cookies'] = [cookie for cookie in state.get('cookies', [])
+                        if cookie.get('expires', -1) <= 0 or cookie['expires'] > now]
+    state.setdefault('origins', [])
+    return state
+
+
+def _merge_state(existing, current):
+    """기존 상태에 새 상태를 덮어씁니다 (쿠키는 이름/도메인/경로, localStorage는 origin 기준)."""
+    cookies = {(c['name'], c['domain'], c['path']): c for c in (existing or {}).get('cookies', [])}
+    origins = {o['origin']: o for o in (existing or {}).get('origins', [])}
+    for cookie in current.get('cookies', []):
+        if _domain_matches(cookie.get('domain', '')):
+            cookies[(cookie['name'], cookie['domain'], cookie['path'])] = cookie
+    for origin in current.get('origins', []):
+        host = origin['origin'].split('://', 1)[-1].split(':', 1)[0]
+        if _domain_matches(host):
+            origins[origin['origin']] = origin
+    return {'cookies': list(cookies.values()), 'origins': list(origins.values())}
+
+
+def save_storage_state(state):
+    """새 상태를 공유 storage-state 파일에 병합해 저장합니다. 크기 상한을 넘으면 localStorage부터 줄입니다."""
+    if not is_enabled() or not state:
+        return
+    with _state_lock:
+        merged = _merge_state(load_storage_state(), state)
+        payload = json.dumps(merged, ensure_ascii=False)
+        max_bytes = STORAGE_STATE_MAX_KB * 1024
+
+        # 상한을 넘으면 가장 큰 origin의 localStorage부터 제외
+        origins = sorted(merged['origins'], key=lambda o: len(json.dumps(o, ensure_ascii=False)))
+        while len(payload.encode('utf-8')) > max_bytes and origins:
+            dropped = origins.pop()
+            logger.debug(f"storage-state 크기 상한 초과: {dropped['origin']} localStorage 제외")
+            merged['origins'] = origins
+            payload = json.dumps(merged, ensure_ascii=False)
+        if len(payload.encode('utf-8')) > max_bytes:
+            logger.warning(f"⚠️ 쿠키만으로도 storage-state 크기 상한({STORAGE_STATE_MAX_KB}KB)을 넘어 저장하지 않습니다")
+            return
+
+        os.makedirs(BROWSER_STATE_DIR, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=BROWSER_STATE_DIR)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temp_path, storage_state_path())
+
+
+def save_context_state(context):
+    """컨텍스트의 쿠키/localStorage를 공유 storage-state에 저장합니다 (실패해도 무시)."""
+    if not is_enabled():
+        return
+    try:
+        save_storage_state(context.storage_state())
+    except Exception as e:
+        logger.debug(f"브라우저 storage-state 저장 실패 (무시): {e}")
+
+
+async def save_context_state_async(context):
+    if not is_enabled():
+        return
+    try:
+        save_storage_state(await context.storage_state())
+    except Exception as e:
+        logger.debug(f"브라우저 storage-state 저장 실패 (무시): {e}")
+
+
+def new_context(browser, **options):
+    """공유 storage-state로 미리 채운 일반 컨텍스트를 만듭니다 (sync API)."""
+    state = load_storage_state()
+    if state:
+        options = dict(options, storage_state=state)
+    return browser.new_context(**options)
+
+
+async def new_context_async(browser, **options):
+    """new_context의 async API 버전"""
+    state = load_storage_state()
+    if state:
+        options = dict(options, storage_state=state)
+    return await browser.new_context(**options)
+
+
+# ---------------------------------------------------------------------------
+# 플랫폼별 영구 프로필 (user_data_dir)
+# ---------------------------------------------------------------------------
+
+def _lock_path(profile_dir):
+    return profile_dir + '.lock'
+
+
+def _lock_is_stale(lock_path):
+    try:
+        with open(lock_path, 'r') as f:
+            pid = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return True
+    if psutil is not None:
+        return not psutil.pid_exists(pid)
+    return time.time() - os.path.getmtime(lock_path) > PROFILE_LOCK_STALE_SECONDS
+
+
+def _try_lock(profile_dir):
+    """프로필 잠금 파일을 만듭니다. 다른 프로세스가 쓰는 중이면 False."""
+    lock_path = _lock_path(profile_dir)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            return True
+        except FileExistsError:
+            if not _lock_is_stale(lock_path):
+                return False
+            logger.debug(f"오래된 프로필 잠금 제거: {lock_path}")
+            try:
+                os.remove(lock_path)
+            except OSError:
+                return False
+    return False
+
+
+def claim_profile(platform):
+    """
+    사용 중이 아닌 플랫폼 프로필 디렉터리를 하나 잡습니다.
+    같은 플랫폼을 동시에 여러 브라우저(스레드/프로세스)가 쓰면 profiles/<platform>-1, -2 ... 를 씁니다.
+    """
+    os.makedirs(os.path.join(BROWSER_STATE_DIR, 'profiles'), exist_ok=True)
+    slot = 0
+    while True:
+        profile_dir = os.path.abspath(os.path.join(BROWSER_STATE_DIR, 'profiles', f"{platform}-{slot}"))
+        with _state_lock:
+            if profile_dir not in _claimed_profiles and _try_lock(profile_dir):
+                _claimed_profiles.add(profile_dir)
+                return profile_dir
+        slot += 1
+
+
+def release_profile(profile_dir):
+    with _state_lock:
+        _claimed_profiles.discard(profile_dir)
+        try:
+            os.remove(_lock_path(profile_dir))
+        except OSError:
+            pass
+
+
+def _read_meta(profile_dir):
+    try:
+        with open(os.path.join(profile_dir, 'trend_analyzer_meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(profile_dir, browser_version):
+    with open(os.path.join(profile_dir, 'trend_analyzer_meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'created_at': time.time(), 'browser_version': browser_version}, f)
+
+
+def prepare_profile(profile_dir, browser_version=None):
+    """
+    프로필을 사용 전에 점검합니다: 만료됐거나 브라우저 버전이 바뀌었으면 초기화하고,
+    크기 상한을 넘으면 캐시 디렉터리부터 비웁니다.
+
+    Returns:
+        bool: 새(빈) 프로필이면 True
+    """
+    meta = _read_meta(profile_dir)
+    reset_reason = None
+    if os.path.isdir(profile_dir) and meta is None:
+        reset_reason = "메타 정보 없음"
+    elif meta and time.time() - meta.get('created_at', 0) > STATE_MAX_AGE_DAYS * 86400:
+        reset_reason = f"{STATE_MAX_AGE_DAYS}일 경과"
+    elif meta and browser_version and meta.get('browser_version') not in (None, browser_version):
+        reset_reason = f"브라우저 버전 변경 ({meta.get('browser_version')} → {browser_version})"
+
+    if not reset_reason and os.path.isdir(profile_dir):
+        size_mb = _dir_size_mb(profile_dir)
+        if size_mb > PROFILE_MAX_MB:
+            logger.info(f"🧹 프로필 크기 {size_mb:.0f}MB > {PROFILE_MAX_MB}MB: 캐시 비움 ({os.path.basename(profile_dir)})")
+            for cache_dir in PROFILE_CACHE_DIRS:
+                shutil.rmtree(os.path.join(profile_dir, cache_dir), ignore_errors=True)
+            if _dir_size_mb(profile_dir) > PROFILE_MAX_MB:
+                reset_reason = "캐시를 비워도 크기 상한 초과"
+
+    if reset_reason:
+        logger.info(f"🧹 브라우저 프로필 초기화 ({os.path.basename(profile_dir)}): {reset_reason}")
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+    is_new = not os.path.isdir(profile_dir)
+    if is_new:
+        os.makedirs(profile_dir, exist_ok=True)
+        _write_meta(profile_dir, browser_version)
+    return is_new
+
+
+def launch_persistent_context(playwright, platform, headless=True, args=None, browser_version=None, **options):
+    """
+    플랫폼 영구 프로필로 Chromium을 띄웁니다 (sync API). 새 프로필이면 공유 storage-state의 쿠키로 채웁니다.
+
+    Returns:
+        tuple: (BrowserContext, 프로필 디렉터리) - close_persistent_context로 닫아야 합니다.
+    """
+    profile_dir = claim_profile(platform)
+    try:
+        is_new = prepare_profile(profile_dir, browser_version)
+        launch_args = list(args or []) + [f"--disk-cache-size={DISK_CACHE_MAX_MB * 1024 * 1024}"]
+        context = playwright.chromium.launch_persistent_context(
+            profile_dir, headless=headless, args=launch_args, **options)
+    except Exception:
+        release_profile(profile_dir)
+        raise
+
+    state = load_storage_state()
+    if is_new and state and state['cookies']:
+        try:
+            context.add_cookies(state['cookies'])
+        except Exception as e:
+            logger.debug(f"공유 쿠키 적용 실패 (무시): {e}")
+    logger.debug(f"🗂️ [{platform}] 영구 프로필 사용: {profile_dir} ({'새 프로필' if is_new else '재사용'})")
+    return context, profile_dir
+
+
+def close_persistent_context(context, profile_dir):
+    """영구 컨텍스트의 상태를 공유 파일에 저장하고 닫은 뒤 프로필 잠금을 풉니다."""
+    save_context_state(context)
+    try:
+        context.close()
+    finally:
+        release_profile(profile_dir)
+
+
+def clear_state():
+    """저장된 모든 브라우저 상태(프로필, storage-state)를 삭제합니다."""
+    shutil.rmtree(BROWSER_STATE_DIR, ignore_errors=True)
+    logger.info(f"🧹 브라우저 상태 삭제: {BROWSER_STATE_DIR}")
+
+
+def log_state_info():
+    logger.info(f"🗂️ 브라우저 상태 모드: {BROWSER_STATE_MODE} ({BROWSER_STATE_DIR})")
+    path = storage_state_path()
+    if os.path.exists(path):
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        logger.info(f"   storage-state: {os.path.getsize(path) / 1024:.0f}KB, {age_hours:.1f}시간 전 갱신")
+    profiles_dir = os.path.join(BROWSER_STATE_DIR, 'profiles')
+    if os.path.isdir(profiles_dir):
+        for name in sorted(os.listdir(profiles_dir)):
+            profile_dir = os.path.join(profiles_dir, name)
+            if os.path.isdir(profile_dir):
+                logger.info(f"   프로필 {name}: {_dir_size_mb(profile_dir):.0f}MB")
+
+
+if __name__ == "__main__":
+    if '--clear' in sys.argv:
+        clear_state()
+    else:
+        log_state_info()
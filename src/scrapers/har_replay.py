@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+HAR 녹화/재생
+SCRAPER_HAR_MODE=record 이면 스크래퍼가 여는 브라우저 컨텍스트의 네트워크를 HAR 파일로 녹화하고,
+SCRAPER_HAR_MODE=replay 이면 같은 HAR 파일에서 응답을 돌려줘 네트워크 없이 같은 코드 경로를 실행합니다.
+HAR 파일은 SCRAPER_HAR_DIR(기본값 data/har) 아래에 키(URL 등)별로 저장됩니다.
+"""
+
+import os
+import re
+import sys
+import hashlib
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+HAR_MODE_OFF = 'off'
+HAR_MODE_RECORD = 'record'
+HAR_MODE_REPLAY = 'replay'
+
+HAR_MODE = os.getenv('SCRAPER_HAR_MODE', HAR_MODE_OFF).lower()
+HAR_DIR = os.getenv('SCRAPER_HAR_DIR', os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'har'))
+
+
+def is_har_active():
+    return HAR_MODE in (HAR_MODE_RECORD, HAR_MODE_REPLAY)
+
+
+def har_path(key):
+    """키(URL 또는 이름)에 해당하는 HAR 파일 경로. 읽기 쉬운 접두어 + 짧은 해시로 만듭니다."""
+    readable = re.sub(r'[^A-Za-z0-9]+', '_', re.sub(r'^https?://', '', key)).strip('_')[:60]
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+    return os.path.join(HAR_DIR, f"{readable}_{digest}.har")
+
+
+def _record_options(key, options):
+    path = har_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    logger.debug(f"🎙️ HAR 녹화: {path}")
+    # 컨텍스트를 닫을 때 파일이 기록됨
+    return dict(options, record_har_path=path, record_har_content='embed')
+
+
+def _replay_path(key):
+    path = har_path(key)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"재생할 HAR 파일이 없습니다: {path} (키: {key})")
+    logger.debug(f"▶️ HAR 재생: {path}")
+    return path
+
+
+def new_context(browser, key, **options):
+    """
+    HAR 모드에 맞게 브라우저 컨텍스트를 만듭니다 (sync API).
+    녹화 모드에서는 컨텍스트를 닫아야 HAR 파일이 기록됩니다.
+    """
+    if HAR_MODE == HAR_MODE_RECORD:
+        return browser.new_context(**_record_options(key, options))
+
+    context = browser.new_context(**options)
+    if HAR_MODE == HAR_MODE_REPLAY:
+        # HAR에 없는 요청은 네트워크로 보내지 않고 중단
+        context.route_from_har(_replay_path(key), not_found='abort')
+    return context
+
+
+async def new_context_async(browser, key, **options):
+    """new_context의 async API 버전"""
+    if HAR_MODE == HAR_MODE_RECORD:
+        return await browser.new_context(**_record_options(key, options))
+
+    context = await browser.new_context(**options)
+    if HAR_MODE == HAR_MODE_REPLAY:
+        await context.route_from_har(_replay_path(key), not_found='abort')
+    return context
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+HTML 파서 선택
+모든 BeautifulSoup 생성은 make_soup()을 거칩니다. lxml이 설치되어 있으면 lxml 트리 빌더를,
+없으면 표준 html.parser를 사용합니다. 선택자/탐색 API는 BeautifulSoup 그대로라서
+호출하는 쪽 코드는 바뀌지 않습니다.
+
+환경변수 SCRAPER_HTML_PARSER=html.parser|lxml 로 강제할 수 있습니다.
+"""
+
+import os
+import sys
+from bs4 import BeautifulSoup
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_PARSER = 'html.parser'
+SUPPORTED_PARSERS = ['lxml', 'html.parser']  # 우선순위 순
+
+
+def is_parser_available(parser):
+    """BeautifulSoup에서 해당 트리 빌더를 사용할 수 있는지 확인합니다."""
+    if parser == DEFAULT_PARSER:
+        return True
+    try:
+        BeautifulSoup('<p></p>', parser)
+        return True
+    except Exception:
+        return False
+
+
+def select_parser():
+    """환경변수 지정값 또는 설치된 파서 중 가장 빠른 것을 고릅니다."""
+    requested = os.getenv('SCRAPER_HTML_PARSER')
+    if requested:
+        if requested in SUPPORTED_PARSERS and is_parser_available(requested):
+            return requested
+        logger.warning(f"⚠️ HTML 파서 '{requested}'를 사용할 수 없어 자동 선택합니다.")
+
+    for parser in SUPPORTED_PARSERS:
+        if is_parser_available(parser):
+            return parser
+    return DEFAULT_PARSER
+
+
+PARSER = select_parser()
+logger.debug(f"🧩 HTML 파서: {PARSER}")
+
+
+def make_soup(html_content, parser=None):
+    """
+    HTML 문자열로 BeautifulSoup 객체를 만듭니다.
+
+    Args:
+        html_content: HTML 문자열
+        parser: 사용할 트리 빌더 (None이면 자동 선택된 PARSER)
+    """
+    return BeautifulSoup(html_content, parser or PARSER)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Playwright 요청 라우팅 필터
+스크래퍼가 읽지 않는 이미지, 동영상, 폰트 등의 요청을 page.route 단계에서 차단합니다.
+리소스 타입별/도메인별 허용·차단 목록을 스크래퍼마다 정책으로 정의하고,
+페이지마다 차단 건수와 절약한 바이트(추정치)를 기록합니다.
+"""
+
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# 환경변수: SCRAPER_ROUTE_FILTER=0 이면 필터 비활성화,
+# SCRAPER_ROUTE_DRY_RUN=1 이면 차단하지 않고 실제 크기만 측정
+ROUTE_FILTER_ENABLED = os.getenv('SCRAPER_ROUTE_FILTER', '1') != '0'
+ROUTE_FILTER_DRY_RUN = os.getenv('SCRAPER_ROUTE_DRY_RUN', '0') == '1'
+
+# 차단된 요청의 크기 추정치 (바이트). 드라이런으로 실측하면 평균값으로 대체됩니다.
+DEFAULT_RESOURCE_SIZES = {
+    'image': 40 * 1024,
+    'media': 1024 * 1024,
+    'font': 60 * 1024,
+    'stylesheet': 30 * 1024,
+    'other': 10 * 1024
+}
+
+# 광고/분석 도메인 (모든 스크래퍼에서 불필요)
+TRACKING_DOMAINS = [
+    'doubleclick.net',
+    'googlesyndication.com',
+    'google-analytics.com',
+    'googletagmanager.com',
+    'analytics.tiktok.com',
+    'mon.tiktokv.com'
+]
+
+# 스크래퍼별 정책
+ROUTE_POLICIES = {
+    'tiktok': {
+        'block_resource_types': ['image', 'media', 'font'],
+        'block_domains': TRACKING_DOMAINS
+    },
+    'youtube': {
+        'block_resource_types': ['image', 'media', 'font'],
+        'block_domains': TRACKING_DOMAINS
+    },
+    'creative_center': {
+        'block_resource_types': ['image', 'media', 'font'],
+        'block_domains': TRACKING_DOMAINS
+    },
+    'youtube_charts': {
+        # CSV 다운로드 버튼이 아이콘 폰트/이미지에 의존하지 않으므로 동일하게 차단
+        'block_resource_types': ['image', 'media', 'font'],
+        'block_domains': TRACKING_DOMAINS
+    }
+}
+
+# 리소스 타입별 URL 패턴. 영구 프로필(HTTP 디스크 캐시)을 쓰는 페이지는 page.route를 설치하면
+# 캐시가 꺼지므로, 대신 CDP Network.setBlockedURLs로 이 패턴들을 차단합니다.
+RESOURCE_TYPE_URL_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.ico*'],
+    'media': ['*.mp4*', '*.webm*', '*.m4a*', '*.mp3*', '*googlevideo.com/videoplayback*', '*/video/tos/*'],
+    'font': ['*.woff*', '*.ttf*', '*.otf*']
+}
+
+
+def _domain_matches(host, domains):
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class RoutePolicy:
+    """리소스 타입/도메인 기준으로 요청 차단 여부를 결정합니다."""
+
+    def __init__(self, name, block_resource_types=(), block_domains=(), allow_domains=(), dry_run=False):
+        self.name = name
+        self.block_resource_types = set(block_resource_types)
+        self.block_domains = list(block_domains)
+        self.allow_domains = list(allow_domains)
+        self.dry_run = dry_run
+
+    def should_block(self, resource_type, url):
+        host = (urlparse(url).hostname or '').lower()
+        if _domain_matches(host, self.allow_domains):
+            return False
+        if _domain_matches(host, self.block_domains):
+            return True
+        return resource_type in self.block_resource_types
+
+
+class RouteStats:
+    """페이지 하나의 차단 통계"""
+
+    def __init__(self, policy_name):
+        self.policy_name = policy_name
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type = {}
+        self.bytes_saved = 0
+        self.measured = False  # 드라이런으로 실측한 값인지 여부
+        self.cache_hits = 0
+        self.bytes_transferred = 0
+        self.tracks_transfer = False  # CDP로 실제 전송량을 측정했는지 여부
+        self.started = time.time()
+        self.finished = False
+
+    def record_blocked(self, resource_type, size):
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.bytes_saved += size
+
+
+# 스크래퍼(정책)별 누적 통계 및 드라이런 실측 크기
+_totals = {}
+_observed_sizes = {}
+
+
+def get_policy(name, dry_run=None):
+    """이름으로 정책을 생성합니다. 정의되지 않은 이름이면 None."""
+    config = ROUTE_POLICIES.get(name)
+    if config is None:
+        return None
+    return RoutePolicy(name, dry_run=ROUTE_FILTER_DRY_RUN if dry_run is None else dry_run, **config)
+
+
+def estimate_size(resource_type):
+    """리소스 타입의 평균 크기 추정치를 반환합니다 (실측값 우선)."""
+    observed = _observed_sizes.get(resource_type)
+    if observed and observed[1] > 0:
+        return observed[0] // observed[1]
+    return DEFAULT_RESOURCE_SIZES.get(resource_type, DEFAULT_RESOURCE_SIZES['other'])
+
+
+def _record_observed(resource_type, size):
+    total, count = _observed_sizes.get(resource_type, (0, 0))
+    _observed_sizes[resource_type] = (total + size, count + 1)
+
+
+def _add_to_totals(stats):
+    totals = _totals.setdefault(stats.policy_name, {
+        'pages': 0, 'allowed_requests': 0, 'blocked_requests': 0, 'bytes_saved': 0, 'page_seconds': 0.0,
+        'transfer_pages': 0, 'cache_hits': 0, 'bytes_transferred': 0
+    })
+    totals['pages'] += 1
+    totals['page_seconds'] += time.time() - stats.started
+    totals['allowed_requests'] += stats.allowed_requests
+    totals['blocked_requests'] += stats.blocked_requests
+    totals['bytes_saved'] += stats.bytes_saved
+    if stats.tracks_transfer:
+        totals['transfer_pages'] += 1
+        totals['cache_hits'] += stats.cache_hits
+        totals['bytes_transferred'] += stats.bytes_transferred
+
+
+def install_route_policy(target, policy_name, page=None):
+    """
+    page 또는 context에 라우팅 정책을 설치합니다 (sync API).
+
+    Args:
+        target: Page 또는 BrowserContext
+        policy_name: ROUTE_POLICIES의 키
+        page: 통계를 페이지 종료 시점에 집계할 Page (target이 Page면 생략 가능)
+
+    Returns:
+        RouteStats 또는 None (필터 비활성화/정책 없음)
+    """
+    policy = get_policy(policy_name)
+    if not ROUTE_FILTER_ENABLED or policy is None:
+        return None
+
+    stats = RouteStats(policy_name)
+
+    def handle(route):
+        request = route.request
+        if not policy.should_block(request.resource_type, request.url):
+            stats.allowed_requests += 1
+            route.fallback()  # 컨텍스트 라우트(HAR 재생 등)가 있으면 그쪽으로 넘김
+            return
+
+        if policy.dry_run:
+            # 차단 대상이지만 실제로 받아서 크기를 측정
+            response = route.fetch()
+            size = len(response.body())
+            _record_observed(request.resource_type, size)
+            stats.measured = True
+            stats.record_blocked(request.resource_type, size)
+            route.fulfill(response=response)
+        else:
+            stats.record_blocked(request.resource_type, estimate_size(request.resource_type))
+            route.abort()
+
+    target.route("**/*", handle)
+    (page or target).once('close', lambda _: finish_page_stats(stats))
+    return stats
+
+
+def blocked_url_patterns(policy):
+    """정책을 CDP Network.setBlockedURLs용 URL 패턴 목록으로 변환합니다 (allow_domains는 지원하지 않음)."""
+    patterns = []
+    for domain in policy.block_domains:
+        patterns.extend([f"*://{domain}/*", f"*://*.{domain}/*"])
+    for resource_type in sorted(policy.block_resource_types):
+        patterns.extend(RESOURCE_TYPE_URL_PATTERNS.get(resource_type, []))
+    return patterns
+
+
+def install_blocklist_policy(page, policy_name):
+    """
+    page.route 대신 CDP 차단 목록으로 정책을 적용합니다 (sync API, Chromium 전용).
+    라우팅을 쓰지 않으므로 영구 프로필의 HTTP 디스크 캐시가 그대로 동작하며,
+    캐시 히트 수와 실제 네트워크 전송량도 함께 기록합니다.
+
+    Returns:
+        RouteStats 또는 None (필터 비활성화/정책 없음)
+    """
+    policy = get_policy(policy_name, dry_run=False)
+    if not ROUTE_FILTER_ENABLED or policy is None:
+        return None
+
+    stats = RouteStats(policy_name)
+    stats.tracks_transfer = True
+    cdp = page.context.new_cdp_session(page)
+
+    def on_finished(params):
+        stats.allowed_requests += 1
+        stats.bytes_transferred += int(params.get('encodedDataLength', 0))
+
+    def on_cache_hit(params):
+        stats.cache_hits += 1
+
+    def on_failed(params):
+        if params.get('blockedReason'):
+            resource_type = params.get('type', 'Other').lower()
+            stats.record_blocked(resource_type, estimate_size(resource_type))
+
+    cdp.on('Network.loadingFinished', on_finished)
+    cdp.on('Network.requestServedFromCache', on_cache_hit)
+    cdp.on('Network.loadingFailed', on_failed)
+    cdp.send('Network.enable')
+    cdp.send('Network.setBlockedURLs', {'urls': blocked_url_patterns(policy)})
+    page.once('close', lambda _: finish_page_stats(stats))
+    return stats
+
+
+async def install_route_policy_async(target, policy_name, page=None):
+    """install_route_policy의 async API 버전"""
+    policy = get_policy(policy_name)
+    if not ROUTE_FILTER_ENABLED or policy is None:
+        return None
+
+    stats = RouteStats(policy_name)
+
+    async def handle(route):
+        request = route.request
+        if not policy.should_block(request.resource_type, request.url):
+            stats.allowed_requests += 1
+            await route.fallback()
+            return
+
+        if policy.dry_run:
+            response = await route.fetch()
+            size = len(await response.body())
+            _record_observed(request.resource_type, size)
+            stats.measured = True
+            stats.record_blocked(request.resource_type, size)
+            await route.fulfill(response=response)
+        else:
+            stats.record_blocked(request.resource_type, estimate_size(request.resource_type))
+            await route.abort()
+
+    await target.route("**/*", handle)
+    (page or target).once('close', lambda _: finish_page_stats(stats))
+    return stats
+
+
+def finish_page_stats(stats):
+    """페이지 종료 시 통계를 로그로 남기고 스크래퍼별 누적값에 더합니다 (한 번만 집계)."""
+    if stats is None or stats.finished:
+        return
+    stats.finished = True
+    _add_to_totals(stats)
+    if stats.blocked_requests:
+        label = "실측" if stats.measured else "추정"
+        logger.debug(f"🚫 [{stats.policy_name}] 요청 {stats.blocked_requests}건 차단 "
+                     f"{stats.blocked_by_type}, 절약 {stats.bytes_saved / 1024:.0f}KB ({label})")
+
+
+def get_bandwidth_report():
+    """스크래퍼(정책)별 누적 차단 통계를 반환합니다."""
+    return {name: dict(totals) for name, totals in _totals.items()}
+
+
+def log_bandwidth_summary():
+    """스크래퍼별 차단 요청 수와 절약 바이트를 로그로 남깁니다."""
+    for name, totals in _totals.items():
+        if totals['pages'] == 0:
+            continue
+        per_page = totals['bytes_saved'] / totals['pages'] / 1024
+        avg_seconds = totals['page_seconds'] / totals['pages']
+        logger.info(f"🚫 [{name}] 페이지 {totals['pages']}개, 차단 {totals['blocked_requests']}건, "
+                    f"절약 {totals['bytes_saved'] / (1024 * 1024):.1f}MB (페이지당 {per_page:.0f}KB), "
+                    f"페이지당 평균 {avg_seconds:.1f}초")
+        if totals.get('transfer_pages'):
+            transferred_per_page = totals['bytes_transferred'] / totals['transfer_pages'] / 1024
+            logger.info(f"💽 [{name}] 캐시 히트 {totals['cache_hits']}건, 네트워크 전송 "
+                        f"{totals['bytes_transferred'] / (1024 * 1024):.1f}MB (페이지당 {transferred_per_page:.0f}KB)")
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+TikTok 사운드 페이지 구조화 데이터 추출기
+렌더링된 HTML 대신 페이지가 받아오는 XHR JSON 응답(music detail, item list)과
+내장된 rehydration <script> JSON에서 비디오 개수와 비디오 설명(해시태그)을 읽습니다.
+파싱 함수는 모두 순수 함수라서 저장해 둔 JSON 응답으로 그대로 재현할 수 있습니다.
+"""
+
+import re
+import os
+import sys
+import json
+from collections import Counter
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# 사운드 페이지가 호출하는 API 경로
+MUSIC_DETAIL_PATTERN = re.compile(r'/api/music/detail/')
+ITEM_LIST_PATTERN = re.compile(r'/api/music/item_list/')
+
+# 페이지에 내장된 rehydration 스크립트 ID (신규 / 구버전)
+REHYDRATION_SCRIPT_IDS = ['__UNIVERSAL_DATA_FOR_REHYDRATION__', 'SIGI_STATE']
+REHYDRATION_SCRIPT_PATTERN = re.compile(
+    r'<script[^>]+id="(?:__UNIVERSAL_DATA_FOR_REHYDRATION__|SIGI_STATE)"[^>]*>(.*?)</script>',
+    re.DOTALL
+)
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+EXCLUDED_HASHTAGS = {'fyp'}
+
+
+def _find_key(data, key):
+    """중첩된 dict/list에서 key의 첫 번째 값을 찾습니다."""
+    if isinstance(data, dict):
+        if key in data:
+            return data[key]
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+
+    for value in values:
+        found = _find_key(value, key)
+        if found is not None:
+            return found
+    return None
+
+
+def parse_rehydration_html(html_content):
+    """HTML 원문에서 rehydration 스크립트 JSON을 추출합니다. 없으면 None."""
+    match = REHYDRATION_SCRIPT_PATTERN.search(html_content or '')
+    if not match:
+        return None
+    return parse_rehydration_text(match.group(1))
+
+
+def parse_rehydration_text(script_text):
+    """rehydration 스크립트 본문을 JSON으로 파싱합니다. 실패하면 None."""
+    if not script_text:
+        return None
+    try:
+        return json.loads(script_text)
+    except (ValueError, TypeError):
+        logger.debug("rehydration JSON 파싱 실패")
+        return None
+
+
+def video_count_from_music_info(music_info):
+    """musicInfo 객체(API 응답/rehydration 공통)에서 비디오 개수를 읽습니다."""
+    if not isinstance(music_info, dict):
+        return None
+    stats = music_info.get('stats') or {}
+    count = stats.get('videoCount')
+    if count is None:
+        count = (music_info.get('music') or {}).get('videoCount')
+    try:
+        return int(count) if count is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def video_count_from_rehydration(data):
+    """rehydration JSON에서 비디오 개수를 읽습니다."""
+    if not isinstance(data, dict):
+        return None
+
+    # 신규 구조: __DEFAULT_SCOPE__ → webapp.music-detail → musicInfo
+    scope = data.get('__DEFAULT_SCOPE__') or {}
+    music_detail = scope.get('webapp.music-detail') or {}
+    count = video_count_from_music_info(music_detail.get('musicInfo'))
+    if count is not None:
+        return count
+
+    # 구버전(SIGI_STATE): MusicModule → {음악 ID: 음악 정보(stats 포함)}
+    music_module = data.get('MusicModule')
+    if isinstance(music_module, dict):
+        for music in music_module.values():
+            count = video_count_from_music_info(music)
+            if count is not None:
+                return count
+
+    # 그 밖의 구조는 musicInfo를 찾아서 읽음.
+    # 아무 videoCount나 찾지는 않음: 작성자/사용자 통계의 videoCount를 사운드 개수로 저장하게 되므로
+    # 찾지 못하면 None을 반환해 HTML 파싱이 처리하도록 함
+    return video_count_from_music_info(_find_key(data, 'musicInfo'))
+
+
+def video_count_from_music_detail(payload):
+    """/api/music/detail/ 응답에서 비디오 개수를 읽습니다."""
+    if not isinstance(payload, dict):
+        return None
+    return video_count_from_music_info(payload.get('musicInfo'))
+
+
+def items_from_item_list(payload):
+    """/api/music/item_list/ 응답에서 비디오 목록을 꺼냅니다."""
+    if not isinstance(payload, dict):
+        return []
+    return payload.get('itemList') or payload.get('items') or []
+
+
+def items_from_rehydration(data):
+    """rehydration JSON에 포함된 첫 페이지 비디오 목록을 꺼냅니다 (있는 경우)."""
+    if not isinstance(data, dict):
+        return []
+    item_module = data.get('ItemModule')  # SIGI_STATE 구조
+    if isinstance(item_module, dict):
+        return list(item_module.values())
+    items = _find_key(data, 'itemList')
+    return items if isinstance(items, list) else []
+
+
+def hashtags_from_item(item):
+    """비디오 하나의 해시태그 집합을 반환합니다 (한 비디오에서는 한 번만 셈)."""
+    hashtags = set()
+
+    for extra in item.get('textExtra') or []:
+        name = extra.get('hashtagName')
+        if name:
+            hashtags.add(name)
+
+    for challenge in item.get('challenges') or []:
+        title = challenge.get('title')
+        if title:
+            hashtags.add(title)
+
+    for hashtag in HASHTAG_PATTERN.findall(item.get('desc') or ''):
+        if len(hashtag) > 1:
+            hashtags.add(hashtag)
+
+    return {tag for tag in hashtags if tag.lower() not in EXCLUDED_HASHTAGS}
+
+
+def count_hashtags(items):
+    """비디오 목록의 해시태그 빈도수를 계산합니다 (같은 비디오는 id로 중복 제거)."""
+    hashtag_counter = Counter()
+    seen_ids = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get('id')
+        if item_id is not None:
+            if item_id in seen_ids:
+                continue
+            seen_ids.add(item_id)
+        hashtag_counter.update(hashtags_from_item(item))
+    return hashtag_counter
+
+
+def build_sound_result(music_detail_payloads=(), item_list_payloads=(), rehydration_data=None):
+    """
+    수집한 JSON 데이터로 scrape_tiktok_sound_data와 같은 형태의 결과를 만듭니다.
+
+    Returns:
+        dict: {'video_count': int or None, 'top_hashtags': [...], 'item_count': int}
+              video_count가 None이면 구조화 데이터에서 개수를 찾지 못한 것입니다.
+    """
+    video_count = None
+    for payload in music_detail_payloads:
+        video_count = video_count_from_music_detail(payload)
+        if video_count is not None:
+            break
+    if video_count is None and rehydration_data is not None:
+        video_count = video_count_from_rehydration(rehydration_data)
+
+    items = list(items_from_rehydration(rehydration_data))
+    for payload in item_list_payloads:
+        items.extend(items_from_item_list(payload))
+
+    return {
+        'video_count': video_count,
+        'top_hashtags': count_hashtags(items).most_common(10),
+        'item_count': len(items)
+    }
+
+
+def result_from_snapshot(bundle):
+    """TikTokResponseCollector.to_snapshot()으로 저장한 데이터로 결과를 다시 만듭니다."""
+    return build_sound_result(bundle.get('music_detail') or [], bundle.get('item_list') or [],
+                              bundle.get('rehydration'))
+
+
+class TikTokResponseCollector:
+    """page.on('response')로 사운드 페이지의 API JSON 응답을 모읍니다."""
+
+    def __init__(self):
+        self.music_detail_payloads = []
+        self.item_list_payloads = []
+        self.rehydration_data = None
+
+    def attach(self, page):
+        page.on('response', self._on_response)
+        return self
+
+    def attach_async(self, page):
+        """playwright.async_api 페이지용 attach (response.json()이 코루틴)"""
+        page.on('response', self._on_response_async)
+        return self
+
+    def _target_for(self, url):
+        if MUSIC_DETAIL_PATTERN.search(url):
+            return self.music_detail_payloads
+        if ITEM_LIST_PATTERN.search(url):
+            return self.item_list_payloads
+        return None
+
+    def _on_response(self, response):
+        target = self._target_for(response.url)
+        if target is None:
+            return
+        try:
+            target.append(response.json())
+        except Exception as e:
+            logger.debug(f"JSON 응답 파싱 실패 ({response.url}): {e}")
+
+    async def _on_response_async(self, response):
+        target = self._target_for(response.url)
+        if target is None:
+            return
+        try:
+            target.append(await response.json())
+        except Exception as e:
+            logger.debug(f"JSON 응답 파싱 실패 ({response.url}): {e}")
+
+    def to_snapshot(self):
+        """스냅샷 저장용: 결과를 만드는 데 쓴 JSON 원본 묶음"""
+        return {
+            'music_detail': self.music_detail_payloads,
+            'item_list': self.item_list_payloads,
+            'rehydration': self.rehydration_data
+        }
+
+    @staticmethod
+    def is_item_list_response(response):
+        return bool(ITEM_LIST_PATTERN.search(response.url))
@@ -1,18 +1,39 @@
 # tiktok_music_scraper.py (modified for database integration)
 
+import re
 import json
 import time
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.database import database_manager as db
 from src.utils.logger_config import get_logger, log_scraper_start, log_scraper_end, log_database_operation, log_error_with_context
+from src.scrapers.request_filter import install_route_policy, finish_page_stats, log_bandwidth_summary
+from src.scrapers.har_replay import new_context, is_har_active
+from src.scrapers.wait_strategies import wait_for_dom_quiet, wait_for_selector_count, wait_for_network_quiet, log_wait_summary
 
 # 로거 설정
 logger = get_logger(__name__)
 
+# 수집 모드: 'api' (차트 목록 JSON 직접 요청) 또는 'dom' (탭 클릭 + View More)
+DEFAULT_SCRAPE_MODE = os.getenv('CREATIVE_CENTER_MODE', 'api')
+
+# Creative Center가 차트 목록을 받아오는 JSON 엔드포인트
+CHART_API_PATTERN = re.compile(r'creative_radar_api/v1/popular_trend/sound/rank_list')
+CHART_RANK_TYPES = {
+    "popular": "popular",
+    "breakout": "surging"
+}
+# DOM 모드에서 각자 별도 컨텍스트로 동시에 수집하는 탭 (카테고리: 탭 이름)
+CREATIVE_CENTER_TABS = {
+    "breakout": "Breakout",
+    "popular": "Popular"
+}
+CHART_API_PAGE_SIZE = 50  # 화면은 한 번에 20개씩 보여주지만 API는 더 큰 limit을 허용
+CHART_API_MAX_PAGES = 20
+
 def parse_track_data(track_string):
     """
     Parses a track string (e.g., "Title - Artist") into title and artist.
@@ -24,159 +45,456 @@ def parse_track_data(track_string):
         # If no clear " - " separator, assume the whole string is the title
         return {"title": track_string.strip(), "artist": "Unknown"}
 
-def extract_tiktok_sound_id(item_tag):
-    """
-    Extract TikTok Sound ID from music item HTML.
-    """
-    # Method 1: Extract from href attribute
-    link_tag = item_tag.select_one("a[href*='/song/']")
-    if link_tag:
-        href = link_tag.get('href', '')
-        if '/song/' in href:
-            # Extract ID from URL pattern: /song/Title-SOUNDID
-            parts = href.split('-')
-            if parts:
-                sound_id = parts[-1].split('?')[0]  # Remove query parameters
-                if sound_id.isdigit() and len(sound_id) > 15:  # TikTok Sound IDs are long numbers
-                    return sound_id
-    
-    # Method 2: Extract from chart element ID
-    chart_element = item_tag.select_one("div[id*='-']")
-    if chart_element:
-        element_id = chart_element.get('id', '')
-        if '-' in element_id:
-            parts = element_id.split('-')
-            if len(parts) >= 2:
-                sound_id = parts[-1]
-                if sound_id.isdigit() and len(sound_id) > 15:
-                    return sound_id
-    
+def sound_id_from_href(href):
+    """
+    Extract TikTok Sound ID from a song link (/song/Title-SOUNDID).
+    """
+    if href and '/song/' in href:
+        parts = href.split('-')
+        if parts:
+            sound_id = parts[-1].split('?')[0]  # Remove query parameters
+            if sound_id.isdigit() and len(sound_id) > 15:  # TikTok Sound IDs are long numbers
+                return sound_id
     return None
 
-def scrape_tab_data(page, tab_name):
+def sound_id_from_element_id(element_id):
     """
-    Scrapes music data from a given tab, handling "View More" pagination.
+    Extract TikTok Sound ID from a chart element ID (e.g. chart-SOUNDID).
     """
-    scraped_data = []
-    seen_tracks = set() # To avoid duplicate entries if "View More" loads existing items
+    if element_id and '-' in element_id:
+        parts = element_id.split('-')
+        if len(parts) >= 2:
+            sound_id = parts[-1]
+            if sound_id.isdigit() and len(sound_id) > 15:
+                return sound_id
+    return None
 
-    logger.info(f"📊 '{tab_name}' 탭 데이터 스크래핑 시작...")
+MUSIC_CARD_CLASS = "ItemCard_soundItemContainer__GUmFb"
+MUSIC_CARD_SELECTOR = f"div.{MUSIC_CARD_CLASS}"
+
+# 이전 호출에서 읽은 카드 수(cursor) 이후의 카드만 plain dict로 반환합니다.
+# 라이브 HTMLCollection을 인덱스로 읽으므로 페이지마다 전체 카드를 다시 훑지 않습니다.
+# 목록이 다시 그려져 카드 수가 cursor보다 줄었으면 처음부터 읽습니다 (중복은 호출자가 제거).
+EXTRACT_NEW_CARDS_SCRIPT = """
+([className, cursor]) => {
+    const text = (card, sel) => {
+        const el = card.querySelector(sel);
+        return el ? el.textContent.trim() : null;
+    };
+    const items = document.getElementsByClassName(className);
+    const total = items.length;
+    const cards = [];
+    for (let i = cursor <= total ? cursor : 0; i < total; i++) {
+        const card = items[i];
+        const link = card.querySelector("a[href*='/song/']");
+        const chart = card.querySelector("div[id*='-']");
+        const approved = text(card, "div.FeatureText_container__hy_dH");
+        cards.push({
+            rank: text(card, "span.RankingStatus_rankingIndex__ZMDrH"),
+            title: text(card, "span.ItemCard_musicName__2znhM"),
+            artist: text(card, "span.ItemCard_autherName__gdrue"),
+            approved: !!approved && approved.includes("Approved for business use"),
+            href: link ? link.getAttribute("href") : null,
+            element_id: chart ? chart.id : null
+        });
+    }
+    return {cards: cards, cursor: total};
+}
+"""
+
+def parse_card_dict(card, fallback_rank):
+    """
+    Converts a card dict returned by EXTRACT_NEW_CARDS_SCRIPT into a scraped item.
+    """
+    try:
+        rank = int(card.get('rank')) if card.get('rank') else fallback_rank
+    except ValueError:
+        rank = fallback_rank
+
+    return {
+        "rank": rank,
+        "title": card.get('title') or "Unknown Title",
+        "artist": card.get('artist') or "Unknown Artist",
+        "is_approved_for_business_use": bool(card.get('approved')),
+        "tiktok_id": sound_id_from_href(card.get('href')) or sound_id_from_element_id(card.get('element_id'))
+    }
+
+def extract_new_cards(page, cursor=0):
+    """
+    Returns the cards after index `cursor` (plain dicts, no full-page HTML) and the next cursor.
+    """
+    result = page.evaluate(EXTRACT_NEW_CARDS_SCRIPT, [MUSIC_CARD_CLASS, cursor])
+    return result['cards'], result['cursor']
+
+class TabScraper:
+    """
+    Paginates one chart tab in small steps so several tabs can be interleaved.
+
+    collect() reads newly added cards, load_more() clicks "View More" without waiting,
+    and wait_loaded() waits for the new cards. While one tab waits, the other tabs'
+    pages keep loading in the browser, so interleaving overlaps their network time.
+    """
+
+    def __init__(self, page, tab_name, on_song=None):
+        self.page = page
+        self.tab_name = tab_name
+        self.on_song = on_song  # 새 곡을 읽을 때마다 호출 (스트리밍 수집용)
+        self.scraped_data = []
+        self.seen_tracks = set() # To avoid duplicate entries if "View More" loads existing items
+        self.cursor = 0  # 이미 읽은 카드 수 (다음 호출은 이 인덱스부터 읽음)
+        self.finished = False
+
+    def collect(self):
+        """
+        Reads cards added since the previous call. Returns False when the list has ended.
+        """
+        page = self.page
+        tab_name = self.tab_name
 
-    while True:
         # Scroll to the bottom of the page to load more content
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(2000) # Give time for new content to load after scrolling
+        # Give time for new content to load after scrolling (DOM이 잠잠해지면 바로 진행)
+        wait_for_dom_quiet(page, quiet_ms=500, cap_ms=2000, legacy_ms=2000, label=f"{tab_name} 스크롤")
 
         # Wait for the music list items to be present
         try:
-            page.wait_for_selector("div.ItemCard_soundItemContainer__GUmFb", timeout=10000)
+            page.wait_for_selector(MUSIC_CARD_SELECTOR, timeout=10000)
         except Exception as e:
             logger.warning(f"⚠️ '{tab_name}' 탭에서 음악 항목을 찾을 수 없거나 타임아웃 발생: {e}")
-            break
+            return False
+
+        new_cards, self.cursor = extract_new_cards(page, self.cursor)
+        current_scraped_count = len(self.scraped_data)
+
+        for card in new_cards:
+            item = parse_card_dict(card, len(self.scraped_data) + 1)
+            unique_key = f"{item['title']}-{item['artist']}"
+            if unique_key not in self.seen_tracks:
+                self.scraped_data.append(item)
+                self.seen_tracks.add(unique_key)
+                if self.on_song:
+                    self.on_song(item)
+
+        logger.debug(f"🧩 '{tab_name}' 탭 신규 카드 {len(new_cards)}개 읽음 (누적 {len(self.scraped_data)}개)")
 
-        html_content = page.content()
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if len(self.scraped_data) == current_scraped_count and not page.query_selector("button.view-more-button"):
+            logger.info(f"📄 '{tab_name}' 탭에서 새로운 항목이 없음. 리스트 끝으로 판단.")
+            return False
+        return True
 
-        music_items = soup.select("div.ItemCard_soundItemContainer__GUmFb")
+    def load_more(self):
+        """
+        Clicks "View More" without waiting for the result. Returns False if there is no button.
+        """
+        view_more_button_selector = "text=\"View More\""
+        view_more_button = self.page.query_selector(view_more_button_selector)
 
-        new_items_found = False
-        current_scraped_count = len(scraped_data)
+        if view_more_button and view_more_button.is_visible() and view_more_button.is_enabled():
+            logger.debug(f"🔄 '{self.tab_name}' 탭에서 'View More' 버튼 클릭...")
+            view_more_button.click()
+            return True
 
-        for i, item_tag in enumerate(music_items):
-            rank_tag = item_tag.select_one("span.RankingStatus_rankingIndex__ZMDrH")
-            title_tag = item_tag.select_one("span.ItemCard_musicName__2znhM")
-            artist_tag = item_tag.select_one("span.ItemCard_autherName__gdrue")
+        logger.debug(f"🔚 '{self.tab_name}' 탭에서 더 이상 'View More' 버튼 없음.")
+        return False
 
-            rank = int(rank_tag.get_text().strip()) if rank_tag else (len(scraped_data) + 1)
-            title = title_tag.get_text().strip() if title_tag else "Unknown Title"
-            artist = artist_tag.get_text().strip() if artist_tag else "Unknown Artist"
+    def wait_loaded(self):
+        # 새 카드가 추가되는 즉시 진행
+        wait_for_selector_count(self.page, MUSIC_CARD_SELECTOR, self.cursor + 1,
+                                cap_ms=5000, legacy_ms=2000, label=f"{self.tab_name} View More")
+
+    def step(self):
+        """
+        Reads new cards and requests the next batch. Returns False once the tab is done.
+        """
+        if not self.finished and not (self.collect() and self.load_more()):
+            self.finished = True
+            logger.info(f"✅ '{self.tab_name}' 탭 스크래핑 완료: {len(self.scraped_data)}개 항목")
+        return not self.finished
+
+def scrape_tab_data(page, tab_name):
+    """
+    Scrapes music data from a given tab, handling "View More" pagination.
+    Each pass only reads cards that were added since the previous pass.
+    """
+    logger.info(f"📊 '{tab_name}' 탭 데이터 스크래핑 시작...")
+    scraper = TabScraper(page, tab_name)
+    while scraper.step():
+        scraper.wait_loaded()
+    return scraper.scraped_data
+
+def start_chart_tab(context, target_url):
+    """
+    Starts loading the Creative Center in its own context without waiting for it to finish.
+    """
+    page = context.new_page()
+    route_stats = install_route_policy(page, 'creative_center')
+    page.goto(target_url, wait_until="commit")
+    return page, route_stats
+
+def select_chart_tab(page, tab_name):
+    """
+    Waits for the page started by start_chart_tab and switches to the given tab.
+    """
+    page.wait_for_load_state("networkidle")
+    # 기존 고정 10초 대기는 차트 목록 API(rank_list) 응답을 기다리던 것이므로 그 요청이 잠잠해지면 진행
+    wait_for_network_quiet(page, CHART_API_PATTERN, quiet_ms=1000, cap_ms=10000, legacy_ms=10000,
+                           label=f"{tab_name} 초기 로딩")
+
+    tab_selector = f"span.ContentTab_itemLabelText__hiCCd:has-text(\"{tab_name}\")"
+    logger.info(f"🔄 '{tab_name}' 탭 클릭 중...")
+    page.wait_for_selector(tab_selector, timeout=10000)
+    page.locator(tab_selector).click(timeout=10000)
+    page.wait_for_selector(MUSIC_CARD_SELECTOR, timeout=30000)
+
+def scrape_tabs_interleaved(scrapers):
+    """
+    Steps every tab in round-robin: all tabs click "View More" first, then each waits,
+    so the total time follows the slowest tab instead of the sum of all tabs.
+    """
+    active = list(scrapers.items())
+    while active:
+        still_active = []
+        for category, scraper in active:
+            try:
+                if scraper.step():
+                    still_active.append((category, scraper))
+            except Exception as e:
+                log_error_with_context(logger, e, f"{scraper.tab_name} 탭 처리")
+                scraper.finished = True
+
+        for category, scraper in still_active:
+            try:
+                scraper.wait_loaded()
+            except Exception as e:
+                log_error_with_context(logger, e, f"{scraper.tab_name} 탭 처리")
+        active = still_active
+
+def parse_rank_list_payload(payload, fallback_rank_start=1):
+    """
+    Parses a rank_list JSON response into scraped items.
+
+    Returns:
+        tuple: (items, has_more)
+    """
+    if not isinstance(payload, dict) or payload.get('code') not in (0, None):
+        raise ValueError(f"rank_list 응답 오류: {payload.get('msg') if isinstance(payload, dict) else payload}")
+
+    data = payload.get('data') or {}
+    items = []
+    for offset, sound in enumerate(data.get('sound_list') or []):
+        fallback_rank = fallback_rank_start + offset
+        try:
+            rank = int(sound.get('rank') or fallback_rank)
+        except (ValueError, TypeError):
+            rank = fallback_rank
+
+        tiktok_id = str(sound.get('clip_id') or '') or None
+        if not tiktok_id or not tiktok_id.isdigit():
+            tiktok_id = sound_id_from_element_id((sound.get('link') or '').split('?')[0])
+
+        items.append({
+            "rank": rank,
+            "title": (sound.get('title') or "Unknown Title").strip(),
+            "artist": (sound.get('author') or "Unknown Artist").strip(),
+            # if_cml: Commercial Music Library 포함 여부 (= Approved for business use)
+            "is_approved_for_business_use": bool(sound.get('if_cml')),
+            "tiktok_id": tiktok_id
+        })
+
+    pagination = data.get('pagination') or {}
+    has_more = bool(pagination.get('has_more')) if 'has_more' in pagination else len(items) > 0
+    return items, has_more
+
+def build_rank_list_url(captured_url, rank_type, page_number, limit):
+    """
+    Rewrites the captured rank_list URL for a given chart type and page.
+    """
+    parsed = urlparse(captured_url)
+    query = dict(parse_qsl(parsed.query))
+    query.update(rank_type=rank_type, page=str(page_number), limit=str(limit))
+    return urlunparse(parsed._replace(query=urlencode(query)))
 
-            is_approved_for_business_use = False
-            approved_tag = item_tag.select_one("div.FeatureText_container__hy_dH")
-            if approved_tag and "Approved for business use" in approved_tag.get_text():
-                is_approved_for_business_use = True
+# 페이지 안에서 fetch: 브라우저 라우팅(HAR 재생 포함)을 거치며, 금지 헤더는 브라우저가 채움
+IN_PAGE_FETCH_SCRIPT = """
+async ([url, headers]) => {
+    const forbidden = /^(cookie|user-agent|referer|origin|accept-encoding|connection|sec-)/i;
+    const allowed = Object.fromEntries(Object.entries(headers).filter(([name]) => !forbidden.test(name)));
+    const response = await fetch(url, {headers: allowed, credentials: 'include'});
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return await response.json();
+}
+"""
 
-            # Extract TikTok Sound ID
-            tiktok_id = extract_tiktok_sound_id(item_tag)
-            
-            unique_key = f"{title}-{artist}"
+def get_json(page, url, headers):
+    """
+    GETs a JSON URL with the page's session. page.request bypasses page routes, so in
+    HAR record/replay mode the request is made from inside the page instead.
+    """
+    if is_har_active():
+        return page.evaluate(IN_PAGE_FETCH_SCRIPT, [url, headers])
+
+    response = page.request.get(url, headers=headers)
+    if not response.ok:
+        raise RuntimeError(f"rank_list 요청 실패: HTTP {response.status}")
+    return response.json()
+
+def fetch_chart_via_api(page, captured_request, rank_type, limit=CHART_API_PAGE_SIZE, max_pages=CHART_API_MAX_PAGES,
+                        on_song=None):
+    """
+    Pages through the rank_list endpoint with the page's own request context
+    (same cookies and signed headers as the captured request).
+    on_song(item) is called for each new item as soon as its page is parsed.
+    """
+    headers = {
+        name: value for name, value in captured_request['headers'].items()
+        if not name.startswith(':') and name.lower() not in ('content-length', 'host')
+    }
+    scraped_data = []
+    seen_tracks = set()
+
+    for page_number in range(1, max_pages + 1):
+        url = build_rank_list_url(captured_request['url'], rank_type, page_number, limit)
+        items, has_more = parse_rank_list_payload(get_json(page, url, headers), len(scraped_data) + 1)
+        for item in items:
+            unique_key = f"{item['title']}-{item['artist']}"
             if unique_key not in seen_tracks:
-                scraped_data.append({
-                    "rank": rank,
-                    "title": title,
-                    "artist": artist,
-                    "is_approved_for_business_use": is_approved_for_business_use,
-                    "tiktok_id": tiktok_id
-                })
+                scraped_data.append(item)
                 seen_tracks.add(unique_key)
-                new_items_found = True
+                if on_song:
+                    on_song(item)
 
-        if len(scraped_data) == current_scraped_count and not page.query_selector("button.view-more-button"):
-            logger.info(f"📄 '{tab_name}' 탭에서 새로운 항목이 없음. 리스트 끝으로 판단.")
+        logger.debug(f"📡 rank_list [{rank_type}] {page_number}페이지: {len(items)}개 (누적 {len(scraped_data)}개)")
+        if not has_more or not items:
             break
 
-        view_more_button_selector = "text=\"View More\""
-        view_more_button = page.query_selector(view_more_button_selector)
+    return scraped_data
 
-        if view_more_button and view_more_button.is_visible() and view_more_button.is_enabled():
-            logger.debug(f"🔄 '{tab_name}' 탭에서 'View More' 버튼 클릭...")
-            view_more_button.click()
-            page.wait_for_timeout(2000)
-        else:
-            logger.debug(f"🔚 '{tab_name}' 탭에서 더 이상 'View More' 버튼 없음.")
-            break
+def _category_callback(on_song, category):
+    """on_song(category, item)을 항목 하나만 받는 콜백으로 바꿉니다."""
+    return (lambda item: on_song(category, item)) if on_song else None
 
-    logger.info(f"✅ '{tab_name}' 탭 스크래핑 완료: {len(scraped_data)}개 항목")
-    return scraped_data
+def scrape_creative_center_api(target_url, on_song=None):
+    """
+    API mode: captures the chart-list request once, then pages through it as JSON (headless).
+    """
+    all_music_data = {
+        "popular": [],
+        "breakout": []
+    }
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = new_context(browser, 'creative_center_api')
+        page = context.new_page()
+        route_stats = install_route_policy(page, 'creative_center')
+
+        try:
+            logger.info(f"🌐 차트 API 요청 캡처 중: {target_url}")
+            with page.expect_response(lambda response: bool(CHART_API_PATTERN.search(response.url)),
+                                      timeout=30000) as response_info:
+                page.goto(target_url, wait_until="domcontentloaded")
+            request = response_info.value.request
+            captured_request = {'url': request.url, 'headers': request.all_headers()}
+            logger.info("✅ 차트 API 요청 캡처 완료. JSON 페이지 요청 시작.")
 
-def scrape_tiktok_creative_center():
+            for category, rank_type in CHART_RANK_TYPES.items():
+                all_music_data[category] = fetch_chart_via_api(page, captured_request, rank_type,
+                                                               on_song=_category_callback(on_song, category))
+                logger.info(f"✅ '{category}' 차트 API 수집 완료: {len(all_music_data[category])}개 항목")
+        finally:
+            finish_page_stats(route_stats)
+            context.close()
+            browser.close()
+
+    return all_music_data
+
+def scrape_creative_center_dom(target_url, on_song=None):
+    """
+    DOM mode: each tab (Breakout/Popular) gets its own browser context in one browser,
+    and the tabs' "View More" pagination is interleaved.
+    """
     all_music_data = {
         "popular": [],
         "breakout": []
     }
-    target_url = "https://ads.tiktok.com/business/creativecenter/inspiration/popular/music/pc/en"
-    start_time = time.time()
-    
-    log_scraper_start(logger, "TikTok Creative Center 스크래퍼", target_url)
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        contexts = []
+        pages = {}
+        scrapers = {}
+        route_stats = []
 
         try:
-            logger.info(f"🌐 페이지 로딩 중: {target_url}")
-            page.goto(target_url, wait_until="networkidle")
-            page.wait_for_timeout(10000)
-            logger.info("✅ 페이지 로딩 완료. 데이터 스크래핑 시작.")
+            # 모든 탭의 페이지 로딩을 먼저 시작해 초기 로딩 시간도 겹치게 함
+            logger.info(f"🌐 페이지 로딩 중: {target_url} ({len(CREATIVE_CENTER_TABS)}개 탭 동시)")
+            for category in CREATIVE_CENTER_TABS:
+                contexts.append(new_context(browser, f"creative_center_{category}"))
+                pages[category], stats = start_chart_tab(contexts[-1], target_url)
+                route_stats.append(stats)
 
-            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(2000)
+            for category, tab_name in CREATIVE_CENTER_TABS.items():
+                try:
+                    select_chart_tab(pages[category], tab_name)
+                    logger.info(f"📊 '{tab_name}' 탭 데이터 스크래핑 시작...")
+                    scrapers[category] = TabScraper(pages[category], tab_name,
+                                                    on_song=_category_callback(on_song, category))
+                except Exception as e:
+                    log_error_with_context(logger, e, f"{tab_name} 탭 처리")
 
-            breakout_tab_selector = "span.ContentTab_itemLabelText__hiCCd:has-text(\"Breakout\")"
-            try:
-                logger.info("🔄 'Breakout' 탭 클릭 중...")
-                page.wait_for_selector(breakout_tab_selector, timeout=10000)
-                page.locator(breakout_tab_selector).click(timeout=10000)
-                page.wait_for_selector("div.ItemCard_soundItemContainer__GUmFb", timeout=30000)
-                all_music_data["breakout"] = scrape_tab_data(page, "Breakout")
-            except Exception as e:
-                log_error_with_context(logger, e, "Breakout 탭 처리")
+            scrape_tabs_interleaved(scrapers)
 
-            popular_tab_selector = "span.ContentTab_itemLabelText__hiCCd:has-text(\"Popular\")"
-            try:
-                logger.info("🔄 'Popular' 탭 클릭 중...")
-                page.wait_for_selector(popular_tab_selector, timeout=10000)
-                page.locator(popular_tab_selector).click(timeout=10000)
-                page.wait_for_selector("div.ItemCard_soundItemContainer__GUmFb", timeout=30000)
-                all_music_data["popular"] = scrape_tab_data(page, "Popular")
-            except Exception as e:
-                log_error_with_context(logger, e, "Popular 탭 처리")
+            # 탭별 결과 병합
+            for category, scraper in scrapers.items():
+                all_music_data[category] = scraper.scraped_data
 
         except Exception as e:
             log_error_with_context(logger, e, "페이지 네비게이션 또는 초기 설정")
         finally:
+            for stats in route_stats:
+                finish_page_stats(stats)
+            for context in contexts:
+                context.close()
             browser.close()
 
+    return all_music_data
+
+def scrape_tiktok_creative_center(mode=None, on_song=None):
+    """
+    Scrapes the Popular/Breakout charts.
+
+    Args:
+        mode: 'api' (chart-list JSON, headless) or 'dom' (tab clicks). 기본값은 환경변수
+              CREATIVE_CENTER_MODE이며, API 모드가 실패하거나 비어 있으면 DOM 모드로 전환합니다.
+        on_song: 곡 하나를 읽을 때마다 on_song(category, item)으로 호출 (차트 전체를 기다리지 않는 스트리밍용).
+                 DOM 모드로 전환되면 같은 곡이 다시 전달될 수 있습니다.
+    """
+    mode = (mode or DEFAULT_SCRAPE_MODE).lower()
+    all_music_data = {
+        "popular": [],
+        "breakout": []
+    }
+    target_url = "https://ads.tiktok.com/business/creativecenter/inspiration/popular/music/pc/en"
+    start_time = time.time()
+    
+    log_scraper_start(logger, "TikTok Creative Center 스크래퍼", target_url)
+
+    if mode == 'api':
+        try:
+            all_music_data = scrape_creative_center_api(target_url, on_song)
+        except Exception as e:
+            log_error_with_context(logger, e, "차트 API 모드")
+
+        if not all_music_data["popular"] or not all_music_data["breakout"]:
+            logger.warning("⚠️ 차트 API 모드 결과가 비어 있어 DOM 모드로 전환합니다.")
+            mode = 'dom'
+
+    if mode == 'dom':
+        all_music_data = scrape_creative_center_dom(target_url, on_song)
+
+    log_bandwidth_summary()
+    log_wait_summary()
+
     # 스크래핑 결과 로깅
     total_items = sum(len(songs) for songs in all_music_data.values())
     duration = time.time() - start_time
@@ -184,14 +502,44 @@ def scrape_tiktok_creative_center():
     
     return all_music_data
 
+def save_chart_song(category, song):
+    """
+    차트 항목 하나를 songs / daily_trends에 저장하고 song_id를 반환합니다.
+    Breakout 차트 곡은 인기급상승 태그도 설정합니다.
+    """
+    song_id = db.add_song_and_get_id(
+        title=song['title'],
+        artist=song['artist'],
+        tiktok_id=song.get('tiktok_id'),
+        is_approved=song.get('is_approved_for_business_use')
+    )
+    
+    if song_id:
+        # 트렌드 데이터 저장
+        db.add_trend(
+            song_id=song_id,
+            source='tiktok',
+            category=category,
+            rank=song['rank']
+        )
+        
+        if category == 'breakout':
+            # 인기급상승 태그 설정
+            db.update_song_tags(
+                title=song['title'],
+                artist=song['artist'],
+                is_trending=True
+            )
+    return song_id
+
 if __name__ == "__main__":
     # 1. Initialize Database
     logger.info("💾 데이터베이스 초기화 중...")
     db.create_tables()
     logger.info("✅ 데이터베이스 준비 완료.")
 
-    # 2. Scrape Data
-    all_music_data = scrape_tiktok_creative_center()
+    # 2. Scrape Data (--dom: 탭 클릭 방식 강제)
+    all_music_data = scrape_tiktok_creative_center('dom' if '--dom' in sys.argv else None)
 
     # 3. Save Data to Database
     if not all_music_data or (not all_music_data['popular'] and not all_music_data['breakout']):
@@ -211,23 +559,8 @@ if __name__ == "__main__":
             logger.info(f"🎵 TikTok Popular 차트에서 {len(popular_songs)}곡 처리 중...")
             for song in popular_songs:
                 try:
-                    song_id = db.add_song_and_get_id(
-                        title=song['title'],
-                        artist=song['artist'],
-                        tiktok_id=song.get('tiktok_id'),
-                        is_approved=song.get('is_approved_for_business_use')
-                    )
-                    
-                    if song_id:
-                        # 트렌드 데이터 저장
-                        db.add_trend(
-                            song_id=song_id,
-                            source='tiktok',
-                            category='popular',
-                            rank=song['rank']
-                        )
+                    if save_chart_song('popular', song):
                         total_saved += 1
-                        
                 except Exception as e:
                     logger.error(f"💥 Popular 곡 저장 실패 '{song.get('title')}': {e}")
         
@@ -236,32 +569,9 @@ if __name__ == "__main__":
             logger.info(f"🔥 TikTok Breakout 차트에서 {len(breakout_songs)}곡 처리 중...")
             for song in breakout_songs:
                 try:
-                    song_id = db.add_song_and_get_id(
-                        title=song['title'],
-                        artist=song['artist'],
-                        tiktok_id=song.get('tiktok_id'),
-                        is_approved=song.get('is_approved_for_business_use')
-                    )
-                    
-                    if song_id:
-                        # 트렌드 데이터 저장
-                        db.add_trend(
-                            song_id=song_id,
-                            source='tiktok',
-                            category='breakout',
-                            rank=song['rank']
-                        )
-                        
-                        # 인기급상승 태그 설정
-                        db.update_song_tags(
-                            title=song['title'],
-                            artist=song['artist'],
-                            is_trending=True
-                        )
-                        
+                    if save_chart_song('breakout', song):
                         total_saved += 1
                         trending_saved += 1
-                        
                 except Exception as e:
                     logger.error(f"💥 Breakout 곡 저장 실패 '{song.get('title')}': {e}")
         
@@ -1,17 +1,49 @@
 import sys
 import re
 import os
-import time
+import html
 from collections import Counter
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from urllib.parse import unquote
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.utils.logger_config import get_logger, log_error_with_context
+from src.scrapers.html_parser import make_soup
 from src.database import database_manager as db
+from src.database.snapshot_store import save_snapshot
+from src.scrapers.browser_pool import get_browser_pool
+from src.collection.rate_limiter import observe_status
+from src.scrapers.wait_strategies import wait_for_dom_quiet, wait_for_scroll_growth, get_scroll_height
+from src.scrapers.tiktok_json_extractor import (
+    TikTokResponseCollector, REHYDRATION_SCRIPT_IDS, HASHTAG_PATTERN, EXCLUDED_HASHTAGS,
+    parse_rehydration_text, build_sound_result
+)
 
 logger = get_logger(__name__)
 
+# 추출 모드: 'json' (XHR/rehydration JSON 우선) 또는 'html' (렌더링된 HTML 파싱)
+DEFAULT_EXTRACTION_MODE = os.getenv('TIKTOK_EXTRACTION_MODE', 'json').lower()
+JSON_SCROLL_PAGES = 2  # JSON 모드에서 추가로 불러올 item list 페이지 수
+JSON_RESPONSE_TIMEOUT = 10000  # item list 응답 대기 최대 시간 (ms)
+
+# 해시태그를 셀 비디오 카드(설명/캡션) 영역
+# 'desc'/'caption' 같은 넓은 클래스 부분 일치는 쓰지 않음: 페이지 래퍼(music-description-layout 등)가
+# 걸리면 가장 바깥 요소 하나가 모든 카드를 삼켜 해시태그가 한 번씩만 세어짐
+HASHTAG_CARD_SELECTOR = ', '.join([
+    '[data-e2e="music-item"]',
+    '[data-e2e*="video-desc"]',
+    '[data-e2e*="video-caption"]',
+    '[class*="video-desc"]',
+    '.tiktok-caption',
+    '.video-meta-caption'
+])
+TAG_HREF_PATTERN = re.compile(r'/tag/([^/?#&]+)')
+
+# 텍스트만 담은 h1~strong 요소 중 "N videos"를 포함하는 첫 요소 (extract_video_count_from_soup과 같은 대상)
+VIDEO_COUNT_ELEMENT_PATTERN = re.compile(
+    r'<(h1|h2|h3|span|div|p|strong)\b[^>]*>([^<]*\d[.,]?\d*[KM]?\s*videos[^<]*)</\1\s*>',
+    re.IGNORECASE
+)
+
 def parse_video_count(count_str):
     """
     Parses a string like '1.4M videos' or '1,400,000 videos' into an integer.
@@ -35,84 +67,118 @@ def parse_video_count(count_str):
         logger.warning(f"⚠️ 비디오 카운트 파싱 실패: {count_str}")
         return 0
 
+def _card_hashtags(element):
+    """카드(비디오) 하나의 해시태그 집합: /tag/ 링크 + 텍스트의 #해시태그"""
+    hashtags = set()
+    links = [element] if element.name == 'a' else element.find_all('a', href=True)
+    for link in links:
+        tag_match = TAG_HREF_PATTERN.search(link.get('href', ''))
+        if tag_match:
+            hashtags.add(unquote(tag_match.group(1)))
+    for hashtag in HASHTAG_PATTERN.findall(element.get_text(' ')):
+        if len(hashtag) > 1:  # 한 글자는 제외
+            hashtags.add(hashtag)
+    return {tag for tag in hashtags if tag.lower() not in EXCLUDED_HASHTAGS}
+
 def extract_hashtags_from_soup(soup):
     """
     BeautifulSoup 객체에서 해시태그를 추출하고 빈도수를 계산합니다.
+    비디오 카드(설명/캡션 영역)마다 해시태그를 한 번만 셉니다. 카드가 없으면 /tag/ 링크 단위로 셉니다.
     """
     hashtag_counter = Counter()
-    
-    # 방법 1: 해시태그 링크 찾기 (/tag/ 경로)
-    hashtag_links = soup.find_all('a', href=re.compile(r'/tag/'))
-    for link in hashtag_links:
-        href = link.get('href', '')
-        text = link.get_text().strip()
-        
-        # URL에서 해시태그 추출
-        tag_match = re.search(r'/tag/([^/?#&]+)', href)
-        if tag_match:
-            hashtag = tag_match.group(1)
-            if hashtag.lower() == 'fyp': continue # FYP 제외
-            hashtag_counter[hashtag] += 1
-            logger.debug(f"📌 링크에서 해시태그: #{hashtag}")
-        
-        # 링크 텍스트에서 해시태그 추출
-        if text.startswith('#'):
-            hashtag = text[1:].strip()
-            if hashtag and len(hashtag) > 0:
-                if hashtag.lower() == 'fyp': continue # FYP 제외
-                hashtag_counter[hashtag] += 1
-                logger.debug(f"📌 링크 텍스트에서 해시태그: #{hashtag}")
-    
-    # 방법 2: 전체 텍스트에서 #으로 시작하는 해시태그 찾기
-    all_text = soup.get_text()
-    text_hashtags = re.findall(r'#(\w+)', all_text)
-    for hashtag in text_hashtags:
-        if len(hashtag) > 1:  # 한 글자는 제외
-            if hashtag.lower() == 'fyp': continue # FYP 제외
-            hashtag_counter[hashtag] += 1
-            logger.debug(f"📌 텍스트에서 해시태그: #{hashtag}")
-    
-    # 방법 3: 비디오 설명/캡션 영역에서 찾기
-    video_desc_selectors = [
-        '[data-e2e*="video-desc"]',
-        '[data-e2e*="video-caption"]',
-        '[class*="video-desc"]',
-        '[class*="caption"]',
-        '[class*="desc"]',
-        '.tiktok-caption',
-        '.video-meta-caption'
-    ]
-    
-    for selector in video_desc_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            # 요소 내 링크에서 해시태그 찾기
-            links = element.find_all('a', href=True)
-            for link in links:
-                href = link.get('href', '')
-                if '/tag/' in href:
-                    tag_match = re.search(r'/tag/([^/?#&]+)', href)
-                    if tag_match:
-                        hashtag = tag_match.group(1)
-                        if hashtag.lower() == 'fyp': continue # FYP 제외
-                        hashtag_counter[hashtag] += 1
-                        logger.debug(f"📌 비디오 설명에서 해시태그: #{hashtag}")
-            
-            # 요소 텍스트에서 해시태그 찾기
-            text = element.get_text()
-            desc_hashtags = re.findall(r'#(\w+)', text)
-            for hashtag in desc_hashtags:
-                if len(hashtag) > 1:
-                    if hashtag.lower() == 'fyp': continue # FYP 제외
-                    hashtag_counter[hashtag] += 1
-                    logger.debug(f"📌 설명 텍스트에서 해시태그: #{hashtag}")
-    
+    cards = []
+    card_ids = set()
+
+    # select()는 문서 순서로 반환하므로 상위 카드가 항상 먼저 옴 → 중첩된 하위 요소는 건너뜀
+    for element in soup.select(HASHTAG_CARD_SELECTOR):
+        if any(id(parent) in card_ids for parent in element.parents):
+            continue
+        card_ids.add(id(element))
+        cards.append(element)
+
+    if cards:
+        for card in cards:
+            hashtag_counter.update(_card_hashtags(card))
+    else:
+        for link in soup.find_all('a', href=TAG_HREF_PATTERN):
+            hashtag_counter.update(_card_hashtags(link))
+
+    logger.debug(f"📌 해시태그 {len(hashtag_counter)}종 (카드 {len(cards)}개)")
     return hashtag_counter
 
-def scrape_tiktok_sound_data(url):
+# rehydration 스크립트 본문을 읽는 page.evaluate 스크립트 (sync/async 공용)
+REHYDRATION_TEXT_SCRIPT = (
+    "(ids) => { for (const id of ids) { const el = document.getElementById(id);"
+    " if (el) return el.textContent; } return null; }"
+)
+
+def build_structured_result(collector):
+    """모은 JSON으로 결과를 만듭니다. 비디오 개수를 찾지 못하면 None (HTML 파싱으로 전환)."""
+    structured = build_sound_result(collector.music_detail_payloads,
+                                    collector.item_list_payloads, collector.rehydration_data)
+    if structured['video_count'] is None:
+        logger.info("ℹ️ 구조화 데이터에서 비디오 개수를 찾지 못함, HTML 파싱으로 전환")
+        return None
+
+    logger.debug(f"📦 구조화 데이터: 비디오 {structured['item_count']}개 설명 분석")
+    return structured
+
+def collect_structured_data(page, collector, scroll_pages=JSON_SCROLL_PAGES):
+    """
+    JSON 모드: rehydration 스크립트와 API 응답으로 결과를 만듭니다.
+    고정 대기 대신 item list 응답 도착을 기다리며, 개수를 찾지 못하면 None을 반환합니다.
+    """
+    script_text = page.evaluate(REHYDRATION_TEXT_SCRIPT, REHYDRATION_SCRIPT_IDS)
+    collector.rehydration_data = parse_rehydration_text(script_text)
+
+    # 첫 item list 응답 + 스크롤당 한 페이지씩 추가 응답 대기
+    for i in range(scroll_pages + 1):
+        if i > 0 or not collector.item_list_payloads:
+            try:
+                with page.expect_response(TikTokResponseCollector.is_item_list_response,
+                                          timeout=JSON_RESPONSE_TIMEOUT):
+                    if i > 0:
+                        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            except Exception:
+                logger.debug(f"📜 item list 응답 대기 타임아웃 ({i}번째)")
+                break
+
+    return build_structured_result(collector)
+
+def load_rendered_html(page):
+    """HTML 모드: 렌더링 완료를 기다리고 스크롤한 뒤 전체 HTML을 반환합니다."""
+    # 페이지 완전 로딩을 위한 대기 (DOM 변경이 멈추면 바로 진행)
+    wait_for_dom_quiet(page, quiet_ms=500, cap_ms=3000, legacy_ms=3000, label="TikTok 사운드 페이지 로딩")
+
+    # 비디오 카운트 요소 대기
+    try:
+        page.wait_for_selector('text=videos', timeout=30000)
+        logger.info("✅ 비디오 카운트 요소 발견")
+    except Exception:
+        logger.warning("⚠️ 비디오 카운트 요소 타임아웃")
+
+    # 더 많은 콘텐츠 로딩을 위한 스크롤
+    logger.debug("📜 페이지 스크롤하여 추가 콘텐츠 로딩...")
+    for i in range(3):
+        previous_height = get_scroll_height(page)
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        if not wait_for_scroll_growth(page, previous_height, cap_ms=1000, legacy_ms=1000,
+                                      label="TikTok 사운드 페이지 스크롤"):
+            break  # 더 불러올 콘텐츠 없음
+
+    # HTML 콘텐츠 가져오기
+    return page.content()
+
+def scrape_tiktok_sound_data(url, pool=None, extraction_mode=None, with_hashtags=True):
     """
     TikTok 사운드 페이지에서 비디오 개수와 상위 해시태그를 수집합니다.
     
+    Args:
+        url: TikTok 사운드 페이지 URL
+        pool: 사용할 BrowserPool (None이면 현재 스레드의 공유 풀 사용)
+        extraction_mode: 'json' (API/rehydration JSON, 실패 시 HTML로 대체) 또는 'html'
+        with_hashtags: False면 HTML 모드에서 DOM 트리를 만들지 않고 비디오 개수만 읽음
+    
     Returns:
         dict: {
             'video_count': int,
@@ -130,56 +196,45 @@ def scrape_tiktok_sound_data(url):
         'error_message': None
     }
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)  # Set to False for visual debugging
-        page = browser.new_page()
-        
-        try:
+    pool = pool or get_browser_pool()
+    extraction_mode = extraction_mode or DEFAULT_EXTRACTION_MODE
+    structured = None
+    html_content = None
+
+    try:
+        with pool.page('tiktok', har_key=url) as page:
+            collector = TikTokResponseCollector().attach(page) if extraction_mode == 'json' else None
+
             logger.info("🌐 페이지 로딩 중...")
-            page.goto(url, wait_until="domcontentloaded")
+            response = page.goto(url, wait_until="domcontentloaded")
+            if response is not None:
+                observe_status(url, response.status)
 
-            # 페이지 완전 로딩을 위한 대기
-            time.sleep(3)
+            if collector is not None:
+                structured = collect_structured_data(page, collector)
+            if structured is None:
+                html_content = load_rendered_html(page)
 
-            # 비디오 카운트 요소 대기
-            try:
-                page.wait_for_selector('text=videos', timeout=30000)
-                logger.info("✅ 비디오 카운트 요소 발견")
-            except Exception:
-                logger.warning("⚠️ 비디오 카운트 요소 타임아웃")
-
-            # 더 많은 콘텐츠 로딩을 위한 스크롤
-            logger.debug("📜 페이지 스크롤하여 추가 콘텐츠 로딩...")
-            for i in range(3):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(1)
-
-            # HTML 콘텐츠 가져오기
-            html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # 1. 비디오 개수 추출
-            video_count = extract_video_count_from_soup(soup)
-            result['video_count'] = video_count
-
-            # 2. 해시태그 추출 및 카운트
-            hashtag_counter = extract_hashtags_from_soup(soup)
-            
-            # 상위 10개 해시태그만 저장
-            top_hashtags = hashtag_counter.most_common(10)
-            result['top_hashtags'] = top_hashtags
-            result['success'] = True
-
-            logger.info(f"✅ 수집 완료 - 비디오: {video_count:,}개, 해시태그: {len(top_hashtags)}개")
-            if top_hashtags:
-                logger.info(f"📌 상위 해시태그: {', '.join([f'#{tag}({count})' for tag, count in top_hashtags[:5]])}")
-
-        except Exception as e:
-            result['error_message'] = str(e)
-            log_error_with_context(logger, e, "TikTok 사운드 페이지 스크래핑")
-            
-        finally:
-            browser.close()
+        if structured is not None:
+            save_snapshot(url, 'tiktok_sound_json', collector.to_snapshot())
+            video_count = structured['video_count']
+            top_hashtags = structured['top_hashtags']
+        else:
+            save_snapshot(url, 'tiktok_sound_html', html_content)
+            # 비디오 개수 + 해시태그 상위 10개
+            video_count, top_hashtags = parse_sound_html(html_content, with_hashtags)
+
+        result['video_count'] = video_count
+        result['top_hashtags'] = top_hashtags
+        result['success'] = True
+
+        logger.info(f"✅ 수집 완료 - 비디오: {video_count:,}개, 해시태그: {len(top_hashtags)}개")
+        if top_hashtags:
+            logger.info(f"📌 상위 해시태그: {', '.join([f'#{tag}({count})' for tag, count in top_hashtags[:5]])}")
+
+    except Exception as e:
+        result['error_message'] = str(e)
+        log_error_with_context(logger, e, "TikTok 사운드 페이지 스크래핑")
 
     return result
 
@@ -211,15 +266,68 @@ def extract_video_count_from_soup(soup):
         logger.warning("⚠️ 비디오 카운트 요소를 찾을 수 없음")
         return 0
 
+def scan_video_count(html_content):
+    """
+    HTML 원문을 DOM 트리 없이 앞에서부터 훑어 첫 번째 "N videos" 요소에서 비디오 개수를 읽습니다.
+    찾으면 바로 멈추며, 찾지 못하면 0을 반환합니다.
+    """
+    match = VIDEO_COUNT_ELEMENT_PATTERN.search(html_content or '')
+    if not match:
+        return 0
+
+    count_text = html.unescape(match.group(2)).strip()
+    number = re.search(r'([\d.,]+[KM]?)', count_text)
+    if not number:
+        return 0
+    count_value = parse_video_count(number.group(1))
+    logger.debug(f"📊 비디오 카운트 발견 (스트리밍): {count_text} → {count_value:,}")
+    return count_value
+
+def parse_sound_html(html_content, with_hashtags=True):
+    """
+    렌더링된 사운드 페이지 HTML에서 (비디오 개수, 상위 해시태그)를 추출합니다.
+    BeautifulSoup 트리는 해시태그가 필요하거나 스트리밍 스캔이 실패했을 때만 만듭니다.
+    """
+    video_count = scan_video_count(html_content)
+    if video_count > 0 and not with_hashtags:
+        return video_count, []
+
+    soup = make_soup(html_content)
+    if video_count == 0:
+        video_count = extract_video_count_from_soup(soup)
+    top_hashtags = extract_hashtags_from_soup(soup).most_common(10) if with_hashtags else []
+    return video_count, top_hashtags
+
+def extract_tiktok_id(tiktok_url):
+    """TikTok 사운드 URL에서 TikTok ID를 추출합니다."""
+    if '/music/x-' in tiktok_url:
+        return tiktok_url.split('/music/x-')[1].split('?')[0]
+    return None
+
+def save_result_for_song(song_id, result_data, song_label=None):
+    """곡 ID가 이미 알려진 경우 수집 결과(UGC 카운트, 해시태그)를 바로 저장"""
+    song_label = song_label or f"곡 {song_id}"
+    
+    # UGC 카운트 저장
+    ugc_count = result_data['video_count']
+    if ugc_count > 0:
+        db.update_ugc_counts(song_id, tiktok_count=ugc_count)
+        logger.info(f"✅ UGC 카운트 저장: {song_label} → {ugc_count:,}개")
+    
+    # 해시태그 저장
+    hashtags = result_data['top_hashtags']
+    if hashtags:
+        db.save_song_hashtags(song_id, hashtags)
+        logger.info(f"✅ 해시태그 저장: {song_label} → {len(hashtags)}개")
+
 def save_to_database(tiktok_url, result_data):
     """수집된 데이터를 데이터베이스에 저장"""
     if not result_data['success']:
         return False
     
     # TikTok URL에서 TikTok ID 추출
-    if '/music/x-' in tiktok_url:
-        tiktok_id = tiktok_url.split('/music/x-')[1].split('?')[0]
-    else:
+    tiktok_id = extract_tiktok_id(tiktok_url)
+    if not tiktok_id:
         logger.warning("❌ TikTok ID를 추출할 수 없습니다")
         return False
     
@@ -241,17 +349,7 @@ def save_to_database(tiktok_url, result_data):
         title = target_song[1]
         artist = target_song[2]
         
-        # UGC 카운트 저장
-        ugc_count = result_data['video_count']
-        if ugc_count > 0:
-            db.update_ugc_counts(song_id, tiktok_count=ugc_count)
-            logger.info(f"✅ UGC 카운트 저장: {title} - {artist} → {ugc_count:,}개")
-        
-        # 해시태그 저장
-        hashtags = result_data['top_hashtags']
-        if hashtags:
-            db.save_song_hashtags(song_id, hashtags)
-            logger.info(f"✅ 해시태그 저장: {title} - {artist} → {len(hashtags)}개")
+        save_result_for_song(song_id, result_data, f"{title} - {artist}")
         
         return True
         
@@ -267,12 +365,15 @@ if __name__ == "__main__":
         print("  https://www.tiktok.com/music/x-7373776748699421486")
         print("\n💾 데이터베이스 저장:")
         print("  python tiktok_ugc_counter.py <URL> --save-db")
+        print("\n🧩 렌더링된 HTML 파싱 강제 (기본은 JSON 응답 추출):")
+        print("  python tiktok_ugc_counter.py <URL> --html")
         sys.exit(1)
 
     tiktok_url = sys.argv[1]
     save_to_db = '--save-db' in sys.argv
+    extraction_mode = 'html' if '--html' in sys.argv else None
     
-    result = scrape_tiktok_sound_data(tiktok_url)
+    result = scrape_tiktok_sound_data(tiktok_url, extraction_mode=extraction_mode)
     
     if result['success']:
         print(f"비디오 개수: {result['video_count']:,}")
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+이벤트 기반 대기 전략
+고정 sleep/wait_for_timeout 대신 실제 준비 신호(선택자 개수 증가, 특정 요청의
+네트워크 유휴, DOM 변경 정지)를 기다립니다. 모든 대기에는 단계별 상한(cap)이 있고,
+실제 대기 시간과 기존 고정 대기 시간을 함께 기록합니다.
+"""
+
+import os
+import re
+import sys
+import time
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+POLL_INTERVAL_MS = 50
+
+# DOM 변경이 quietMs 동안 없거나 capMs가 지나면 종료
+DOM_QUIET_SCRIPT = """
+([quietMs, capMs]) => new Promise(resolve => {
+    const started = performance.now();
+    let quietTimer = null;
+    let capTimer = null;
+    let observer = null;
+    const done = (settled) => {
+        if (observer) observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve({settled, elapsed: performance.now() - started});
+    };
+    observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => done(true), quietMs);
+    });
+    observer.observe(document.documentElement || document,
+                     {childList: true, subtree: true, attributes: true, characterData: true});
+    quietTimer = setTimeout(() => done(true), quietMs);
+    capTimer = setTimeout(() => done(false), capMs);
+})
+"""
+
+SELECTOR_COUNT_SCRIPT = "([selector, minCount]) => document.querySelectorAll(selector).length >= minCount"
+SCROLL_HEIGHT_SCRIPT = "(previous) => document.body && document.body.scrollHeight > previous"
+
+# 라벨별 누적 대기 통계: {label: {'steps', 'waited_ms', 'legacy_ms', 'capped'}}
+_wait_totals = {}
+
+
+def _record(label, started, legacy_ms, settled):
+    """실제 대기 시간을 기록하고 기존 고정 대기와 비교한 로그를 남깁니다."""
+    waited_ms = (time.time() - started) * 1000
+    totals = _wait_totals.setdefault(label, {'steps': 0, 'waited_ms': 0.0, 'legacy_ms': 0, 'capped': 0})
+    totals['steps'] += 1
+    totals['waited_ms'] += waited_ms
+    totals['legacy_ms'] += legacy_ms or 0
+    if not settled:
+        totals['capped'] += 1
+
+    status = "신호 감지" if settled else "상한 도달"
+    if legacy_ms:
+        logger.debug(f"⏱️ [{label}] {waited_ms:.0f}ms 대기 ({status}, 기존 고정 {legacy_ms}ms)")
+    else:
+        logger.debug(f"⏱️ [{label}] {waited_ms:.0f}ms 대기 ({status})")
+    return settled
+
+
+def wait_for_selector_count(page, selector, min_count=1, cap_ms=10000, legacy_ms=None, label=None):
+    """selector와 일치하는 요소가 min_count개 이상이 될 때까지 기다립니다."""
+    started = time.time()
+    try:
+        page.wait_for_function(SELECTOR_COUNT_SCRIPT, arg=[selector, min_count], timeout=cap_ms)
+        settled = True
+    except Exception:
+        settled = False
+    return _record(label or f"selector {selector}", started, legacy_ms, settled)
+
+
+def wait_for_scroll_growth(page, previous_height, cap_ms=2000, legacy_ms=None, label="scroll"):
+    """스크롤 후 문서 높이가 previous_height보다 커질 때까지 기다립니다 (무한 스크롤 로딩 신호)."""
+    started = time.time()
+    try:
+        page.wait_for_function(SCROLL_HEIGHT_SCRIPT, arg=previous_height, timeout=cap_ms)
+        settled = True
+    except Exception:
+        settled = False
+    return _record(label, started, legacy_ms, settled)
+
+
+def get_scroll_height(page):
+    return page.evaluate("() => document.body ? document.body.scrollHeight : 0")
+
+
+def wait_for_dom_quiet(page, quiet_ms=500, cap_ms=5000, legacy_ms=None, label="dom quiet"):
+    """DOM 변경이 quiet_ms 동안 없을 때까지 기다립니다 (MutationObserver 기반)."""
+    started = time.time()
+    try:
+        outcome = page.evaluate(DOM_QUIET_SCRIPT, [quiet_ms, cap_ms])
+        settled = bool(outcome and outcome.get('settled'))
+    except Exception as e:
+        logger.debug(f"DOM 정지 대기 실패: {e}")
+        settled = False
+    return _record(label, started, legacy_ms, settled)
+
+
+async def wait_for_dom_quiet_async(page, quiet_ms=500, cap_ms=5000, legacy_ms=None, label="dom quiet"):
+    """wait_for_dom_quiet의 async API 버전"""
+    started = time.time()
+    try:
+        outcome = await page.evaluate(DOM_QUIET_SCRIPT, [quiet_ms, cap_ms])
+        settled = bool(outcome and outcome.get('settled'))
+    except Exception as e:
+        logger.debug(f"DOM 정지 대기 실패: {e}")
+        settled = False
+    return _record(label, started, legacy_ms, settled)
+
+
+def wait_for_network_quiet(page, url_pattern=None, quiet_ms=500, cap_ms=10000, legacy_ms=None,
+                           label="network quiet"):
+    """
+    url_pattern(정규식)과 일치하는 진행 중 요청이 quiet_ms 동안 0개일 때까지 기다립니다.
+    url_pattern이 None이면 모든 요청을 대상으로 합니다.
+    """
+    pattern = re.compile(url_pattern) if isinstance(url_pattern, str) else url_pattern
+    in_flight = set()
+    last_activity = [time.time()]
+
+    def matches(request):
+        return pattern is None or bool(pattern.search(request.url))
+
+    def on_request(request):
+        if matches(request):
+            in_flight.add(request)
+            last_activity[0] = time.time()
+
+    def on_done(request):
+        if request in in_flight:
+            in_flight.discard(request)
+            last_activity[0] = time.time()
+
+    page.on('request', on_request)
+    page.on('requestfinished', on_done)
+    page.on('requestfailed', on_done)
+
+    started = time.time()
+    settled = False
+    try:
+        while (time.time() - started) * 1000 < cap_ms:
+            # wait_for_timeout 동안 Playwright 이벤트가 처리됨
+            page.wait_for_timeout(POLL_INTERVAL_MS)
+            if not in_flight and (time.time() - last_activity[0]) * 1000 >= quiet_ms:
+                settled = True
+                break
+    finally:
+        page.remove_listener('request', on_request)
+        page.remove_listener('requestfinished', on_done)
+        page.remove_listener('requestfailed', on_done)
+
+    return _record(label, started, legacy_ms, settled)
+
+
+def get_wait_report():
+    """라벨별 누적 대기 통계를 반환합니다."""
+    return {label: dict(totals) for label, totals in _wait_totals.items()}
+
+
+def log_wait_summary():
+    """라벨별 실제 대기 시간과 기존 고정 대기 시간 합계를 로그로 남깁니다."""
+    for label, totals in _wait_totals.items():
+        if totals['legacy_ms']:
+            saved = (totals['legacy_ms'] - totals['waited_ms']) / 1000
+            logger.info(f"⏱️ [{label}] {totals['steps']}회 대기: 실제 {totals['waited_ms'] / 1000:.1f}초 / "
+                        f"기존 {totals['legacy_ms'] / 1000:.1f}초 (절약 {saved:.1f}초, 상한 도달 {totals['capped']}회)")
+        else:
+            logger.info(f"⏱️ [{label}] {totals['steps']}회 대기: 실제 {totals['waited_ms'] / 1000:.1f}초")
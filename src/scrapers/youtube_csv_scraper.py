@@ -17,6 +17,9 @@ from playwright.sync_api import sync_playwright
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.database import database_manager as db
 from src.utils.logger_config import get_logger, log_scraper_start, log_scraper_end, log_error_with_context
+from src.scrapers.request_filter import install_route_policy, finish_page_stats, log_bandwidth_summary
+from src.scrapers.har_replay import new_context
+from src.scrapers.wait_strategies import wait_for_selector_count, log_wait_summary
 
 # 로거 설정
 logger = get_logger(__name__)
@@ -85,14 +88,17 @@ def download_youtube_csv():
     
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)  # 디버깅을 위해 브라우저 표시
-        context = browser.new_context(accept_downloads=True)
+        context = new_context(browser, 'youtube_charts', accept_downloads=True)
         page = context.new_page()
+        route_stats = install_route_policy(page, 'youtube_charts')
         
         try:
             # 페이지 로딩
             logger.info("🌐 페이지 로딩 중...")
             page.goto(target_url, wait_until="domcontentloaded")
-            page.wait_for_timeout(5000)
+            # 다운로드 버튼이 렌더링되면 바로 진행
+            wait_for_selector_count(page, "#download-button", 1, cap_ms=5000, legacy_ms=5000,
+                                    label="YouTube Charts 다운로드 버튼")
             
             # 다운로드 버튼 찾기 및 클릭
             logger.info("🔽 CSV 다운로드 버튼 클릭 중...")
@@ -160,12 +166,20 @@ def download_youtube_csv():
             log_error_with_context(logger, e, "CSV 다운로드")
             return None
         finally:
+            finish_page_stats(route_stats)
+            context.close()
             browser.close()
+            log_bandwidth_summary()
+            log_wait_summary()
 
-def parse_csv_data(csv_path):
+def parse_csv_data(csv_path, on_song=None):
     """
     다운로드된 CSV 파일을 파싱합니다.
     
+    Args:
+        csv_path: CSV 파일 경로
+        on_song: 행 하나를 파싱할 때마다 on_song(song_data)로 호출 (전체 파싱을 기다리지 않는 스트리밍용)
+    
     Returns:
         list: 파싱된 곡 데이터 리스트
     """
@@ -214,6 +228,8 @@ def parse_csv_data(csv_path):
                     }
                     
                     songs_data.append(song_data)
+                    if on_song:
+                        on_song(song_data)
                     
                 except Exception as e:
                     logger.warning(f"⚠️ 행 파싱 실패: {row}, 오류: {e}")
@@ -226,6 +242,43 @@ def parse_csv_data(csv_path):
         log_error_with_context(logger, e, "CSV 파싱")
         return []
 
+def save_song(song):
+    """
+    파싱된 곡 하나를 songs / daily_trends에 저장하고 song_id를 반환합니다.
+    YouTube ID가 없어도 곡 정보는 저장됩니다.
+    """
+    # 곡 저장 (YouTube ID가 None이어도 저장)
+    song_id = db.add_song_and_get_id(
+        title=song['title'],
+        artist=song['artist'],
+        youtube_id=song['youtube_id']  # None일 수 있음
+    )
+    
+    if song_id:
+        # 트렌드 데이터 저장
+        db.add_trend(
+            song_id=song_id,
+            source='youtube',
+            category='trending',
+            rank=song['rank'],
+            metrics={
+                'previous_rank': song['previous_rank'],
+                'periods_on_chart': song['periods_on_chart'],
+                'youtube_url': song['youtube_url'],
+                'shorts_url': song['shorts_url']
+            }
+        )
+        
+        # 태그 업데이트
+        if song['is_trending'] or song['is_new_hit']:
+            db.update_song_tags(
+                title=song['title'],
+                artist=song['artist'],
+                is_trending=song['is_trending'],
+                is_new_hit=song['is_new_hit']
+            )
+    return song_id
+
 def save_to_database(songs_data):
     """
     파싱된 데이터를 데이터베이스에 저장합니다.
@@ -244,41 +297,13 @@ def save_to_database(songs_data):
     
     for song in songs_data:
         try:
-            # 곡 저장 (YouTube ID가 None이어도 저장)
-            song_id = db.add_song_and_get_id(
-                title=song['title'],
-                artist=song['artist'],
-                youtube_id=song['youtube_id']  # None일 수 있음
-            )
+            song_id = save_song(song)
             
             if song_id:
-                # 트렌드 데이터 저장
-                db.add_trend(
-                    song_id=song_id,
-                    source='youtube',
-                    category='trending',
-                    rank=song['rank'],
-                    metrics={
-                        'previous_rank': song['previous_rank'],
-                        'periods_on_chart': song['periods_on_chart'],
-                        'youtube_url': song['youtube_url'],
-                        'shorts_url': song['shorts_url']
-                    }
-                )
-                
-                # 태그 업데이트
-                if song['is_trending'] or song['is_new_hit']:
-                    db.update_song_tags(
-                        title=song['title'],
-                        artist=song['artist'],
-                        is_trending=song['is_trending'],
-                        is_new_hit=song['is_new_hit']
-                    )
-                    
-                    if song['is_trending']:
-                        trending_count += 1
-                    if song['is_new_hit']:
-                        new_hit_count += 1
+                if song['is_trending']:
+                    trending_count += 1
+                if song['is_new_hit']:
+                    new_hit_count += 1
                 
                 # YouTube ID 없는 곡 카운트
                 if not song['youtube_id']:
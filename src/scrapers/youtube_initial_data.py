@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+YouTube ytInitialData 추출기
+브라우저 없이 /source/<id>/shorts 페이지 HTML을 HTTP로 받아서, 페이지에 내장된
+ytInitialData JSON의 헤더 렌더러 텍스트를 읽습니다.
+파싱 함수는 모두 순수 함수라서 저장해 둔 HTML로 그대로 재현할 수 있습니다.
+"""
+
+import os
+import re
+import sys
+import json
+import urllib.request
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from src.utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+HTTP_TIMEOUT = 15  # 초
+
+# 영문 페이지를 받고, EU 동의 화면으로 리다이렉트되지 않도록 CONSENT 쿠키를 보냄
+REQUEST_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Cookie': 'CONSENT=YES+1'
+}
+
+INITIAL_DATA_PATTERN = re.compile(r'(?:var\s+ytInitialData|window\[["\']ytInitialData["\']\])\s*=\s*')
+
+# 텍스트를 담는 키: {"simpleText": "..."}, {"content": "..."}, {"runs": [{"text": "..."}]}
+TEXT_KEYS = ('simpleText', 'content', 'text')
+
+
+def fetch_html(url, timeout=HTTP_TIMEOUT):
+    """URL의 HTML 원문을 받아옵니다."""
+    request = urllib.request.Request(url, headers=REQUEST_HEADERS)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+
+def parse_initial_data(html_content):
+    """HTML 원문에서 ytInitialData JSON을 추출합니다. 없으면 None."""
+    match = INITIAL_DATA_PATTERN.search(html_content or '')
+    if not match:
+        return None
+
+    # JSON 뒤에 ';</script>'가 오므로 raw_decode로 객체 하나만 읽음
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html_content, match.end())
+        return data
+    except ValueError:
+        logger.debug("ytInitialData JSON 파싱 실패")
+        return None
+
+
+def collect_texts(node):
+    """중첩된 렌더러에서 화면에 표시되는 텍스트를 순서대로 모읍니다."""
+    texts = []
+
+    def walk(value):
+        if isinstance(value, dict):
+            runs = value.get('runs')
+            if isinstance(runs, list):
+                joined = ''.join(run.get('text', '') for run in runs if isinstance(run, dict))
+                if joined:
+                    texts.append(joined)
+            for key in TEXT_KEYS:
+                if isinstance(value.get(key), str):
+                    texts.append(value[key])
+            for child in value.values():
+                if isinstance(child, (dict, list)):
+                    walk(child)
+        elif isinstance(value, list):
+            for child in value:
+                walk(child)
+
+    walk(node)
+    return texts
+
+
+def header_texts(data):
+    """ytInitialData의 헤더 렌더러(pageHeaderRenderer 등) 텍스트를 반환합니다."""
+    if not isinstance(data, dict):
+        return []
+    return collect_texts(data.get('header'))
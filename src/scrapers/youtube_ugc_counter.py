@@ -1,18 +1,25 @@
 import sys
 import re
 import os
-import time
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.utils.logger_config import get_logger, log_error_with_context
+from src.scrapers.html_parser import make_soup
 from src.database import database_manager as db
+from src.database.snapshot_store import save_snapshot
+from src.scrapers.browser_pool import get_browser_pool
+from src.scrapers.har_replay import is_har_active
+from src.collection.rate_limiter import observe_status
+from src.scrapers.wait_strategies import wait_for_dom_quiet
+from src.scrapers.youtube_initial_data import fetch_html, parse_initial_data, header_texts
 
 # 로거 설정
 logger = get_logger(__name__)
 
+# 수집 모드: 'http' (ytInitialData 파싱, 실패 시 브라우저) 또는 'browser'
+DEFAULT_FETCH_MODE = os.getenv('YOUTUBE_FETCH_MODE', 'http').lower()
+
 def parse_video_count(count_str):
     """
     Parses a string like '1.4M videos', '12만개' or '1,400,000 videos' into an integer.
@@ -47,42 +54,73 @@ def parse_video_count(count_str):
     except (ValueError, TypeError):
         return 0
 
+# 비디오 카운트가 표시될 수 있는 영역: (CSS 선택자, :has-text 조건)
+COUNT_SELECTORS = [
+    # YouTube 공통 선택자들
+    ('[data-testid*="count"]', None),
+    ('.ytd-shelf-header-renderer .title', None),
+    ('#contents-count', None),
+    ('.metadata-stats-count', None),
+    # 헤더나 제목 영역에서 찾기 (기존 'h1:has-text("videos")' 등)
+    ('h1', 'videos'),
+    ('h1', '개'),
+    ('h2', 'videos'),
+    ('h2', '개'),
+    # 일반적인 카운트 표시 영역
+    ('.count', None),
+    ('.video-count', None),
+    ('.results-count', None)
+]
+
+# 모든 선택자를 페이지 안에서 한 번에 검사하고 후보 텍스트를 반환합니다.
+# :has-text는 Playwright 전용 문법이라 공백 정규화 + 대소문자 무시 포함 검사로 옮겼습니다.
+SELECTOR_TEXTS_SCRIPT = """
+(specs) => specs.map(([selector, hasText]) => {
+    const needle = hasText ? hasText.toLowerCase() : null;
+    const texts = [];
+    for (const el of document.querySelectorAll(selector)) {
+        const text = el.textContent || '';
+        if (needle && !text.replace(/\\s+/g, ' ').toLowerCase().includes(needle)) continue;
+        texts.push(text);
+    }
+    return texts;
+})
+"""
+
+def count_from_selector_texts(candidates):
+    """
+    SELECTOR_TEXTS_SCRIPT 결과(선택자별 텍스트 목록)에서 첫 번째 카운트를 찾습니다.
+
+    Returns:
+        tuple: (count, legacy_round_trips) - legacy_round_trips는 선택자마다
+               locator.all()과 요소별 text_content()를 호출하던 기존 방식의 왕복 횟수
+    """
+    legacy_round_trips = 0
+    for (selector, has_text), texts in zip(COUNT_SELECTORS, candidates):
+        legacy_round_trips += 1
+        for text in texts:
+            legacy_round_trips += 1
+            if text:
+                count = extract_count_from_text(text.strip())
+                if count > 0:
+                    label = f'{selector}:has-text("{has_text}")' if has_text else selector
+                    logger.debug(f"📊 선택자 {label}에서 카운트 발견: {text} → {count:,}")
+                    return count, legacy_round_trips
+    return 0, legacy_round_trips
+
 def extract_video_count_with_selectors(page):
     """
-    특정 선택자를 사용해 비디오 카운트를 추출합니다.
+    특정 선택자를 사용해 비디오 카운트를 추출합니다 (page.evaluate 한 번).
     """
-    selectors = [
-        # YouTube 공통 선택자들
-        '[data-testid*="count"]',
-        '.ytd-shelf-header-renderer .title',
-        '#contents-count',
-        '.metadata-stats-count',
-        # 헤더나 제목 영역에서 찾기
-        'h1:has-text("videos")',
-        'h1:has-text("개")',
-        'h2:has-text("videos")',
-        'h2:has-text("개")',
-        # 일반적인 카운트 표시 영역
-        '.count',
-        '.video-count',
-        '.results-count'
-    ]
-    
-    for selector in selectors:
-        try:
-            elements = page.locator(selector).all()
-            for element in elements:
-                text = element.text_content()
-                if text:
-                    count = extract_count_from_text(text.strip())
-                    if count > 0:
-                        logger.debug(f"📊 선택자 {selector}에서 카운트 발견: {text} → {count:,}")
-                        return count
-        except Exception as e:
-            logger.debug(f"선택자 {selector} 실패: {e}")
-            continue
-    
-    return 0
+    try:
+        candidates = page.evaluate(SELECTOR_TEXTS_SCRIPT, [list(spec) for spec in COUNT_SELECTORS])
+    except Exception as e:
+        logger.debug(f"선택자 검사 실패: {e}")
+        return 0
+
+    count, legacy_round_trips = count_from_selector_texts(candidates)
+    logger.debug(f"🔁 선택자 검사 왕복 1회 (기존 방식 {legacy_round_trips}회)")
+    return count
 
 def extract_count_from_text(text):
     """
@@ -136,11 +174,50 @@ def extract_video_count_from_text(all_text):
     return max(found_counts) if found_counts else 0
 
 
-def scrape_youtube_shorts_data(url):
+def extract_count_from_initial_data(data):
+    """
+    ytInitialData의 헤더 렌더러에서 비디오 카운트를 추출합니다.
+    헤더에 카운트가 없으면 0을 반환해 브라우저 경로로 넘어가게 합니다.
+    (본문 텍스트는 보지 않음: "Top 500 shorts" 같은 영상 제목을 카운트로 읽게 되므로)
+    """
+    for text in header_texts(data):
+        count = extract_count_from_text(text)
+        if count > 0:
+            logger.debug(f"📊 헤더 렌더러에서 카운트 발견: {text} → {count:,}")
+            return count
+
+    logger.debug("헤더 렌더러에 카운트가 없음")
+    return 0
+
+def fetch_shorts_count_http(url):
+    """
+    브라우저 없이 HTTP 요청 한 번으로 비디오 카운트를 가져옵니다.
+    Returns the count, or 0 if the page could not be fetched or parsed.
+    """
+    try:
+        html_content = fetch_html(url)
+    except Exception as e:
+        observe_status(url, getattr(e, 'code', None))
+        logger.debug(f"HTTP 요청 실패 ({url}): {e}")
+        return 0
+
+    save_snapshot(url, 'youtube_shorts_html', html_content)
+    data = parse_initial_data(html_content)
+    if data is None:
+        logger.debug("ytInitialData를 찾을 수 없음")
+        return 0
+    return extract_count_from_initial_data(data)
+
+def scrape_youtube_shorts_data(url, pool=None, fetch_mode=None):
     """
     Scrapes the total video count for a given YouTube Shorts URL.
     Supports both watch URLs and source/shorts URLs.
     Returns the count as integer, or 0 if no count found.
+    
+    Args:
+        url: YouTube Shorts(source) 또는 watch URL
+        pool: 사용할 BrowserPool (None이면 현재 스레드의 공유 풀 사용)
+        fetch_mode: 'http' 또는 'browser' (None이면 YOUTUBE_FETCH_MODE 환경변수)
     """
     # YouTube ID에서 Shorts URL로 변환
     if '/watch?v=' in url:
@@ -148,20 +225,26 @@ def scrape_youtube_shorts_data(url):
         url = f"https://www.youtube.com/source/{video_id}/shorts"
     
     logger.info(f"📺 YouTube UGC 수집: {url}")
+
+    # HAR 녹화/재생 중에는 브라우저 경로만 사용 (urllib 요청은 HAR에 기록되지 않음)
+    if (fetch_mode or DEFAULT_FETCH_MODE) == 'http' and not is_har_active():
+        video_count = fetch_shorts_count_http(url)
+        if video_count > 0:
+            logger.info(f"✅ 최종 결과: {video_count:,}개 (HTTP)")
+            return video_count
+        logger.info("🔁 HTTP 파싱 실패, 브라우저로 재시도")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
-        page = browser.new_page()
-        
-        # 타임아웃 설정
-        page.set_default_timeout(30000)  # 30초
-        
-        try:
+    pool = pool or get_browser_pool()
+    
+    try:
+        with pool.page('youtube', har_key=url) as page:
+            # 타임아웃 설정
+            page.set_default_timeout(30000)  # 30초
+            
             logger.info("🌐 페이지 로딩 중...")
-            page.goto(url, wait_until="networkidle", timeout=20000)
+            response = page.goto(url, wait_until="networkidle", timeout=20000)
+            if response is not None:
+                observe_status(url, response.status)
             
             # 비디오 카운트 요소가 나타날 때까지 대기 (최대 15초)
             try:
@@ -175,7 +258,7 @@ def scrape_youtube_shorts_data(url):
             
             # 짧은 스크롤로 추가 콘텐츠 로딩
             page.evaluate("window.scrollTo(0, 500)")
-            time.sleep(2)
+            wait_for_dom_quiet(page, quiet_ms=300, cap_ms=2000, legacy_ms=2000, label="YouTube Shorts 스크롤")
             
             # 특정 영역에서 비디오 카운트 찾기
             video_count = extract_video_count_with_selectors(page)
@@ -186,26 +269,39 @@ def scrape_youtube_shorts_data(url):
             
             # 선택자로 찾지 못한 경우 전체 텍스트에서 검색
             html_content = page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
-            all_text = soup.get_text()
-            
-            logger.debug(f"🔍 페이지 텍스트 샘플: {all_text[:200].strip()}...")
-            
-            # 텍스트에서 비디오 카운트 패턴 검색
-            video_count = extract_video_count_from_text(all_text)
-            
-            if video_count > 0:
-                logger.info(f"✅ 최종 결과: {video_count:,}개")
-                return video_count
-            else:
-                logger.warning("❌ 비디오 카운트를 찾을 수 없음")
-                return 0
-                
-        except Exception as e:
-            log_error_with_context(logger, e, "YouTube Shorts 페이지 스크래핑")
+        
+        save_snapshot(url, 'youtube_shorts_rendered_html', html_content)
+        soup = make_soup(html_content)
+        all_text = soup.get_text()
+        
+        logger.debug(f"🔍 페이지 텍스트 샘플: {all_text[:200].strip()}...")
+        
+        # 텍스트에서 비디오 카운트 패턴 검색
+        video_count = extract_video_count_from_text(all_text)
+        
+        if video_count > 0:
+            logger.info(f"✅ 최종 결과: {video_count:,}개")
+            return video_count
+        else:
+            logger.warning("❌ 비디오 카운트를 찾을 수 없음")
             return 0
-        finally:
-            browser.close()
+            
+    except Exception as e:
+        log_error_with_context(logger, e, "YouTube Shorts 페이지 스크래핑")
+        return 0
+
+def extract_youtube_id(youtube_url):
+    """YouTube Shorts(source) 또는 watch URL에서 YouTube ID를 추출합니다."""
+    if '/source/' in youtube_url and '/shorts' in youtube_url:
+        return youtube_url.split('/source/')[1].split('/shorts')[0]
+    elif '/watch?v=' in youtube_url:
+        return youtube_url.split('watch?v=')[1].split('&')[0]
+    return None
+
+def save_count_for_song(song_id, video_count, song_label=None):
+    """곡 ID가 이미 알려진 경우 YouTube UGC 카운트를 바로 저장"""
+    db.update_ugc_counts(song_id, youtube_count=video_count)
+    logger.info(f"✅ UGC 카운트 저장: {song_label or f'곡 {song_id}'} → {video_count:,}개")
 
 def save_to_database(youtube_url, video_count):
     """수집된 YouTube UGC 카운트를 데이터베이스에 저장"""
@@ -213,11 +309,8 @@ def save_to_database(youtube_url, video_count):
         return False
     
     # YouTube URL에서 YouTube ID 추출
-    if '/source/' in youtube_url and '/shorts' in youtube_url:
-        youtube_id = youtube_url.split('/source/')[1].split('/shorts')[0]
-    elif '/watch?v=' in youtube_url:
-        youtube_id = youtube_url.split('watch?v=')[1].split('&')[0]
-    else:
+    youtube_id = extract_youtube_id(youtube_url)
+    if not youtube_id:
         logger.warning("❌ YouTube ID를 추출할 수 없습니다")
         return False
     
@@ -240,8 +333,7 @@ def save_to_database(youtube_url, video_count):
         artist = target_song[2]
         
         # UGC 카운트 저장
-        db.update_ugc_counts(song_id, youtube_count=video_count)
-        logger.info(f"✅ UGC 카운트 저장: {title} - {artist} → {video_count:,}개")
+        save_count_for_song(song_id, video_count, f"{title} - {artist}")
         
         return True
         
@@ -257,12 +349,15 @@ if __name__ == "__main__":
         print("  https://www.youtube.com/source/983bBbJx0Mk/shorts")
         print("\n💾 데이터베이스 저장:")
         print("  python youtube_ugc_counter.py <URL> --save-db")
+        print("\n🌐 브라우저 모드 강제 (HTTP 파싱 생략):")
+        print("  python youtube_ugc_counter.py <URL> --browser")
         sys.exit(1)
 
     youtube_url = sys.argv[1]
     save_to_db = '--save-db' in sys.argv
+    fetch_mode = 'browser' if '--browser' in sys.argv else None
     
-    video_count = scrape_youtube_shorts_data(youtube_url)
+    video_count = scrape_youtube_shorts_data(youtube_url, fetch_mode=fetch_mode)
     print(video_count)
     
     # 데이터베이스 저장